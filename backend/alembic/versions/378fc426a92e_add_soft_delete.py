@@ -0,0 +1,63 @@
+"""add soft delete
+
+Revision ID: 378fc426a92e
+Revises: 4f5debe8ddd8
+Create Date: 2026-10-17 03:05:41.118230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '378fc426a92e'
+down_revision: Union[str, Sequence[str], None] = '4f5debe8ddd8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Indexes behind reads, rebuilt over live rows only: (name, table, columns, using).
+LIVE_INDEXES = (
+    ('ix_roadmaps_list_order', 'roadmaps', ['sort_order', 'created_at', 'id'], 'btree'),
+    ('ix_roadmaps_archived_list_order', 'roadmaps', ['is_archived', 'sort_order', 'created_at', 'id'], 'btree'),
+    ('ix_roadmaps_search_vector', 'roadmaps', ['search_vector'], 'gin'),
+    ('ix_topics_roadmap_sort_order', 'topics', ['roadmap_id', 'sort_order'], 'btree'),
+    ('ix_topics_search_vector', 'topics', ['search_vector'], 'gin'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('roadmaps', 'topics'):
+        op.add_column(table, sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+        op.create_index(
+            f'ix_{table}_deleted',
+            table,
+            ['deleted_at', 'id'],
+            unique=False,
+            postgresql_where=sa.text('deleted_at IS NOT NULL'),
+        )
+    for name, table, columns, using in LIVE_INDEXES:
+        op.drop_index(name, table_name=table)
+        op.create_index(
+            name,
+            table,
+            columns,
+            unique=False,
+            postgresql_using=using,
+            postgresql_where=sa.text('deleted_at IS NULL'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Finish what the purger has not: soft-deleted rows would otherwise reappear.
+    op.execute('DELETE FROM topics WHERE deleted_at IS NOT NULL')
+    op.execute('DELETE FROM roadmaps WHERE deleted_at IS NOT NULL')
+    for name, table, columns, using in reversed(LIVE_INDEXES):
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, columns, unique=False, postgresql_using=using)
+    for table in ('topics', 'roadmaps'):
+        op.drop_index(f'ix_{table}_deleted', table_name=table)
+        op.drop_column(table, 'deleted_at')
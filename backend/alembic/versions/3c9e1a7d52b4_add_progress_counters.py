@@ -0,0 +1,71 @@
+"""add progress counters
+
+Revision ID: 3c9e1a7d52b4
+Revises: f6b146a584f3
+Create Date: 2026-10-17 09:12:04.318220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1a7d52b4'
+down_revision: Union[str, Sequence[str], None] = 'f6b146a584f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTER_COLUMNS = ("total_tasks", "completed_tasks", "in_progress_tasks")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ("roadmaps", "topics"):
+        for column in COUNTER_COLUMNS:
+            op.add_column(
+                table, sa.Column(column, sa.Integer(), nullable=False, server_default="0")
+            )
+
+    op.execute(
+        """
+        UPDATE topics
+        SET total_tasks = counts.total,
+            completed_tasks = counts.completed,
+            in_progress_tasks = counts.in_progress
+        FROM (
+            SELECT topic_id,
+                   count(*) AS total,
+                   count(*) FILTER (WHERE status = 'completed') AS completed,
+                   count(*) FILTER (WHERE status = 'in_progress') AS in_progress
+            FROM tasks
+            GROUP BY topic_id
+        ) AS counts
+        WHERE topics.id = counts.topic_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE roadmaps
+        SET total_tasks = counts.total,
+            completed_tasks = counts.completed,
+            in_progress_tasks = counts.in_progress
+        FROM (
+            SELECT roadmap_id,
+                   sum(total_tasks) AS total,
+                   sum(completed_tasks) AS completed,
+                   sum(in_progress_tasks) AS in_progress
+            FROM topics
+            GROUP BY roadmap_id
+        ) AS counts
+        WHERE roadmaps.id = counts.roadmap_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("topics", "roadmaps"):
+        for column in reversed(COUNTER_COLUMNS):
+            op.drop_column(table, column)
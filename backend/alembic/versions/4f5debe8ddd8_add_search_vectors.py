@@ -0,0 +1,54 @@
+"""add search vectors
+
+Revision ID: 4f5debe8ddd8
+Revises: c8d1f0a6b372
+Create Date: 2026-10-17 02:19:28.527234
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f5debe8ddd8'
+down_revision: Union[str, Sequence[str], None] = 'c8d1f0a6b372'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with app.models.base.search_vector_column.
+SEARCHED_COLUMNS = (
+    ('roadmaps', 'title', 'description'),
+    ('topics', 'title', 'description'),
+    ('tasks', 'title', 'notes'),
+)
+
+
+def _search_vector(title: str, body: str) -> sa.Computed:
+    return sa.Computed(
+        f"setweight(to_tsvector('english', coalesce({title}, '')), 'A') || "
+        f"setweight(to_tsvector('english', coalesce({body}, '')), 'B')",
+        persisted=True,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Adding a stored generated column rewrites the table once to fill it in.
+    for table, title, body in SEARCHED_COLUMNS:
+        op.add_column(
+            table,
+            sa.Column('search_vector', postgresql.TSVECTOR(), _search_vector(title, body), nullable=False),
+        )
+        op.create_index(
+            f'ix_{table}_search_vector', table, ['search_vector'], unique=False, postgresql_using='gin'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, _, _ in reversed(SEARCHED_COLUMNS):
+        op.drop_index(f'ix_{table}_search_vector', table_name=table, postgresql_using='gin')
+        op.drop_column(table, 'search_vector')
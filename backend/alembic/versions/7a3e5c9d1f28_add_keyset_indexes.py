@@ -0,0 +1,46 @@
+"""add keyset indexes
+
+Revision ID: 7a3e5c9d1f28
+Revises: e41c7b9a3d05
+Create Date: 2026-10-17 14:02:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3e5c9d1f28'
+down_revision: Union[str, Sequence[str], None] = 'e41c7b9a3d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_roadmaps_list_order', 'roadmaps', ['sort_order', 'created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_roadmaps_archived_list_order',
+        'roadmaps',
+        ['is_archived', 'sort_order', 'created_at', 'id'],
+        unique=False,
+    )
+    # Extend the sibling index with id so task pages resume exactly at the cursor.
+    op.drop_index('ix_tasks_topic_sort_order', table_name='tasks')
+    op.create_index('ix_tasks_topic_sort_order', 'tasks', ['topic_id', 'sort_order', 'id'], unique=False)
+    op.create_index(
+        'ix_tasks_topic_status_sort_order',
+        'tasks',
+        ['topic_id', 'status', 'sort_order', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_topic_status_sort_order', table_name='tasks')
+    op.drop_index('ix_tasks_topic_sort_order', table_name='tasks')
+    op.create_index('ix_tasks_topic_sort_order', 'tasks', ['topic_id', 'sort_order'], unique=False)
+    op.drop_index('ix_roadmaps_archived_list_order', table_name='roadmaps')
+    op.drop_index('ix_roadmaps_list_order', table_name='roadmaps')
@@ -0,0 +1,42 @@
+"""add daily completions rollup
+
+Revision ID: 8d2f4b6e1a90
+Revises: 3c9e1a7d52b4
+Create Date: 2026-10-17 10:03:41.552907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f4b6e1a90'
+down_revision: Union[str, Sequence[str], None] = '3c9e1a7d52b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "daily_completions",
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("date"),
+    )
+    op.execute(
+        """
+        INSERT INTO daily_completions (date, count)
+        SELECT CAST(completed_at AS DATE), count(*)
+        FROM tasks
+        WHERE completed_at IS NOT NULL
+        GROUP BY CAST(completed_at AS DATE)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("daily_completions")
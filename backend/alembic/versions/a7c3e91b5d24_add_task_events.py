@@ -0,0 +1,55 @@
+"""add task events
+
+Revision ID: a7c3e91b5d24
+Revises: 378fc426a92e
+Create Date: 2026-10-17 18:42:07.503116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e91b5d24'
+down_revision: Union[str, Sequence[str], None] = '378fc426a92e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing tasks keep NULL: when they entered their current status is not known.
+    op.add_column('tasks', sa.Column('status_changed_at', sa.DateTime(timezone=True), nullable=True))
+    op.alter_column('tasks', 'status_changed_at', server_default=sa.text('now()'))
+
+    op.create_table(
+        'task_events',
+        sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+        sa.Column('task_id', sa.Uuid(), nullable=False),
+        sa.Column('topic_id', sa.Uuid(), nullable=False),
+        sa.Column('from_status', sa.String(length=20), nullable=False),
+        sa.Column('to_status', sa.String(length=20), nullable=False),
+        sa.Column('from_status_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('occurred_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'occurred_at'),
+        postgresql_partition_by='RANGE (occurred_at)',
+    )
+    op.create_index(
+        'ix_task_events_occurred_at', 'task_events', ['occurred_at'], unique=False, postgresql_using='brin'
+    )
+    op.create_index(
+        'ix_task_events_topic_occurred_at', 'task_events', ['topic_id', 'occurred_at'], unique=False
+    )
+    # Monthly partitions are created (and dropped) by app.services.task_events; this one
+    # catches any row written before its month's partition exists.
+    op.execute('CREATE TABLE task_events_default PARTITION OF task_events DEFAULT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_events_topic_occurred_at', table_name='task_events')
+    op.drop_index('ix_task_events_occurred_at', table_name='task_events')
+    op.drop_table('task_events')
+    op.drop_column('tasks', 'status_changed_at')
@@ -0,0 +1,58 @@
+"""space sort keys
+
+Revision ID: b57a0c3e9f21
+Revises: 8d2f4b6e1a90
+Create Date: 2026-10-17 11:26:15.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b57a0c3e9f21'
+down_revision: Union[str, Sequence[str], None] = '8d2f4b6e1a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with app.services.ordering.SORT_GAP.
+SORT_GAP = 1024
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, parent_column in (("topics", "roadmap_id"), ("tasks", "topic_id")):
+        op.execute(
+            f"""
+            UPDATE {table}
+            SET sort_order = ranked.position * {SORT_GAP}
+            FROM (
+                SELECT id,
+                       row_number() OVER (
+                           PARTITION BY {parent_column}
+                           ORDER BY sort_order, created_at, id
+                       ) AS position
+                FROM {table}
+            ) AS ranked
+            WHERE {table}.id = ranked.id
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, parent_column in (("topics", "roadmap_id"), ("tasks", "topic_id")):
+        op.execute(
+            f"""
+            UPDATE {table}
+            SET sort_order = ranked.position
+            FROM (
+                SELECT id,
+                       row_number() OVER (PARTITION BY {parent_column} ORDER BY sort_order, id) - 1
+                           AS position
+                FROM {table}
+            ) AS ranked
+            WHERE {table}.id = ranked.id
+            """
+        )
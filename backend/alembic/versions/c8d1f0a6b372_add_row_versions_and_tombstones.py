@@ -0,0 +1,68 @@
+"""add row versions and tombstones
+
+Revision ID: c8d1f0a6b372
+Revises: 7a3e5c9d1f28
+Create Date: 2026-10-17 15:21:09.337416
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d1f0a6b372'
+down_revision: Union[str, Sequence[str], None] = '7a3e5c9d1f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with app.models.base.CURRENT_XACT_VERSION.
+CURRENT_XACT_VERSION = "(pg_current_xact_id()::text)::bigint"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Versions become the writing transaction's id. Restamp the existing roadmaps so that
+    # no sequence-drawn version is ahead of the versions written from now on.
+    op.alter_column('roadmaps', 'version', server_default=sa.text(CURRENT_XACT_VERSION))
+    op.execute(f"UPDATE roadmaps SET version = {CURRENT_XACT_VERSION}")
+    op.execute("DROP SEQUENCE roadmap_version_seq")
+    for table in ("topics", "tasks"):
+        op.add_column(
+            table,
+            sa.Column("version", sa.BigInteger(), nullable=False, server_default=sa.text(CURRENT_XACT_VERSION)),
+        )
+    for table in ("roadmaps", "topics", "tasks"):
+        op.create_index(f'ix_{table}_version', table, ['version'], unique=False)
+
+    op.create_table(
+        'tombstones',
+        sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.Uuid(), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default=sa.text(CURRENT_XACT_VERSION), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_tombstones_version'), 'tombstones', ['version'], unique=False)
+    op.create_index(op.f('ix_tombstones_deleted_at'), 'tombstones', ['deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tombstones_deleted_at'), table_name='tombstones')
+    op.drop_index(op.f('ix_tombstones_version'), table_name='tombstones')
+    op.drop_table('tombstones')
+    for table in ("roadmaps", "topics", "tasks"):
+        op.drop_index(f'ix_{table}_version', table_name=table)
+    for table in ("topics", "tasks"):
+        op.drop_column(table, "version")
+    # Start the sequence past every transaction id handed out so far.
+    op.execute(sa.schema.CreateSequence(sa.Sequence("roadmap_version_seq")))
+    op.execute(
+        "SELECT setval('roadmap_version_seq', "
+        "greatest((SELECT max(version) FROM roadmaps), (pg_current_xact_id()::text)::bigint))"
+    )
+    op.alter_column('roadmaps', 'version', server_default=sa.text("nextval('roadmap_version_seq')"))
+    op.execute("ALTER SEQUENCE roadmap_version_seq OWNED BY roadmaps.version")
@@ -0,0 +1,34 @@
+"""extend version indexes
+
+Revision ID: d92b5e7f1c36
+Revises: a7c3e91b5d24
+Create Date: 2026-10-17 18:41:09.276514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd92b5e7f1c36'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e91b5d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('roadmaps', 'topics', 'tasks', 'tombstones')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Extend the version indexes with id so sync pages resume exactly at the cursor.
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_version', table_name=table)
+        op.create_index(f'ix_{table}_version', table, ['version', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_version', table_name=table)
+        op.create_index(f'ix_{table}_version', table, ['version'], unique=False)
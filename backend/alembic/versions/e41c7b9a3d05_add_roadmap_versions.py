@@ -0,0 +1,40 @@
+"""add roadmap versions
+
+Revision ID: e41c7b9a3d05
+Revises: b57a0c3e9f21
+Create Date: 2026-10-17 13:12:48.201655
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41c7b9a3d05'
+down_revision: Union[str, Sequence[str], None] = 'b57a0c3e9f21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence("roadmap_version_seq")))
+    # The volatile default gives every existing row its own value while the column is added.
+    op.add_column(
+        "roadmaps",
+        sa.Column(
+            "version",
+            sa.BigInteger(),
+            nullable=False,
+            server_default=sa.text("nextval('roadmap_version_seq')"),
+        ),
+    )
+    op.execute("ALTER SEQUENCE roadmap_version_seq OWNED BY roadmaps.version")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Dropping the owning column drops the sequence with it.
+    op.drop_column("roadmaps", "version")
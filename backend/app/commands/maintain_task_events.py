@@ -0,0 +1,51 @@
+import argparse
+import asyncio
+from datetime import UTC, datetime
+
+from app.config import get_settings
+from app.database import SessionLocal, engine
+from app.services.task_events import list_partitions, maintain_partitions
+
+
+async def run(months_ahead: int, retention_months: int, status_only: bool) -> int:
+    async with SessionLocal() as session:
+        if not status_only:
+            changes = await maintain_partitions(
+                session,
+                today=datetime.now(UTC).date(),
+                months_ahead=months_ahead,
+                retention_months=retention_months,
+            )
+            print(f"created: {', '.join(changes.created) or 'none'}")
+            print(f"dropped: {', '.join(changes.dropped) or 'none'}")
+        partitions = await list_partitions(session)
+    await engine.dispose()
+
+    print(f"partitions: {', '.join(partitions) or 'none'}")
+    return 0
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        description="Create upcoming monthly task_events partitions and drop the ones past retention."
+    )
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=settings.task_event_months_ahead,
+        help="months to create partitions for after the current one (default: TASK_EVENT_MONTHS_AHEAD)",
+    )
+    parser.add_argument(
+        "--retention-months",
+        type=int,
+        default=settings.task_event_retention_months,
+        help="full months to keep before the current one, 0 for all (default: TASK_EVENT_RETENTION_MONTHS)",
+    )
+    parser.add_argument("--status", action="store_true", help="only list the partitions")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(run(args.months_ahead, args.retention_months, args.status)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import asyncio
+import time
+
+from app.config import get_settings
+from app.database import SessionLocal, engine
+from app.services.purge_service import PurgeService
+
+# How often progress is printed while purging.
+REPORT_SECONDS = 5.0
+
+
+async def run(batch_size: int, status_only: bool) -> int:
+    async with SessionLocal() as session:
+        backlog = await PurgeService(session, batch_size).backlog()
+    print(
+        f"pending: {backlog.roadmaps} roadmap(s), {backlog.topics} topic(s), {backlog.tasks} task(s),"
+        f" {backlog.tombstones} expired tombstone(s)"
+    )
+    if status_only:
+        await engine.dispose()
+        return 0
+
+    purged_tasks = purged_topics = purged_roadmaps = purged_tombstones = 0
+    started = reported = time.perf_counter()
+    while True:
+        async with SessionLocal() as session:
+            purged = await PurgeService(session, batch_size).purge_batch()
+        if purged is None:
+            break
+        purged_tasks += purged.tasks
+        purged_topics += purged.topics
+        purged_roadmaps += purged.roadmaps
+        purged_tombstones += purged.tombstones
+        if time.perf_counter() - reported >= REPORT_SECONDS:
+            reported = time.perf_counter()
+            print(f"purged {purged_tasks}/{backlog.tasks} task(s), {purged_topics} topic(s) so far")
+    await engine.dispose()
+
+    print(
+        f"purged {purged_roadmaps} roadmap(s), {purged_topics} topic(s), {purged_tasks} task(s),"
+        f" {purged_tombstones} tombstone(s) in {time.perf_counter() - started:.1f}s"
+    )
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Remove the rows of soft-deleted roadmaps and topics, and expired sync tombstones,"
+        " in batches, until none are left."
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=get_settings().purge_batch_size or 1000,
+        help="tasks deleted per transaction (default: PURGE_BATCH_SIZE)",
+    )
+    parser.add_argument("--status", action="store_true", help="only print what is waiting to be purged")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(run(args.batch_size, args.status)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+
+from app.database import SessionLocal, engine
+from app.services.rollups import reconcile_rollups
+
+
+async def run(fix: bool) -> int:
+    async with SessionLocal() as session:
+        drift = await reconcile_rollups(session, fix=fix)
+    await engine.dispose()
+
+    for item in drift:
+        print(f"{item.table} {item.key}: stored={item.stored} actual={item.actual}")
+    action = "repaired" if fix else "found"
+    print(f"{len(drift)} drifted row(s) {action}")
+    return 1 if drift and not fix else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Recompute progress counters and daily completions from the tasks table and report drift."
+    )
+    parser.add_argument(
+        "--fix", action="store_true", help="write the recomputed counters back to drifted rows"
+    )
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(run(args.fix)))
+
+
+if __name__ == "__main__":
+    main()
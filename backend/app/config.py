@@ -1,21 +1,157 @@
+from dataclasses import dataclass, replace
 from functools import lru_cache
+from typing import Literal
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+PoolProfileName = Literal["direct", "transaction_pooler", "serverless"]
+
+
+@dataclass(frozen=True, slots=True)
+class PoolProfile:
+    """How app.database sizes its connection pool and sets up each asyncpg connection."""
+
+    pool_size: int
+    max_overflow: int
+    # Seconds a checkout waits for a free connection before failing.
+    pool_timeout: float
+    # Seconds after which a connection is replaced instead of reused.
+    pool_recycle: int
+    # "always" pings on every checkout (one extra round trip each), "idle" only connections
+    # idle for ping_idle_seconds or more, "never" relies on pool_recycle and on disconnect
+    # errors invalidating the pool.
+    pre_ping: Literal["always", "idle", "never"]
+    ping_idle_seconds: float
+    # Prepared statements cached per connection, by asyncpg and by SQLAlchemy. 0 where a
+    # transaction pooler may run each transaction on a different server connection.
+    statement_cache_size: int
+    connect_timeout: float
+    # Client-side limit on any one statement; None for no limit.
+    command_timeout: float | None
+
+
+POOL_PROFILES: dict[PoolProfileName, PoolProfile] = {
+    # Postgres (or a session-mode pooler) reached directly: connections and the statements
+    # prepared on them are long-lived.
+    "direct": PoolProfile(
+        pool_size=5,
+        max_overflow=5,
+        pool_timeout=30.0,
+        pool_recycle=1800,
+        pre_ping="idle",
+        ping_idle_seconds=60.0,
+        statement_cache_size=100,
+        connect_timeout=10.0,
+        command_timeout=None,
+    ),
+    # PgBouncer in transaction mode, or Neon's pooled endpoint: client connections are cheap
+    # since the pooler multiplexes them, but nothing prepared outlives a transaction.
+    "transaction_pooler": PoolProfile(
+        pool_size=10,
+        max_overflow=10,
+        pool_timeout=10.0,
+        pool_recycle=300,
+        pre_ping="idle",
+        ping_idle_seconds=60.0,
+        statement_cache_size=0,
+        connect_timeout=10.0,
+        command_timeout=None,
+    ),
+    # Short-lived instances in front of a database that scales to zero: few connections,
+    # shed load quickly, expect connections to die while idle and a slow first connect.
+    "serverless": PoolProfile(
+        pool_size=2,
+        max_overflow=3,
+        pool_timeout=5.0,
+        pool_recycle=60,
+        pre_ping="always",
+        ping_idle_seconds=0.0,
+        statement_cache_size=0,
+        connect_timeout=30.0,
+        command_timeout=30.0,
+    ),
+}
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
     database_url: str
+    # Session-level connections the pool does not serve (the /api/events LISTEN), which a
+    # transaction pooler cannot carry: point this at the direct endpoint when database_url
+    # goes through one. Defaults to database_url.
+    direct_database_url: str | None = None
+    # Optional read replica (a hot standby, or any copy kept in sync) for the heavy GETs:
+    # roadmap list and detail, dashboard, search and analytics. A client's reads go to the
+    # primary for read_after_write_seconds after its own write (tracked with a cookie, so
+    # whichever process served the write), and every read does whenever the replica is
+    # unreachable or more than replica_max_lag_seconds behind.
+    read_database_url: str | None = None
+    read_after_write_seconds: float = 5.0
+    replica_max_lag_seconds: float = 2.0
     api_key: str
     app_name: str = "Learning Tracker API"
     app_env: str = "development"
+    # How GET /api/roadmaps/{id} is built: ORM objects and pydantic models ("orm"),
+    # Core rows validated once ("core"), or JSON text rendered by Postgres ("json").
+    roadmap_detail_engine: Literal["orm", "core", "json"] = "core"
+    # Pool sizing, statement caching, pre-ping and timeouts, as a whole (see POOL_PROFILES);
+    # db_pool_size and db_max_overflow override the profile's sizing, which is per process.
+    db_pool_profile: PoolProfileName = "direct"
+    db_pool_size: int | None = None
+    db_max_overflow: int | None = None
+    # Admission control of the /api routes: admission_max_active requests run at once (by
+    # default the pool's size plus overflow, 0 disables it), up to admission_max_queued
+    # more wait for admission_queue_timeout_seconds at most, reads ahead of writes ahead of
+    # bulk operations; the rest get a 503 with Retry-After instead of queueing in the pool.
+    admission_max_active: int | None = None
+    admission_max_queued: int = 50
+    admission_queue_timeout_seconds: float = 2.0
+    # Statements that run for slow_query_seconds or more are logged with their parameters,
+    # and requests that take slow_request_seconds or more with their SQL time, under the
+    # request's X-Request-ID. 0 disables either.
+    slow_query_seconds: float = 0.25
+    slow_request_seconds: float = 1.0
+    # Per-route request counters and the /metrics endpoint (Prometheus text format, per process).
+    metrics_enabled: bool = True
+    # In-process cache of the roadmap list/detail and dashboard responses. Writes made by
+    # other processes (other workers, the reconcile command) only show up once the TTL
+    # runs out, so keep the TTL short when running several workers. 0 entries disables it.
+    response_cache_max_entries: int = 1024
+    response_cache_ttl_seconds: float = 30.0
+    # Events buffered per /api/events subscriber; a subscriber that falls further behind
+    # gets a single "resync" event in place of its backlog.
+    event_queue_size: int = 256
+    # Soft-deleted roadmaps and topics are removed in the background, this many tasks per
+    # transaction; idle purgers look for deletes made by other processes every
+    # purge_idle_seconds. 0 disables the in-process purger (see app.commands.purge_deleted).
+    purge_batch_size: int = 1000
+    purge_idle_seconds: float = 60.0
+    # /api/sync cursors older than this many days get a full sync instead of a delta; the
+    # purger drops tombstones a day after that (see app.services.sync_service).
+    sync_tombstone_retention_days: int = 30
+    # Task status events live in monthly partitions: task_event_months_ahead partitions
+    # are kept created in advance, and months more than task_event_retention_months back
+    # are dropped whole (0 keeps every month). Every process checks at startup and
+    # every few hours after (see also app.commands.maintain_task_events).
+    task_event_months_ahead: int = 2
+    task_event_retention_months: int = 24
+
+    def pool_profile(self) -> PoolProfile:
+        sizing = {"pool_size": self.db_pool_size, "max_overflow": self.db_max_overflow}
+        return replace(
+            POOL_PROFILES[self.db_pool_profile],
+            **{key: value for key, value in sizing.items() if value is not None},
+        )
 
-    @field_validator("database_url", mode="before")
+    @field_validator("database_url", "direct_database_url", "read_database_url", mode="before")
     @classmethod
-    def normalise_database_url(cls, value: str) -> str:
+    def normalise_database_url(cls, value: str | None) -> str | None:
+        if not value:
+            return None
         normalized = value.strip().strip('"').strip("'")
         if normalized.startswith("postgres://"):
             normalized = normalized.replace("postgres://", "postgresql+asyncpg://", 1)
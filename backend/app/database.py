@@ -1,22 +1,159 @@
+import time
 from collections.abc import AsyncGenerator
+from dataclasses import dataclass, replace
+from typing import Any, cast
+from uuid import uuid4
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy import event, make_url, text
+from sqlalchemy.exc import DBAPIError, DisconnectionError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
-from app.config import get_settings
+from app.config import PoolProfile, get_settings
+from app.middleware.query_count import record_query, record_query_time
+from app.middleware.read_after_write import must_read_primary
+from app.middleware.tracing import record_statement
+
+
+@dataclass(slots=True)
+class PoolStats:
+    # Current state of the pool.
+    connections: int = 0
+    checked_out: int = 0
+    overflow: int = 0
+    # Since the pool was created.
+    checkouts: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    timeouts: int = 0
+    # Idle pre-pings, and the connections they found dead.
+    pings: int = 0
+    stale: int = 0
+
+
+class _TimedPool(AsyncAdaptedQueuePool):
+    """Records how long each checkout takes: waiting for a free connection, or opening one."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.counters = PoolStats()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.counters.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.counters.checkouts += 1
+            self.counters.wait_seconds += waited
+            self.counters.max_wait_seconds = max(self.counters.max_wait_seconds, waited)
+
+
+@dataclass(slots=True)
+class ReplicaStats:
+    configured: bool = False
+    # As of the last check by app.services.replica_monitor.
+    healthy: bool = False
+    lag_seconds: float | None = None
+    failures: int = 0
+    # Reads routed by get_read_db: to the replica, to the primary after the client's own
+    # write, and to the primary while the replica was unhealthy.
+    replica_reads: int = 0
+    sticky_reads: int = 0
+    fallback_reads: int = 0
+
+
+def _pool(target: AsyncEngine) -> _TimedPool:
+    return cast(_TimedPool, target.sync_engine.pool)
+
+
+def _ping_idle_connections(engine: AsyncEngine, idle_seconds: float) -> None:
+    # pool_pre_ping costs a round trip on every checkout; only connections that sat idle
+    # long enough to have been dropped (by the server, a pooler or the network) get one.
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _checked_in(_dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        record.info["idle_since"] = time.monotonic()
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _checked_out(dbapi_connection: Any, record: ConnectionPoolEntry, _proxy: Any) -> None:
+        idle_since = record.info.pop("idle_since", None)
+        if idle_since is None or time.monotonic() - idle_since < idle_seconds:
+            return
+        counters = _pool(engine).counters
+        counters.pings += 1
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception as exc:
+            counters.stale += 1
+            # The pool discards the connection and checks out another.
+            raise DisconnectionError() from exc
+
+
+def build_engine(url: str, profile: PoolProfile) -> AsyncEngine:
+    connect_args: dict[str, Any] = {
+        "timeout": profile.connect_timeout,
+        "command_timeout": profile.command_timeout,
+        "statement_cache_size": profile.statement_cache_size,
+        "prepared_statement_cache_size": profile.statement_cache_size,
+    }
+    if not profile.statement_cache_size:
+        # Behind a transaction pooler, statements other clients prepared on the same server
+        # connection may still be there: never reuse a name.
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    engine = create_async_engine(
+        url,
+        poolclass=_TimedPool,
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
+        pool_timeout=profile.pool_timeout,
+        pool_recycle=profile.pool_recycle,
+        pool_pre_ping=profile.pre_ping == "always",
+        connect_args=connect_args,
+    )
+    if profile.pre_ping == "idle":
+        _ping_idle_connections(engine, profile.ping_idle_seconds)
+    return engine
 
 
 settings = get_settings()
 
-engine = create_async_engine(
-    settings.database_url,
-    pool_size=5,
-    max_overflow=5,
-    pool_pre_ping=True,
-    pool_recycle=300,
+engine = build_engine(settings.database_url, settings.pool_profile())
+read_engine = (
+    build_engine(settings.read_database_url, settings.pool_profile()) if settings.read_database_url else None
 )
+replica = ReplicaStats(configured=read_engine is not None)
+
+
+# A connection runs one statement at a time, so its start time can live on the connection.
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_query(conn: Any, *_args: object) -> None:
+    conn.info["query_started"] = time.perf_counter()
+    record_query()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _time_query(conn: Any, _cursor: Any, statement: str, parameters: Any, *_args: object) -> None:
+    seconds = time.perf_counter() - conn.info.pop("query_started")
+    record_query_time(seconds)
+    record_statement(statement, parameters, seconds)
+
+
+if read_engine is not None:
+    event.listen(read_engine.sync_engine, "before_cursor_execute", _count_query)
+    event.listen(read_engine.sync_engine, "after_cursor_execute", _time_query)
+
 
 SessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+ReadSessionLocal = (
+    async_sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not None
+    else None
+)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -24,6 +161,59 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+def _read_sessions(request: Request) -> async_sessionmaker[AsyncSession]:
+    if ReadSessionLocal is None:
+        return SessionLocal
+    if must_read_primary(request):
+        replica.sticky_reads += 1
+        return SessionLocal
+    if not replica.healthy:
+        replica.fallback_reads += 1
+        return SessionLocal
+    replica.replica_reads += 1
+    return ReadSessionLocal
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """A session for reads that tolerate a little replication lag: on the replica, if there is one.
+
+    Sets ``request.state.read_replica`` to whether it is. A replica connection that turns
+    out dead marks the replica unhealthy, so later reads fall back to the primary until
+    the next successful check.
+    """
+    sessions = _read_sessions(request)
+    request.state.read_replica = sessions is ReadSessionLocal
+    async with sessions() as session:
+        try:
+            yield session
+        except (OSError, DBAPIError) as exc:
+            if request.state.read_replica and (isinstance(exc, OSError) or exc.connection_invalidated):
+                replica.healthy = False
+                replica.failures += 1
+            raise
+
+
+def pool_stats(target: AsyncEngine | None = None) -> PoolStats:
+    """Checkout counters and current use of the pool of ``target`` (by default, the app's engine)."""
+    pool = _pool(target or engine)
+    return replace(
+        pool.counters,
+        connections=pool.checkedin() + pool.checkedout(),
+        checked_out=pool.checkedout(),
+        overflow=max(pool.overflow(), 0),
+    )
+
+
+def replica_stats() -> ReplicaStats:
+    return replace(replica)
+
+
+def direct_connect_args() -> dict[str, Any]:
+    """asyncpg.connect() arguments for a connection outside the pool, on DIRECT_DATABASE_URL if set."""
+    url = make_url(settings.direct_database_url or settings.database_url)
+    return engine.dialect.create_connect_args(url)[1]
+
+
 async def check_db_connection() -> bool:
     try:
         async with engine.connect() as conn:
@@ -1,27 +1,83 @@
-from fastapi import Depends, FastAPI, HTTPException, status
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from typing import Any
+
+from fastapi import Depends, FastAPI, HTTPException, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
 
 from app.config import get_settings
-from app.database import check_db_connection
-from app.middleware.auth import verify_api_key
-from app.routers import dashboard_router, roadmaps_router, tasks_router, topics_router
+from app.database import check_db_connection, engine, pool_stats, read_engine, replica_stats
+from app.middleware.admission import admit
+from app.middleware.auth import verify_api_key, verify_stream_api_key
+from app.middleware.metrics import MetricsMiddleware, request_metrics
+from app.middleware.query_count import QUERY_COUNT_HEADER, QueryCountMiddleware
+from app.middleware.read_after_write import ReadAfterWriteMiddleware
+from app.middleware.tracing import REQUEST_ID_HEADER, RequestTraceMiddleware
+from app.routers import (
+    analytics_router,
+    dashboard_router,
+    events_router,
+    roadmaps_router,
+    search_router,
+    sync_router,
+    tasks_router,
+    topics_router,
+)
+from app.services.events import event_broker
+from app.services.metrics import PROMETHEUS_MEDIA_TYPE, render_metrics
+from app.services.pagination import NEXT_CURSOR_HEADER
+from app.services.purge_service import purger
+from app.services.replica_monitor import replica_monitor
+from app.services.task_events import partition_maintainer
 
 settings = get_settings()
 
-app = FastAPI(title=settings.app_name, default_response_class=ORJSONResponse)
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    purger.start()
+    partition_maintainer.start()
+    replica_monitor.start()
+    yield
+    await replica_monitor.stop()
+    await partition_maintainer.stop()
+    await purger.stop()
+    await event_broker.stop()
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+
+
+app = FastAPI(title=settings.app_name, default_response_class=ORJSONResponse, lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[QUERY_COUNT_HEADER, NEXT_CURSOR_HEADER, REQUEST_ID_HEADER, "ETag", "Retry-After"],
 )
+# Both inside QueryCountMiddleware, whose per-request query counter they read.
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestTraceMiddleware)
+app.add_middleware(QueryCountMiddleware)
+if read_engine is not None:
+    app.add_middleware(ReadAfterWriteMiddleware, window_seconds=settings.read_after_write_seconds)
 
-app.include_router(roadmaps_router, prefix="/api", dependencies=[Depends(verify_api_key)])
-app.include_router(topics_router, prefix="/api", dependencies=[Depends(verify_api_key)])
-app.include_router(tasks_router, prefix="/api", dependencies=[Depends(verify_api_key)])
-app.include_router(dashboard_router, prefix="/api", dependencies=[Depends(verify_api_key)])
+# Authenticated first, so that rejected keys never take an admission slot. The event stream
+# holds no pooled connection and is not admission-controlled.
+api_dependencies = [Depends(verify_api_key), Depends(admit)]
+app.include_router(roadmaps_router, prefix="/api", dependencies=api_dependencies)
+app.include_router(topics_router, prefix="/api", dependencies=api_dependencies)
+app.include_router(tasks_router, prefix="/api", dependencies=api_dependencies)
+app.include_router(dashboard_router, prefix="/api", dependencies=api_dependencies)
+app.include_router(sync_router, prefix="/api", dependencies=api_dependencies)
+app.include_router(search_router, prefix="/api", dependencies=api_dependencies)
+app.include_router(analytics_router, prefix="/api", dependencies=api_dependencies)
+app.include_router(events_router, prefix="/api", dependencies=[Depends(verify_stream_api_key)])
 
 
 @app.get("/health")
@@ -33,3 +89,22 @@ async def health() -> dict[str, str]:
             detail="Database connection failed",
         )
     return {"status": "ok", "db": "connected"}
+
+
+@app.get("/health/pool")
+async def health_pool() -> dict[str, Any]:
+    """This worker's connection pools: current use, and checkout waits since it started."""
+    pools: dict[str, Any] = {"profile": settings.db_pool_profile, **asdict(pool_stats())}
+    if read_engine is not None:
+        pools["replica"] = {**asdict(replica_stats()), "pool": asdict(pool_stats(read_engine))}
+    return pools
+
+
+if settings.metrics_enabled:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        """This worker's metrics, in the Prometheus text format."""
+        return Response(render_metrics(request_metrics), media_type=PROMETHEUS_MEDIA_TYPE)
+
+    request_metrics.register_routes(app.routes)
@@ -1,3 +1,4 @@
 from app.middleware.auth import verify_api_key
+from app.middleware.query_count import QueryCountMiddleware
 
-__all__ = ["verify_api_key"]
+__all__ = ["QueryCountMiddleware", "verify_api_key"]
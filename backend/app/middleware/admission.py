@@ -0,0 +1,169 @@
+import asyncio
+import math
+from collections import deque
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from fastapi import HTTPException, Request, status
+
+from app.config import get_settings
+
+
+class Priority(IntEnum):
+    """Admission order when requests wait: lower first."""
+
+    READ = 0
+    WRITE = 1
+    # Custom actions (":clone", ":import", ":batch", ":reorder") and exports.
+    BULK = 2
+
+
+@dataclass(slots=True)
+class AdmissionStats:
+    # Requests holding a slot, and waiting for one, by priority.
+    active: int = 0
+    queued: list[int] = field(default_factory=lambda: [0] * len(Priority))
+    # Since start.
+    admitted: int = 0
+    waited: int = 0
+    wait_seconds: float = 0.0
+    # Turned away: the queue was full, a higher priority request took the place in it,
+    # or the wait ran past the deadline.
+    rejected_full: int = 0
+    rejected_displaced: int = 0
+    rejected_timeout: int = 0
+
+
+class Overloaded(Exception):
+    pass
+
+
+class AdmissionController:
+    """Lets at most ``max_active`` requests run at once, and up to ``max_queued`` more wait.
+
+    Waiting requests are let in by priority, first come first served within one. When
+    the queue is full, a request takes the place of the latest lower priority waiter or
+    is turned away; waiters give up after ``queue_timeout`` seconds.
+    """
+
+    def __init__(self, max_active: int, max_queued: int, queue_timeout: float) -> None:
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._waiters: tuple[deque[asyncio.Future[None]], ...] = tuple(deque() for _ in Priority)
+        self._stats = AdmissionStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_active > 0
+
+    def stats(self) -> AdmissionStats:
+        return AdmissionStats(
+            active=self._active,
+            queued=[len(waiters) for waiters in self._waiters],
+            admitted=self._stats.admitted,
+            waited=self._stats.waited,
+            wait_seconds=self._stats.wait_seconds,
+            rejected_full=self._stats.rejected_full,
+            rejected_displaced=self._stats.rejected_displaced,
+            rejected_timeout=self._stats.rejected_timeout,
+        )
+
+    async def acquire(self, priority: Priority) -> None:
+        """Wait for a slot; raises Overloaded if none comes up in time."""
+        if self._active < self.max_active and not any(self._waiters):
+            self._active += 1
+            self._stats.admitted += 1
+            return
+        queued = sum(len(waiters) for waiters in self._waiters)
+        if queued >= self.max_queued and not self._displace(priority):
+            self._stats.rejected_full += 1
+            raise Overloaded
+
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future[None] = loop.create_future()
+        self._waiters[priority].append(waiter)
+        started = loop.time()
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await waiter
+        except (TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # Handed a slot just as the wait ended: pass it on.
+                self.release()
+            elif waiter in self._waiters[priority]:
+                self._waiters[priority].remove(waiter)
+            if isinstance(exc, TimeoutError):
+                self._stats.rejected_timeout += 1
+                raise Overloaded from None
+            raise
+        finally:
+            self._stats.waited += 1
+            self._stats.wait_seconds += loop.time() - started
+        self._stats.admitted += 1
+
+    def release(self) -> None:
+        for waiters in self._waiters:
+            while waiters:
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    # The slot goes straight to the waiter; the active count stays.
+                    waiter.set_result(None)
+                    return
+        self._active -= 1
+
+    def _displace(self, priority: Priority) -> bool:
+        for lower in reversed(Priority):
+            if lower <= priority:
+                return False
+            waiters = self._waiters[lower]
+            while waiters:
+                waiter = waiters.pop()
+                if not waiter.done():
+                    waiter.set_exception(Overloaded())
+                    self._stats.rejected_displaced += 1
+                    return True
+        return False
+
+
+def _priority(request: Request) -> Priority:
+    route = request.scope.get("route")
+    path = getattr(route, "path", request.url.path)
+    if ":" in path.rsplit("/", 1)[-1] or path.endswith("/export"):
+        return Priority.BULK
+    return Priority.READ if request.method in ("GET", "HEAD") else Priority.WRITE
+
+
+settings = get_settings()
+_profile = settings.pool_profile()
+admission = AdmissionController(
+    # By default as many requests as the pool has connections, overflow included.
+    max_active=(
+        settings.admission_max_active
+        if settings.admission_max_active is not None
+        else _profile.pool_size + _profile.max_overflow
+    ),
+    max_queued=settings.admission_max_queued,
+    queue_timeout=settings.admission_queue_timeout_seconds,
+)
+
+
+async def admit(request: Request) -> AsyncGenerator[None, None]:
+    """Hold an admission slot for the whole request, its streamed body included; 503 if none comes up."""
+    if not admission.enabled:
+        yield
+        return
+    try:
+        await admission.acquire(_priority(request))
+    except Overloaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy",
+            headers={"Retry-After": str(max(math.ceil(admission.queue_timeout), 1))},
+        ) from None
+    try:
+        yield
+    finally:
+        admission.release()
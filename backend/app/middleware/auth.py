@@ -1,4 +1,4 @@
-from fastapi import Header, HTTPException, status
+from fastapi import Header, HTTPException, Query, status
 
 from app.config import get_settings
 
@@ -7,3 +7,11 @@ async def verify_api_key(x_api_key: str | None = Header(default=None, alias="X-A
     settings = get_settings()
     if not x_api_key or x_api_key != settings.api_key:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+
+
+async def verify_stream_api_key(
+    x_api_key: str | None = Header(default=None, alias="X-API-Key"),
+    api_key: str | None = Query(default=None),
+) -> None:
+    # EventSource cannot send headers, so streams also take the key as a query parameter.
+    await verify_api_key(x_api_key or api_key)
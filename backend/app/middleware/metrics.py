@@ -0,0 +1,122 @@
+import time
+from bisect import bisect_left
+from collections.abc import Iterable
+
+from fastapi.routing import APIRoute
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.query_count import current_query_counter
+
+# Upper bounds of the latency buckets, in seconds (Prometheus' defaults).
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+UNMATCHED_ROUTE = "unmatched"
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+
+
+class Histogram:
+    """Observations counted per bucket; the cumulative counts are only summed when read."""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        # One count per bound, plus one for the values above every bound.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def cumulative(self) -> list[int]:
+        total = 0
+        cumulative = []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+class RouteMetrics:
+    __slots__ = ("method", "route", "latency", "responses", "db_queries", "db_seconds")
+
+    def __init__(self, method: str, route: str) -> None:
+        self.method = method
+        self.route = route
+        self.latency = Histogram(LATENCY_BUCKETS)
+        # Responses per status class, indexed by status // 100 - 1.
+        self.responses = [0] * len(STATUS_CLASSES)
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+
+class RequestMetrics:
+    """Request counters of this process, one RouteMetrics per route and method, allocated up front."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self._routes: dict[tuple[str, str], RouteMetrics] = {}
+        self._unmatched: dict[str, RouteMetrics] = {}
+
+    def register_routes(self, routes: Iterable[BaseRoute]) -> None:
+        for route in routes:
+            if isinstance(route, APIRoute):
+                for method in sorted(route.methods):
+                    self._routes.setdefault((method, route.path), RouteMetrics(method, route.path))
+
+    def route(self, method: str, path: str | None) -> RouteMetrics:
+        metrics = self._routes.get((method, path)) if path is not None else None
+        if metrics is None:
+            # Requests no API route matched (404s, the docs pages), by method.
+            metrics = self._unmatched.get(method)
+            if metrics is None:
+                metrics = self._unmatched[method] = RouteMetrics(method, UNMATCHED_ROUTE)
+        return metrics
+
+    def routes(self) -> list[RouteMetrics]:
+        return [*self._routes.values(), *self._unmatched.values()]
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """Time every request and count its response and SQL statements against its route.
+
+    Must run inside QueryCountMiddleware, whose per-request counter it reads. The route
+    is the one FastAPI matched (its path template); the time runs until the response
+    has been sent, so a stream counts for as long as it is open.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.in_flight -= 1
+            route = scope.get("route")
+            metrics = self.metrics.route(scope["method"], route.path if isinstance(route, APIRoute) else None)
+            metrics.latency.observe(time.perf_counter() - started)
+            metrics.responses[min(max(status_code // 100, 1), 5) - 1] += 1
+            counter = current_query_counter.get()
+            if counter is not None:
+                metrics.db_queries += counter.count
+                metrics.db_seconds += counter.seconds
@@ -0,0 +1,58 @@
+from contextvars import ContextVar
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+
+
+class QueryCounter:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+
+
+current_query_counter: ContextVar[QueryCounter | None] = ContextVar("current_query_counter", default=None)
+# Every statement this process ran, in requests or not.
+query_totals = QueryCounter()
+
+
+def record_query() -> None:
+    query_totals.count += 1
+    counter = current_query_counter.get()
+    if counter is not None:
+        counter.count += 1
+
+
+def record_query_time(seconds: float) -> None:
+    query_totals.seconds += seconds
+    counter = current_query_counter.get()
+    if counter is not None:
+        counter.seconds += seconds
+
+
+class QueryCountMiddleware:
+    """Count the SQL statements each request executes and report them in a response header."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = QueryCounter()
+        token = current_query_counter.set(counter)
+
+        async def send_with_count(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(QUERY_COUNT_HEADER, str(counter.count))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            current_query_counter.reset(token)
@@ -0,0 +1,75 @@
+import math
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PRIMARY_UNTIL_COOKIE = "primary_until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class RecentWrites:
+    """When this process last served a write."""
+
+    __slots__ = ("last_write",)
+
+    def __init__(self) -> None:
+        self.last_write = -math.inf
+
+    def record(self) -> None:
+        self.last_write = time.monotonic()
+
+    def within(self, seconds: float) -> bool:
+        return time.monotonic() - self.last_write < seconds
+
+
+# Not used for routing: a replica-rendered response is only kept out of the response cache
+# while a write this process served may not have been replayed yet (see app.responses).
+recent_writes = RecentWrites()
+
+
+def must_read_primary(connection: HTTPConnection) -> bool:
+    """Whether the client wrote recently enough that a replica may not have its write yet.
+
+    Its cookie says so until ``read_after_write_seconds`` after its last write, whichever
+    process served the write.
+    """
+    try:
+        until = float(connection.cookies.get(PRIMARY_UNTIL_COOKIE, ""))
+    except ValueError:
+        return False
+    return until > time.time()
+
+
+class ReadAfterWriteMiddleware:
+    """Send a client's reads that follow its write to the primary for ``window_seconds``.
+
+    The response to every request that may write sets a cookie telling the client's next
+    reads where to go (see app.database.get_read_db). The request is also recorded in
+    ``recent_writes`` when it starts and again when it responds.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: float) -> None:
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        recent_writes.record()
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                recent_writes.record()
+                until = time.time() + self.window_seconds
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{PRIMARY_UNTIL_COOKIE}={until:.3f}; Max-Age={math.ceil(self.window_seconds)};"
+                    " Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
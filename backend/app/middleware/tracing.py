@@ -0,0 +1,206 @@
+import asyncio
+import cProfile
+import io
+import logging
+import pstats
+import re
+import secrets
+import time
+from contextvars import ContextVar
+from typing import Any
+from uuid import uuid4
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.middleware.query_count import current_query_counter
+from app.schemas.transfer import NDJSON_MEDIA_TYPE
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+PROFILE_HEADER = "X-Profile"
+PROFILED_STATUS_HEADER = "X-Profiled-Status"
+# Incoming request ids are kept if they look like one, so a proxy's id carries through.
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._-]{1,64}")
+MAX_LOGGED_CHARS = 2000
+PROFILE_LINES = 30
+# Streamed responses are not profiled: an event stream never ends, and would hold the
+# profiler for as long as the client stayed connected.
+UNPROFILED_MEDIA_TYPES = frozenset({"text/event-stream", NDJSON_MEDIA_TYPE})
+
+
+class RequestTrace:
+    __slots__ = ("request_id", "statements")
+
+    def __init__(self, request_id: str) -> None:
+        self.request_id = request_id
+        # (seconds, statement) of every statement, only while the request is profiled.
+        self.statements: list[tuple[float, str]] | None = None
+
+
+current_trace: ContextVar[RequestTrace | None] = ContextVar("current_trace", default=None)
+
+
+class _StreamedResponse(Exception):
+    """Raised to abandon a profiled request whose response turns out to be streamed."""
+
+settings = get_settings()
+
+
+def _shorten(text: str) -> str:
+    return text if len(text) <= MAX_LOGGED_CHARS else text[:MAX_LOGGED_CHARS] + "..."
+
+
+def record_statement(statement: str, parameters: Any, seconds: float) -> None:
+    """Log ``statement`` if it ran for slow_query_seconds or more, under the id of the request that ran it."""
+    trace = current_trace.get()
+    if trace is not None and trace.statements is not None:
+        trace.statements.append((seconds, statement))
+    if 0 < settings.slow_query_seconds <= seconds:
+        logger.warning(
+            "Slow query (%.1f ms) in request %s: %s; parameters: %s",
+            seconds * 1e3,
+            trace.request_id if trace is not None else "-",
+            _shorten(" ".join(statement.split())),
+            _shorten(repr(parameters)),
+        )
+
+
+def _route_path(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", scope["path"])
+
+
+class RequestTraceMiddleware:
+    """Give each request an id (X-Request-ID), log it if slow, and profile it on request.
+
+    Must run inside QueryCountMiddleware, whose per-request counter it reads. A request
+    carrying ``X-Profile: 1`` and the API key runs under cProfile; its response is
+    replaced by a plain text summary of its SQL statements and the profile, with the
+    original status in X-Profiled-Status. cProfile sees the whole process, so requests
+    served meanwhile show up in the profile too, and only one request is profiled at a
+    time (others get a 409). Streamed responses (UNPROFILED_MEDIA_TYPES) are cut off as
+    they start and answered with a 400 instead.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._profiling = asyncio.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        request_id = headers.get(REQUEST_ID_HEADER, "")
+        if not REQUEST_ID_PATTERN.fullmatch(request_id):
+            request_id = uuid4().hex
+        trace = RequestTrace(request_id)
+        token = current_trace.set(trace)
+        try:
+            if headers.get(PROFILE_HEADER) == "1" and secrets.compare_digest(
+                headers.get("X-API-Key", ""), settings.api_key
+            ):
+                await self._profile(scope, receive, send, trace)
+            else:
+                await self._trace(scope, receive, send, trace)
+        finally:
+            current_trace.reset(token)
+
+    async def _trace(self, scope: Scope, receive: Receive, send: Send, trace: RequestTrace) -> None:
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, trace.request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            elapsed = time.perf_counter() - started
+            if 0 < settings.slow_request_seconds <= elapsed:
+                counter = current_query_counter.get()
+                logger.warning(
+                    "Slow request %s: %s %s -> %d in %.1f ms, SQL: %d statement(s) in %.1f ms",
+                    trace.request_id,
+                    scope["method"],
+                    _route_path(scope),
+                    status_code,
+                    elapsed * 1e3,
+                    counter.count if counter is not None else 0,
+                    counter.seconds * 1e3 if counter is not None else 0.0,
+                )
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send, trace: RequestTrace) -> None:
+        if self._profiling.locked():
+            response = PlainTextResponse(
+                "Another request is being profiled\n",
+                status_code=409,
+                headers={REQUEST_ID_HEADER: trace.request_id},
+            )
+            await response(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def discard(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                media_type = Headers(raw=message["headers"]).get("content-type", "").partition(";")[0]
+                if media_type.strip() in UNPROFILED_MEDIA_TYPES:
+                    raise _StreamedResponse
+
+        trace.statements = []
+        profile = cProfile.Profile()
+        async with self._profiling:
+            started = time.perf_counter()
+            profile.enable()
+            try:
+                await self.app(scope, receive, discard)
+            except _StreamedResponse:
+                streamed = True
+            else:
+                streamed = False
+            finally:
+                profile.disable()
+            elapsed = time.perf_counter() - started
+
+        if streamed:
+            response = PlainTextResponse(
+                "Streamed responses cannot be profiled\n",
+                status_code=400,
+                headers={REQUEST_ID_HEADER: trace.request_id},
+            )
+            await response(scope, receive, send)
+            return
+
+        sql_seconds = sum(seconds for seconds, _statement in trace.statements)
+        out = io.StringIO()
+        out.write(
+            f"{scope['method']} {_route_path(scope)} -> {status_code} in {elapsed * 1e3:.1f} ms"
+            f" (request {trace.request_id})\n"
+            f"SQL: {len(trace.statements)} statement(s) in {sql_seconds * 1e3:.1f} ms"
+            f" ({sql_seconds / elapsed:.0%} of the request)\n"
+        )
+        for seconds, statement in trace.statements:
+            out.write(f"  {seconds * 1e3:8.1f} ms  {' '.join(statement.split())[:200]}\n")
+        # Own time points at the hot spots (row processing, validation, serialization);
+        # cumulative time at the calls they are under.
+        stats = pstats.Stats(profile, stream=out)
+        for sort_key in (pstats.SortKey.TIME, pstats.SortKey.CUMULATIVE):
+            out.write("\n")
+            stats.sort_stats(sort_key).print_stats(PROFILE_LINES)
+        response = PlainTextResponse(
+            out.getvalue(),
+            headers={REQUEST_ID_HEADER: trace.request_id, PROFILED_STATUS_HEADER: str(status_code)},
+        )
+        await response(scope, receive, send)
@@ -1,6 +1,9 @@
 from app.models.base import Base
+from app.models.daily_completion import DailyCompletion
 from app.models.roadmap import Roadmap
 from app.models.task import Task, TaskStatus
+from app.models.task_event import TaskEvent
+from app.models.tombstone import Tombstone
 from app.models.topic import Topic
 
-__all__ = ["Base", "Roadmap", "Topic", "Task", "TaskStatus"]
+__all__ = ["Base", "DailyCompletion", "Roadmap", "Topic", "Task", "TaskStatus", "TaskEvent", "Tombstone"]
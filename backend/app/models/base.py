@@ -2,7 +2,8 @@ from datetime import datetime
 from uuid import UUID
 
 import uuid_utils
-from sqlalchemy import DateTime, func
+from sqlalchemy import BigInteger, Computed, DateTime, Integer, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -21,3 +22,64 @@ class TimestampMixin:
 
 class UUIDPrimaryKeyMixin:
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid_utils.uuid7)
+
+
+class ProgressCountersMixin:
+    # Denormalized task counters, maintained by app.services.rollups on every task write.
+    total_tasks: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    completed_tasks: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    in_progress_tasks: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
+
+# The 64-bit id of the writing transaction: every row a transaction writes gets the same
+# version, and a version below a snapshot's xmin belongs to a transaction that has ended.
+CURRENT_XACT_VERSION = "(pg_current_xact_id()::text)::bigint"
+
+
+class VersionMixin:
+    # Set on insert and on every UPDATE of the row, counter maintenance included (which
+    # leaves updated_at alone). Used for ETags and delta sync.
+    version: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        server_default=text(CURRENT_XACT_VERSION),
+        onupdate=text(CURRENT_XACT_VERSION),
+    )
+
+
+class SoftDeleteMixin:
+    # Set when the row is deleted through the API; the row and its children stay until
+    # app.services.purge_service removes them. Reads filter on ``deleted_at IS NULL``,
+    # which is also the predicate of the partial indexes they use.
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+# Predicates of the partial indexes over live rows and over rows waiting to be purged.
+LIVE_ROWS = text("deleted_at IS NULL")
+DELETED_ROWS = text("deleted_at IS NOT NULL")
+
+
+# Text search configuration of the search_vector columns; queries must use the same one.
+SEARCH_CONFIG = "english"
+
+
+def search_vector_column(title: str, body: str) -> Mapped[str]:
+    """Stored tsvector of a title (weight A) and a body column (weight B), for GET /api/search.
+
+    Deferred so ORM loads skip it. Core reads of whole task rows select
+    ``app.services.rollups.task_columns`` rather than the table, for the same reason.
+    """
+    return mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({title}, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({body}, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=False,
+        deferred=True,
+    )
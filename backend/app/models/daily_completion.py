@@ -0,0 +1,14 @@
+from datetime import date
+
+from sqlalchemy import Date, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+# Number of tasks whose completed_at falls on each date, maintained by app.services.rollups.
+class DailyCompletion(Base):
+    __tablename__ = "daily_completions"
+
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
@@ -1,16 +1,48 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Integer, String, Text
+from sqlalchemy import Boolean, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
+from app.models.base import (
+    Base,
+    DELETED_ROWS,
+    LIVE_ROWS,
+    ProgressCountersMixin,
+    SoftDeleteMixin,
+    TimestampMixin,
+    UUIDPrimaryKeyMixin,
+    VersionMixin,
+    search_vector_column,
+)
 
 if TYPE_CHECKING:
     from app.models.topic import Topic
 
 
-class Roadmap(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+# Writes to a roadmap's topics and tasks always update the roadmap row too (via the rollup
+# counters), so its version changes whenever its detail document does.
+class Roadmap(
+    UUIDPrimaryKeyMixin, TimestampMixin, ProgressCountersMixin, VersionMixin, SoftDeleteMixin, Base
+):
     __tablename__ = "roadmaps"
+    __table_args__ = (
+        # Keyset order of the roadmap list, unfiltered and filtered by is_archived.
+        Index("ix_roadmaps_list_order", "sort_order", "created_at", "id", postgresql_where=LIVE_ROWS),
+        Index(
+            "ix_roadmaps_archived_list_order",
+            "is_archived",
+            "sort_order",
+            "created_at",
+            "id",
+            postgresql_where=LIVE_ROWS,
+        ),
+        Index("ix_roadmaps_version", "version", "id"),
+        Index(
+            "ix_roadmaps_search_vector", "search_vector", postgresql_using="gin", postgresql_where=LIVE_ROWS
+        ),
+        # The purge queue.
+        Index("ix_roadmaps_deleted", "deleted_at", "id", postgresql_where=DELETED_ROWS),
+    )
 
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -19,10 +51,10 @@ class Roadmap(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     is_archived: Mapped[bool] = mapped_column(
         Boolean, nullable=False, default=False, server_default="false"
     )
-
+    search_vector: Mapped[str] = search_vector_column("title", "description")
     topics: Mapped[list["Topic"]] = relationship(
         back_populates="roadmap",
         cascade="all, delete-orphan",
         passive_deletes=True,
-        order_by="Topic.sort_order",
+        order_by="[Topic.sort_order, Topic.id]",
     )
@@ -2,10 +2,16 @@ from datetime import datetime
 from enum import StrEnum
 from uuid import UUID
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
+from app.models.base import (
+    Base,
+    TimestampMixin,
+    UUIDPrimaryKeyMixin,
+    VersionMixin,
+    search_vector_column,
+)
 
 
 class TaskStatus(StrEnum):
@@ -14,12 +20,16 @@ class TaskStatus(StrEnum):
     COMPLETED = "completed"
 
 
-class Task(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+class Task(UUIDPrimaryKeyMixin, TimestampMixin, VersionMixin, Base):
     __tablename__ = "tasks"
     __table_args__ = (
-        Index("ix_tasks_topic_sort_order", "topic_id", "sort_order"),
+        # Keyset order of a topic's tasks, unfiltered and filtered by status.
+        Index("ix_tasks_topic_sort_order", "topic_id", "sort_order", "id"),
+        Index("ix_tasks_topic_status_sort_order", "topic_id", "status", "sort_order", "id"),
         Index("ix_tasks_status", "status"),
         Index("ix_tasks_completed_at", "completed_at"),
+        Index("ix_tasks_version", "version", "id"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
         CheckConstraint(
             "status IN ('not_started', 'in_progress', 'completed')",
             name="ck_tasks_status_valid",
@@ -39,5 +49,11 @@ class Task(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     )
     sort_order: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # When the task entered its current status (the from_status_at of its next task event);
+    # NULL for tasks whose status predates the event log.
+    status_changed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, server_default=func.now()
+    )
+    search_vector: Mapped[str] = search_vector_column("title", "notes")
 
     topic = relationship("Topic", back_populates="tasks")
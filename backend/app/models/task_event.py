@@ -0,0 +1,54 @@
+import re
+from datetime import date, datetime
+from uuid import UUID
+
+from sqlalchemy import BigInteger, DateTime, Identity, Index, PrimaryKeyConstraint, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+# Append-only log of task status changes, written in the transaction of each change and
+# range-partitioned by month on occurred_at (partitions are managed by
+# app.services.task_events). Not tied to tasks by a foreign key: history outlives deletes.
+class TaskEvent(Base):
+    __tablename__ = "task_events"
+    __table_args__ = (
+        # The partition key has to be part of the primary key.
+        PrimaryKeyConstraint("id", "occurred_at"),
+        Index("ix_task_events_occurred_at", "occurred_at", postgresql_using="brin"),
+        Index("ix_task_events_topic_occurred_at", "topic_id", "occurred_at"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity())
+    task_id: Mapped[UUID] = mapped_column(nullable=False)
+    topic_id: Mapped[UUID] = mapped_column(nullable=False)
+    from_status: Mapped[str] = mapped_column(String(20), nullable=False)
+    to_status: Mapped[str] = mapped_column(String(20), nullable=False)
+    # When the task entered from_status, so durations need no lookup of earlier events;
+    # NULL when unknown (tasks that predate the log).
+    from_status_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    occurred_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+# Partitions hold one calendar month (UTC) each and are named after it, as
+# task_events_2026_10; rows outside every month land in the default partition.
+DEFAULT_PARTITION = "task_events_default"
+_MONTH_PARTITION = re.compile(r"task_events_(\d{4})_(\d{2})")
+
+
+def partition_name(month: date) -> str:
+    return f"task_events_{month:%Y_%m}"
+
+
+def partition_month(name: str) -> date | None:
+    """First day of the month a partition holds, or None when ``name`` is not a monthly partition."""
+    match = _MONTH_PARTITION.fullmatch(name)
+    return date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def is_partition(name: str) -> bool:
+    return name == DEFAULT_PARTITION or partition_month(name) is not None
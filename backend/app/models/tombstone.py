@@ -0,0 +1,24 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import BigInteger, DateTime, Identity, Index, String, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import CURRENT_XACT_VERSION, Base
+
+
+# One row per deleted roadmap, topic or task, for delta sync. Rows removed by the cascade
+# of a deleted parent get no tombstone of their own.
+class Tombstone(Base):
+    __tablename__ = "tombstones"
+    __table_args__ = (Index("ix_tombstones_version", "version", "id"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    entity_id: Mapped[UUID] = mapped_column(nullable=False)
+    version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=text(CURRENT_XACT_VERSION)
+    )
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), index=True
+    )
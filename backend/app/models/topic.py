@@ -4,16 +4,32 @@ from uuid import UUID
 from sqlalchemy import ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
+from app.models.base import (
+    Base,
+    DELETED_ROWS,
+    LIVE_ROWS,
+    ProgressCountersMixin,
+    SoftDeleteMixin,
+    TimestampMixin,
+    UUIDPrimaryKeyMixin,
+    VersionMixin,
+    search_vector_column,
+)
 
 if TYPE_CHECKING:
     from app.models.roadmap import Roadmap
     from app.models.task import Task
 
 
-class Topic(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+class Topic(UUIDPrimaryKeyMixin, TimestampMixin, ProgressCountersMixin, VersionMixin, SoftDeleteMixin, Base):
     __tablename__ = "topics"
-    __table_args__ = (Index("ix_topics_roadmap_sort_order", "roadmap_id", "sort_order"),)
+    __table_args__ = (
+        Index("ix_topics_roadmap_sort_order", "roadmap_id", "sort_order", postgresql_where=LIVE_ROWS),
+        Index("ix_topics_version", "version", "id"),
+        Index("ix_topics_search_vector", "search_vector", postgresql_using="gin", postgresql_where=LIVE_ROWS),
+        # The purge queue, also probed to hide the tasks of deleted topics.
+        Index("ix_topics_deleted", "deleted_at", "id", postgresql_where=DELETED_ROWS),
+    )
 
     roadmap_id: Mapped[UUID] = mapped_column(
         ForeignKey("roadmaps.id", ondelete="CASCADE"), nullable=False, index=True
@@ -21,11 +37,12 @@ class Topic(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     sort_order: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    search_vector: Mapped[str] = search_vector_column("title", "description")
 
     roadmap: Mapped["Roadmap"] = relationship(back_populates="topics")
     tasks: Mapped[list["Task"]] = relationship(
         back_populates="topic",
         cascade="all, delete-orphan",
         passive_deletes=True,
-        order_by="Task.sort_order",
+        order_by="[Task.sort_order, Task.id]",
     )
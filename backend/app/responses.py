@@ -0,0 +1,122 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+
+from app.config import get_settings
+from app.middleware.read_after_write import recent_writes
+from app.schemas.analytics import WeeklyTaskStats
+from app.schemas.dashboard import DashboardStatsResponse
+from app.schemas.roadmap import RoadmapDetail, RoadmapListItem
+from app.schemas.search import SearchResult
+from app.schemas.sync import SyncResponse
+from app.schemas.task import TaskResponse
+from app.schemas.topic import TopicResponse
+from app.services.cache import CachedResponse, read_flights, response_cache
+
+settings = get_settings()
+
+# Built once at import so each request only pays for validation and serialization.
+roadmap_list_adapter = TypeAdapter(list[RoadmapListItem])
+roadmap_item_adapter = TypeAdapter(RoadmapListItem)
+roadmap_detail_adapter = TypeAdapter(RoadmapDetail)
+topic_adapter = TypeAdapter(TopicResponse)
+topic_list_adapter = TypeAdapter(list[TopicResponse])
+task_adapter = TypeAdapter(TaskResponse)
+task_list_adapter = TypeAdapter(list[TaskResponse])
+dashboard_adapter = TypeAdapter(DashboardStatsResponse)
+sync_adapter = TypeAdapter(SyncResponse)
+search_results_adapter = TypeAdapter(list[SearchResult])
+weekly_task_stats_adapter = TypeAdapter(list[WeeklyTaskStats])
+
+# Conditional GETs: responses carry an ETag and "no-cache", so browsers revalidate every
+# time and a matching If-None-Match gets an empty 304.
+CACHE_CONTROL = "no-cache"
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored.
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+def render_json(adapter: TypeAdapter[Any], content: Any, exclude: dict[str, Any] | None = None) -> bytes:
+    """Validate ``content`` (dicts, Core rows, ORM objects or models) once and dump it."""
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True), exclude=exclude or None)
+
+
+def json_response(
+    adapter: TypeAdapter[Any], content: Any, status_code: int = status.HTTP_200_OK
+) -> Response:
+    """Return ``content`` rendered by ``adapter`` as the response body.
+
+    Returning a Response skips FastAPI's second validation against ``response_model``,
+    which the routes still declare for the OpenAPI schema.
+    """
+    return Response(render_json(adapter, content), status_code=status_code, media_type="application/json")
+
+
+async def _render_and_store(
+    key: str, token: int, render: Callable[[], Awaitable[CachedResponse]], on_replica: bool
+) -> CachedResponse:
+    cached = await render()
+    # Shortly after a write, the replica may still return the rows from before it. The
+    # response goes to its client, who did not write, but is not cached for everyone else.
+    if on_replica and recent_writes.within(settings.read_after_write_seconds):
+        return cached
+    await response_cache.store(key, cached, token)
+    return cached
+
+
+async def cached_json_response(
+    request: Request,
+    key: str,
+    render: Callable[[], Awaitable[CachedResponse]],
+    probe: Callable[[], Awaitable[str | None]],
+) -> Response:
+    """Serve a read through the response cache, answering If-None-Match with 304.
+
+    On a miss, a conditional request is first checked against ``probe`` (a cheap ETag
+    query) so that an unchanged resource is not rendered at all. Identical misses that
+    arrive while a render is running wait for it instead of rendering again; the flight
+    is keyed on the lookup token too, so a request made after a write never joins a
+    render that may have read the rows from before it, and on where the rows are read
+    (``request.state.read_replica``, see app.database.get_read_db), so one that must
+    see its client's writes never joins a render on the replica. Replica renders are not
+    stored within read_after_write_seconds of a write served by this process.
+    """
+    cached, token = await response_cache.lookup(key)
+    if cached is None:
+        if is_conditional(request):
+            etag = await probe()
+            if etag is not None and etag_matches(request, etag):
+                return not_modified(etag)
+        on_replica = getattr(request.state, "read_replica", False)
+        cached = await read_flights.run(
+            (key, token, on_replica), lambda: _render_and_store(key, token, render, on_replica)
+        )
+    if etag_matches(request, cached.etag):
+        return not_modified(cached.etag)
+    return with_etag(Response(cached.body, media_type="application/json"), cached.etag)
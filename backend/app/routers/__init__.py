@@ -1,6 +1,19 @@
+from app.routers.analytics import router as analytics_router
 from app.routers.dashboard import router as dashboard_router
+from app.routers.events import router as events_router
 from app.routers.roadmaps import router as roadmaps_router
+from app.routers.search import router as search_router
+from app.routers.sync import router as sync_router
 from app.routers.tasks import router as tasks_router
 from app.routers.topics import router as topics_router
 
-__all__ = ["roadmaps_router", "topics_router", "tasks_router", "dashboard_router"]
+__all__ = [
+    "roadmaps_router",
+    "topics_router",
+    "tasks_router",
+    "dashboard_router",
+    "sync_router",
+    "events_router",
+    "search_router",
+    "analytics_router",
+]
@@ -0,0 +1,23 @@
+from datetime import date
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_read_db
+from app.responses import json_response, weekly_task_stats_adapter
+from app.schemas.analytics import WeeklyTaskStats
+from app.services.analytics_service import AnalyticsService
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get("/tasks/weekly", response_model=list[WeeklyTaskStats])
+async def weekly_task_stats(
+    start: date | None = None,
+    end: date | None = None,
+    roadmap_id: UUID | None = None,
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    stats = await AnalyticsService(db).weekly_task_stats(start, end, roadmap_id)
+    return json_response(weekly_task_stats_adapter, stats)
@@ -1,13 +1,21 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_read_db
+from app.responses import cached_json_response, dashboard_adapter, render_json
 from app.schemas.dashboard import DashboardStatsResponse
+from app.services.cache import CachedResponse, dashboard_key
 from app.services.dashboard_service import DashboardService
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 
 @router.get("/stats", response_model=DashboardStatsResponse)
-async def get_dashboard_stats(db: AsyncSession = Depends(get_db)) -> DashboardStatsResponse:
-    return await DashboardService(db).get_stats()
+async def get_dashboard_stats(request: Request, db: AsyncSession = Depends(get_read_db)) -> Response:
+    service = DashboardService(db)
+
+    async def render() -> CachedResponse:
+        stats, etag = await service.get_stats()
+        return CachedResponse(render_json(dashboard_adapter, stats), etag)
+
+    return await cached_json_response(request, dashboard_key(), render, service.etag)
@@ -0,0 +1,28 @@
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.services.events import HEARTBEAT_FRAME, HEARTBEAT_SECONDS, READY_FRAME, event_broker
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+
+async def _stream() -> AsyncIterator[bytes]:
+    async with event_broker.subscribe() as subscription:
+        yield READY_FRAME
+        while True:
+            frame = await subscription.next_frame(HEARTBEAT_SECONDS)
+            yield HEARTBEAT_FRAME if frame is None else frame
+
+
+@router.get("", response_class=StreamingResponse)
+async def events() -> StreamingResponse:
+    """Server-sent events for roadmap, topic and task writes committed by any worker."""
+    # Connect the listener up front so an unavailable database is a 503, not a broken stream.
+    await event_broker.start()
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,63 +1,167 @@
+from collections.abc import AsyncIterator
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.schemas.roadmap import RoadmapCreate, RoadmapDetail, RoadmapListItem, RoadmapUpdate
+from app.config import get_settings
+from app.database import get_db, get_read_db
+from app.models import Roadmap
+from app.responses import (
+    cached_json_response,
+    json_response,
+    render_json,
+    roadmap_detail_adapter,
+    roadmap_item_adapter,
+    roadmap_list_adapter,
+)
+from app.schemas.roadmap import (
+    RoadmapClone,
+    RoadmapCreate,
+    RoadmapDetail,
+    RoadmapDetailView,
+    RoadmapListItem,
+    RoadmapUpdate,
+)
+from app.schemas.transfer import NDJSON_MEDIA_TYPE
+from app.services.cache import ROADMAP_LIST_KEY, CachedResponse, roadmap_key
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
 from app.services.roadmap_service import RoadmapService
+from app.services.rollups import progress_percent
+from app.services.transfer_service import TransferService
 
 router = APIRouter(prefix="/roadmaps", tags=["Roadmaps"])
 
 
+def _roadmap_item(roadmap: Roadmap) -> dict[str, Any]:
+    return {
+        "id": roadmap.id,
+        "title": roadmap.title,
+        "description": roadmap.description,
+        "color": roadmap.color,
+        "sort_order": roadmap.sort_order,
+        "is_archived": roadmap.is_archived,
+        "total_tasks": 0,
+        "completed_tasks": 0,
+        "in_progress_tasks": 0,
+        "progress_percent": 0.0,
+        "created_at": roadmap.created_at,
+        "updated_at": roadmap.updated_at,
+    }
+
+
+def _populated_item(roadmap: Roadmap) -> dict[str, Any]:
+    # For roadmaps created with their topics and tasks, as copies and imports are.
+    return {
+        **_roadmap_item(roadmap),
+        "total_tasks": roadmap.total_tasks,
+        "completed_tasks": roadmap.completed_tasks,
+        "in_progress_tasks": roadmap.in_progress_tasks,
+        "progress_percent": progress_percent(roadmap.completed_tasks, roadmap.total_tasks),
+    }
+
+
 @router.get("", response_model=list[RoadmapListItem])
-async def list_roadmaps(db: AsyncSession = Depends(get_db)) -> list[RoadmapListItem]:
-    return await RoadmapService(db).list_roadmaps()
+async def list_roadmaps(
+    request: Request,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    is_archived: bool | None = None,
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    service = RoadmapService(db)
+    if limit is not None or cursor is not None or is_archived is not None:
+        # Pages are served uncached; the next page's cursor comes back in a header.
+        items, next_cursor = await service.list_roadmap_page(
+            limit=limit or DEFAULT_PAGE_SIZE, cursor=cursor, is_archived=is_archived
+        )
+        response = json_response(roadmap_list_adapter, items)
+        if next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return response
+
+    async def render() -> CachedResponse:
+        items, etag = await service.list_roadmaps()
+        return CachedResponse(render_json(roadmap_list_adapter, items), etag)
+
+    return await cached_json_response(request, ROADMAP_LIST_KEY, render, service.list_etag)
 
 
 @router.post("", response_model=RoadmapListItem, status_code=status.HTTP_201_CREATED)
-async def create_roadmap(payload: RoadmapCreate, db: AsyncSession = Depends(get_db)) -> RoadmapListItem:
+async def create_roadmap(payload: RoadmapCreate, db: AsyncSession = Depends(get_db)) -> Response:
     roadmap = await RoadmapService(db).create_roadmap(payload)
-    return RoadmapListItem(
-        id=roadmap.id,
-        title=roadmap.title,
-        description=roadmap.description,
-        color=roadmap.color,
-        sort_order=roadmap.sort_order,
-        is_archived=roadmap.is_archived,
-        total_tasks=0,
-        completed_tasks=0,
-        in_progress_tasks=0,
-        progress_percent=0.0,
-        created_at=roadmap.created_at,
-        updated_at=roadmap.updated_at,
+    return json_response(roadmap_item_adapter, _roadmap_item(roadmap), status.HTTP_201_CREATED)
+
+
+@router.post("/{roadmap_id}:clone", response_model=RoadmapListItem, status_code=status.HTTP_201_CREATED)
+async def clone_roadmap(
+    roadmap_id: UUID, payload: RoadmapClone | None = None, db: AsyncSession = Depends(get_db)
+) -> Response:
+    roadmap = await RoadmapService(db).clone_roadmap(roadmap_id, payload or RoadmapClone())
+    return json_response(roadmap_item_adapter, _populated_item(roadmap), status.HTTP_201_CREATED)
+
+
+@router.post(":import", response_model=RoadmapListItem, status_code=status.HTTP_201_CREATED)
+async def import_roadmap(request: Request, db: AsyncSession = Depends(get_db)) -> Response:
+    """Create a roadmap, under new ids, from an NDJSON body in the format of the export."""
+    roadmap = await TransferService(db).import_roadmap(request.stream())
+    return json_response(roadmap_item_adapter, _populated_item(roadmap), status.HTTP_201_CREATED)
+
+
+@router.get("/{roadmap_id}/export", response_class=StreamingResponse)
+async def export_roadmap(roadmap_id: UUID, db: AsyncSession = Depends(get_db)) -> StreamingResponse:
+    """Stream the roadmap, its topics and their tasks as NDJSON, one object per line."""
+    chunks = TransferService(db).export_roadmap(roadmap_id)
+    # Read the roadmap line before responding, so a missing roadmap is a plain 404.
+    first = await anext(chunks)
+
+    async def body() -> AsyncIterator[bytes]:
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="roadmap-{roadmap_id}.ndjson"'},
     )
 
 
 @router.get("/{roadmap_id}", response_model=RoadmapDetail)
-async def get_roadmap_detail(roadmap_id: UUID, db: AsyncSession = Depends(get_db)) -> RoadmapDetail:
-    return await RoadmapService(db).get_roadmap_detail(roadmap_id)
+async def get_roadmap_detail(
+    roadmap_id: UUID,
+    request: Request,
+    view: RoadmapDetailView = Query(),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    service = RoadmapService(db)
+
+    async def render() -> CachedResponse:
+        engine = get_settings().roadmap_detail_engine
+        if engine == "json":
+            document, etag = await service.get_roadmap_detail_json(roadmap_id, view)
+            return CachedResponse(document, etag)
+        # The ORM path only builds the full document.
+        if engine == "core" or not view.is_default:
+            data, etag = await service.get_roadmap_detail_data(roadmap_id, view)
+        else:
+            data, etag = await service.get_roadmap_detail(roadmap_id)
+        return CachedResponse(render_json(roadmap_detail_adapter, data, view.exclude()), etag)
+
+    # A missing roadmap has no ETag, so render() raises the usual 404.
+    return await cached_json_response(
+        request, roadmap_key(roadmap_id, view), render, lambda: service.detail_etag(roadmap_id, view)
+    )
 
 
 @router.patch("/{roadmap_id}", response_model=RoadmapListItem)
 async def update_roadmap(
     roadmap_id: UUID, payload: RoadmapUpdate, db: AsyncSession = Depends(get_db)
-) -> RoadmapListItem:
+) -> Response:
     roadmap = await RoadmapService(db).update_roadmap(roadmap_id, payload)
-    return RoadmapListItem(
-        id=roadmap.id,
-        title=roadmap.title,
-        description=roadmap.description,
-        color=roadmap.color,
-        sort_order=roadmap.sort_order,
-        is_archived=roadmap.is_archived,
-        total_tasks=0,
-        completed_tasks=0,
-        in_progress_tasks=0,
-        progress_percent=0.0,
-        created_at=roadmap.created_at,
-        updated_at=roadmap.updated_at,
-    )
+    return json_response(roadmap_item_adapter, _roadmap_item(roadmap))
 
 
 @router.delete("/{roadmap_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_read_db
+from app.responses import json_response, search_results_adapter
+from app.schemas.search import SearchResult
+from app.schemas.sync import SyncKind
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from app.services.search_service import SearchService
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("", response_model=list[SearchResult])
+async def search(
+    q: str = Query(min_length=1, max_length=200),
+    kinds: list[SyncKind] | None = Query(default=None, alias="kind"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Ranked matches, best first.
+
+    Only the first 1000 matches per kind are ranked, so for broader queries the ranking is
+    approximate and later pages may skip matches.
+    """
+    results, next_cursor = await SearchService(db).search(q, limit=limit, cursor=cursor, kinds=kinds)
+    response = json_response(search_results_adapter, results)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.responses import json_response, sync_adapter
+from app.schemas.sync import SyncResponse
+from app.services.sync_service import DEFAULT_SYNC_PAGE_SIZE, MAX_SYNC_PAGE_SIZE, SyncService
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+
+@router.get("", response_model=SyncResponse)
+async def sync(
+    since: str | None = None,
+    limit: int = Query(default=DEFAULT_SYNC_PAGE_SIZE, ge=1, le=MAX_SYNC_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    return json_response(sync_adapter, await SyncService(db).changes(since, limit))
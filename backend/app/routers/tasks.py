@@ -1,25 +1,73 @@
+from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.schemas.task import TaskCreate, TaskResponse, TaskUpdate
+from app.responses import json_response, task_adapter, task_list_adapter
+from app.schemas.task import (
+    TaskBatchRequest,
+    TaskCreate,
+    TaskReorder,
+    TaskResponse,
+    TaskStatus,
+    TaskUpdate,
+)
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
 from app.services.task_service import TaskService
 
 router = APIRouter(tags=["Tasks"])
 
 
+@router.get("/topics/{topic_id}/tasks", response_model=list[TaskResponse])
+async def list_tasks(
+    topic_id: UUID,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    statuses: list[TaskStatus] | None = Query(default=None, alias="status"),
+    completed_from: datetime | None = None,
+    completed_to: datetime | None = None,
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    tasks, next_cursor = await TaskService(db).list_tasks(
+        topic_id,
+        limit=limit,
+        cursor=cursor,
+        statuses=statuses,
+        completed_from=completed_from,
+        completed_to=completed_to,
+    )
+    response = json_response(task_list_adapter, tasks)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
+
+
 @router.post("/topics/{topic_id}/tasks", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-async def create_task(topic_id: UUID, payload: TaskCreate, db: AsyncSession = Depends(get_db)) -> TaskResponse:
+async def create_task(topic_id: UUID, payload: TaskCreate, db: AsyncSession = Depends(get_db)) -> Response:
     task = await TaskService(db).create_task(topic_id, payload)
-    return task
+    return json_response(task_adapter, task, status.HTTP_201_CREATED)
+
+
+@router.post("/topics/{topic_id}/tasks:reorder", response_model=list[TaskResponse])
+async def reorder_tasks(
+    topic_id: UUID, payload: TaskReorder, db: AsyncSession = Depends(get_db)
+) -> Response:
+    tasks = await TaskService(db).reorder_tasks(topic_id, payload)
+    return json_response(task_list_adapter, tasks)
+
+
+@router.post("/tasks:batch", response_model=list[TaskResponse])
+async def batch_tasks(payload: TaskBatchRequest, db: AsyncSession = Depends(get_db)) -> Response:
+    tasks = await TaskService(db).apply_batch(payload.operations)
+    return json_response(task_list_adapter, tasks)
 
 
 @router.patch("/tasks/{task_id}", response_model=TaskResponse)
-async def update_task(task_id: UUID, payload: TaskUpdate, db: AsyncSession = Depends(get_db)) -> TaskResponse:
+async def update_task(task_id: UUID, payload: TaskUpdate, db: AsyncSession = Depends(get_db)) -> Response:
     task = await TaskService(db).update_task(task_id, payload)
-    return task
+    return json_response(task_adapter, task)
 
 
 @router.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -1,53 +1,65 @@
+from typing import Any
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.schemas.topic import TopicCreate, TopicResponse, TopicUpdate
+from app.models import Topic
+from app.responses import json_response, topic_adapter, topic_list_adapter
+from app.schemas.topic import TopicCreate, TopicReorder, TopicResponse, TopicUpdate
+from app.services.rollups import progress_percent
 from app.services.topic_service import TopicService
 
 router = APIRouter(tags=["Topics"])
 
 
+def _topic_fields(topic: Topic) -> dict[str, Any]:
+    # tasks and the progress numbers fall back to the TopicResponse defaults.
+    return {
+        "id": topic.id,
+        "roadmap_id": topic.roadmap_id,
+        "title": topic.title,
+        "description": topic.description,
+        "sort_order": topic.sort_order,
+        "created_at": topic.created_at,
+        "updated_at": topic.updated_at,
+    }
+
+
 @router.post("/roadmaps/{roadmap_id}/topics", response_model=TopicResponse, status_code=status.HTTP_201_CREATED)
 async def create_topic(
     roadmap_id: UUID, payload: TopicCreate, db: AsyncSession = Depends(get_db)
-) -> TopicResponse:
+) -> Response:
     topic = await TopicService(db).create_topic(roadmap_id, payload)
-    return TopicResponse(
-        id=topic.id,
-        roadmap_id=topic.roadmap_id,
-        title=topic.title,
-        description=topic.description,
-        sort_order=topic.sort_order,
-        tasks=[],
-        total_tasks=0,
-        completed_tasks=0,
-        progress_percent=0.0,
-        created_at=topic.created_at,
-        updated_at=topic.updated_at,
+    return json_response(topic_adapter, _topic_fields(topic), status.HTTP_201_CREATED)
+
+
+@router.post("/roadmaps/{roadmap_id}/topics:reorder", response_model=list[TopicResponse])
+async def reorder_topics(
+    roadmap_id: UUID, payload: TopicReorder, db: AsyncSession = Depends(get_db)
+) -> Response:
+    topics = await TopicService(db).reorder_topics(roadmap_id, payload)
+    return json_response(
+        topic_list_adapter,
+        [
+            {
+                **_topic_fields(topic),
+                "total_tasks": topic.total_tasks,
+                "completed_tasks": topic.completed_tasks,
+                "progress_percent": progress_percent(topic.completed_tasks, topic.total_tasks),
+            }
+            for topic in topics
+        ],
     )
 
 
 @router.patch("/topics/{topic_id}", response_model=TopicResponse)
 async def update_topic(
     topic_id: UUID, payload: TopicUpdate, db: AsyncSession = Depends(get_db)
-) -> TopicResponse:
+) -> Response:
     topic = await TopicService(db).update_topic(topic_id, payload)
-    return TopicResponse(
-        id=topic.id,
-        roadmap_id=topic.roadmap_id,
-        title=topic.title,
-        description=topic.description,
-        sort_order=topic.sort_order,
-        tasks=[],
-        total_tasks=0,
-        completed_tasks=0,
-        progress_percent=0.0,
-        created_at=topic.created_at,
-        updated_at=topic.updated_at,
-    )
+    return json_response(topic_adapter, _topic_fields(topic))
 
 
 @router.delete("/topics/{topic_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -1,20 +1,39 @@
 from app.schemas.dashboard import DashboardStatsResponse, TasksCompletedPerDay
-from app.schemas.roadmap import RoadmapCreate, RoadmapDetail, RoadmapListItem, RoadmapUpdate
-from app.schemas.task import TaskCreate, TaskResponse, TaskStatus, TaskUpdate
-from app.schemas.topic import TopicCreate, TopicResponse, TopicUpdate
+from app.schemas.roadmap import RoadmapClone, RoadmapCreate, RoadmapDetail, RoadmapListItem, RoadmapUpdate
+from app.schemas.task import (
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchOperation,
+    TaskBatchRequest,
+    TaskBatchUpdate,
+    TaskCreate,
+    TaskReorder,
+    TaskResponse,
+    TaskStatus,
+    TaskUpdate,
+)
+from app.schemas.topic import TopicCreate, TopicReorder, TopicResponse, TopicUpdate
 
 __all__ = [
     "DashboardStatsResponse",
+    "RoadmapClone",
     "RoadmapCreate",
     "RoadmapDetail",
     "RoadmapListItem",
     "RoadmapUpdate",
+    "TaskBatchCreate",
+    "TaskBatchDelete",
+    "TaskBatchOperation",
+    "TaskBatchRequest",
+    "TaskBatchUpdate",
     "TaskCreate",
+    "TaskReorder",
     "TaskResponse",
     "TaskStatus",
     "TaskUpdate",
     "TasksCompletedPerDay",
     "TopicCreate",
+    "TopicReorder",
     "TopicResponse",
     "TopicUpdate",
 ]
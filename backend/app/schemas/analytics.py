@@ -0,0 +1,16 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class WeeklyTaskStats(BaseModel):
+    # Monday of the week.
+    week: date
+    # Moves to completed, and moves out of it (reopened tasks keep their earlier completion here).
+    completed: int
+    reopened: int
+    # Time from entering in_progress to completing, over the week's completions that have it.
+    cycle_time_median_hours: float | None
+    cycle_time_p85_hours: float | None
+    # Time spent in progress by every task that left in_progress during the week.
+    in_progress_hours: float
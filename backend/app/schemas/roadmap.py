@@ -1,8 +1,11 @@
 from datetime import datetime
+from itertools import combinations
+from typing import Any, Literal
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from app.schemas.task import SortOrder
 from app.schemas.topic import TopicResponse
 
 
@@ -10,7 +13,7 @@ class RoadmapBase(BaseModel):
     title: str = Field(min_length=1, max_length=255)
     description: str | None = None
     color: str = Field(default="#6366f1", min_length=7, max_length=7)
-    sort_order: int = 0
+    sort_order: SortOrder = 0
     is_archived: bool = False
 
 
@@ -22,10 +25,17 @@ class RoadmapUpdate(BaseModel):
     title: str | None = Field(default=None, min_length=1, max_length=255)
     description: str | None = None
     color: str | None = Field(default=None, min_length=7, max_length=7)
-    sort_order: int | None = None
+    sort_order: SortOrder | None = None
     is_archived: bool | None = None
 
 
+class RoadmapClone(BaseModel):
+    # Defaults to the source roadmap's title.
+    title: str | None = Field(default=None, min_length=1, max_length=255)
+    # Start every copied task over as not started, for instantiating a template.
+    reset_statuses: bool = False
+
+
 class RoadmapListItem(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -58,3 +68,80 @@ class RoadmapDetail(BaseModel):
     progress_percent: float
     created_at: datetime
     updated_at: datetime
+
+
+DetailTasks = Literal["none", "summary", "full"]
+DetailTextField = Literal["description", "notes"]
+DETAIL_TEXT_FIELDS: tuple[DetailTextField, ...] = ("description", "notes")
+
+
+class RoadmapDetailView(BaseModel):
+    """Query options of GET /api/roadmaps/{id}.
+
+    ``tasks``: "full" returns every topic with its tasks, "summary" the topics with their
+    counters but no ``tasks`` key (load them per topic from /api/topics/{id}/tasks), and
+    "none" the roadmap alone without a ``topics`` key. ``fields`` lists which of the large
+    text columns to include, comma separated; columns not listed are neither selected nor
+    present in the response. Without it, all of them are included. Other query parameters,
+    such as a cache-busting ``_``, are ignored.
+    """
+
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    tasks: DetailTasks = "full"
+    fields: frozenset[DetailTextField] = frozenset(DETAIL_TEXT_FIELDS)
+
+    @field_validator("fields", mode="before")
+    @classmethod
+    def split_fields(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            value = [value]
+        if isinstance(value, list):
+            return {field.strip() for item in value for field in item.split(",") if field.strip()}
+        return value
+
+    @property
+    def includes_tasks(self) -> bool:
+        return self.tasks == "full"
+
+    def includes(self, field: DetailTextField) -> bool:
+        # Task notes only matter when the tasks are returned.
+        return field in self.fields and (field != "notes" or self.includes_tasks)
+
+    @property
+    def is_default(self) -> bool:
+        return self.tag is None
+
+    @property
+    def tag(self) -> str | None:
+        """Stable name of the view for cache keys and ETags; None for the default one."""
+        included = [field for field in DETAIL_TEXT_FIELDS if self.includes(field)]
+        if self.includes_tasks and len(included) == len(DETAIL_TEXT_FIELDS):
+            return None
+        return f"{self.tasks}.{'+'.join(included) or 'bare'}"
+
+    def exclude(self) -> dict[str, Any]:
+        """``exclude`` argument that drops what the view leaves out of a RoadmapDetail dump."""
+        task_fields: dict[str, Any] = {} if self.includes("notes") else {"notes": True}
+        topic_fields: dict[str, Any] = {} if self.includes("description") else {"description": True}
+        if not self.includes_tasks:
+            topic_fields["tasks"] = True
+        elif task_fields:
+            topic_fields["tasks"] = {"__all__": task_fields}
+        fields: dict[str, Any] = {} if self.includes("description") else {"description": True}
+        if self.tasks == "none":
+            fields["topics"] = True
+        elif topic_fields:
+            fields["topics"] = {"__all__": topic_fields}
+        return fields
+
+
+def detail_views() -> list[RoadmapDetailView]:
+    """One view per distinct detail document, e.g. to drop all cached variants of a roadmap."""
+    views = {}
+    for tasks in ("none", "summary", "full"):
+        for size in range(len(DETAIL_TEXT_FIELDS) + 1):
+            for fields in combinations(DETAIL_TEXT_FIELDS, size):
+                view = RoadmapDetailView(tasks=tasks, fields=frozenset(fields))
+                views[view.tag] = view
+    return list(views.values())
@@ -0,0 +1,22 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.schemas.sync import SyncKind
+
+
+class SearchResult(BaseModel):
+    """One match of GET /api/search.
+
+    ``topic_id`` is the topic itself for topics and the task's topic for tasks. In
+    ``title`` and ``snippet`` the matched words are wrapped in ``<mark>`` tags; the
+    surrounding text is not HTML-escaped.
+    """
+
+    kind: SyncKind
+    id: UUID
+    roadmap_id: UUID
+    topic_id: UUID | None
+    title: str
+    snippet: str | None
+    rank: float
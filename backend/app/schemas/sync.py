@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from app.schemas.roadmap import RoadmapListItem
+from app.schemas.task import TaskResponse
+
+SyncKind = Literal["roadmap", "topic", "task"]
+
+
+class SyncTopic(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    roadmap_id: UUID
+    title: str
+    description: str | None
+    sort_order: int
+    total_tasks: int
+    completed_tasks: int
+    progress_percent: float
+    created_at: datetime
+    updated_at: datetime
+
+
+class SyncDeletion(BaseModel):
+    kind: SyncKind
+    id: UUID
+
+
+class SyncResponse(BaseModel):
+    """Rows changed since the request's cursor, and the cursor to pass next time.
+
+    A sync comes in pages of at most ``limit`` rows: while ``more`` is set, the client
+    passes the cursor straight back for the rest. ``full`` is set when no cursor was given,
+    or the cursor is older than the tombstones are kept: the pages then hold every row and
+    the client should replace what it has once the last one is in. A deleted roadmap or
+    topic takes its topics and tasks with it; those are not listed separately in ``deleted``.
+    """
+
+    cursor: str
+    full: bool
+    more: bool
+    roadmaps: list[RoadmapListItem]
+    topics: list[SyncTopic]
+    tasks: list[TaskResponse]
+    deleted: list[SyncDeletion]
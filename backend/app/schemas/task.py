@@ -1,9 +1,13 @@
 from datetime import datetime
 from enum import StrEnum
+from typing import Annotated, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
+# The sort_order columns are 32-bit integers.
+SortOrder = Annotated[int, Field(ge=-(2**31), le=2**31 - 1)]
+
 
 class TaskStatus(StrEnum):
     NOT_STARTED = "not_started"
@@ -24,7 +28,7 @@ class TaskUpdate(BaseModel):
     title: str | None = Field(default=None, min_length=1, max_length=255)
     notes: str | None = None
     status: TaskStatus | None = None
-    sort_order: int | None = None
+    sort_order: SortOrder | None = None
 
 
 class TaskResponse(BaseModel):
@@ -39,3 +43,32 @@ class TaskResponse(BaseModel):
     completed_at: datetime | None
     created_at: datetime
     updated_at: datetime
+
+
+class TaskReorder(BaseModel):
+    task_ids: list[UUID] = Field(min_length=1, max_length=500)
+    after_id: UUID | None = None
+
+
+class TaskBatchCreate(TaskCreate):
+    op: Literal["create"]
+    topic_id: UUID
+
+
+class TaskBatchUpdate(TaskUpdate):
+    op: Literal["update"]
+    id: UUID
+
+
+class TaskBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: UUID
+
+
+TaskBatchOperation = Annotated[
+    TaskBatchCreate | TaskBatchUpdate | TaskBatchDelete, Field(discriminator="op")
+]
+
+
+class TaskBatchRequest(BaseModel):
+    operations: list[TaskBatchOperation] = Field(min_length=1, max_length=1000)
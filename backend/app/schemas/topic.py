@@ -3,7 +3,7 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from app.schemas.task import TaskResponse
+from app.schemas.task import SortOrder, TaskResponse
 
 
 class TopicBase(BaseModel):
@@ -18,7 +18,12 @@ class TopicCreate(TopicBase):
 class TopicUpdate(BaseModel):
     title: str | None = Field(default=None, min_length=1, max_length=255)
     description: str | None = None
-    sort_order: int | None = None
+    sort_order: SortOrder | None = None
+
+
+class TopicReorder(BaseModel):
+    topic_ids: list[UUID] = Field(min_length=1, max_length=500)
+    after_id: UUID | None = None
 
 
 class TopicResponse(BaseModel):
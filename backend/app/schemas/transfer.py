@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Annotated, Literal
+from uuid import UUID
+
+from pydantic import Field
+
+from app.schemas.roadmap import RoadmapBase
+from app.schemas.task import SortOrder, TaskBase, TaskStatus
+from app.schemas.topic import TopicBase
+
+# One JSON object per line: the roadmap first, then its topics, then their tasks.
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class ExportedRoadmap(RoadmapBase):
+    type: Literal["roadmap"]
+    id: UUID
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+class ExportedTopic(TopicBase):
+    type: Literal["topic"]
+    id: UUID
+    sort_order: SortOrder = 0
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+class ExportedTask(TaskBase):
+    type: Literal["task"]
+    id: UUID
+    topic_id: UUID
+    status: TaskStatus = TaskStatus.NOT_STARTED
+    sort_order: SortOrder = 0
+    completed_at: datetime | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+ExportLine = Annotated[ExportedRoadmap | ExportedTopic | ExportedTask, Field(discriminator="type")]
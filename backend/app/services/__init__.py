@@ -1,6 +1,19 @@
+from app.services.analytics_service import AnalyticsService
 from app.services.dashboard_service import DashboardService
 from app.services.roadmap_service import RoadmapService
+from app.services.search_service import SearchService
+from app.services.sync_service import SyncService
 from app.services.task_service import TaskService
 from app.services.topic_service import TopicService
+from app.services.transfer_service import TransferService
 
-__all__ = ["DashboardService", "RoadmapService", "TopicService", "TaskService"]
+__all__ = [
+    "AnalyticsService",
+    "DashboardService",
+    "RoadmapService",
+    "TopicService",
+    "TaskService",
+    "SyncService",
+    "SearchService",
+    "TransferService",
+]
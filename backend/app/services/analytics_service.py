@@ -0,0 +1,101 @@
+from datetime import date, timedelta
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, Float, cast, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy.types import Date
+
+from app.models import Roadmap, TaskEvent, TaskStatus, Topic
+from app.schemas.analytics import WeeklyTaskStats
+
+DEFAULT_WEEKS = 12
+# A little over two years: the default retention, plus the week it starts in.
+MAX_WEEKS = 106
+
+
+def _as_timestamp(day: date) -> ColumnElement[DateTime]:
+    # Midnight in the session time zone, the one date_trunc buckets by.
+    return cast(literal(day, Date), DateTime(timezone=True))
+
+
+def _hours(since: ColumnElement[DateTime]) -> ColumnElement[float]:
+    return cast(func.extract("epoch", TaskEvent.occurred_at - since), Float) / 3600.0
+
+
+class AnalyticsService:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def weekly_task_stats(
+        self, start: date | None = None, end: date | None = None, roadmap_id: UUID | None = None
+    ) -> list[WeeklyTaskStats]:
+        """Task flow per week, from the week of ``start`` to the week of ``end`` (weeks start on Monday).
+
+        Defaults to the DEFAULT_WEEKS weeks up to the current one. Aggregates the
+        task_events of exactly that time range in one statement, so only the monthly
+        partitions it overlaps are scanned. ``roadmap_id`` narrows it to events of the
+        roadmap's current topics.
+        """
+        end = end or date.today()
+        start = start or end - timedelta(weeks=DEFAULT_WEEKS - 1)
+        first_week = start - timedelta(days=start.weekday())
+        last_week = end - timedelta(days=end.weekday())
+        weeks = (last_week - first_week).days // 7 + 1
+        if weeks < 1:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end must not be before start")
+        if weeks > MAX_WEEKS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"The range can span at most {MAX_WEEKS} weeks"
+            )
+
+        week = cast(func.date_trunc("week", TaskEvent.occurred_at), Date).label("week")
+        in_progress = TaskEvent.from_status == TaskStatus.IN_PROGRESS.value
+        cycle = _hours(TaskEvent.from_status_at)
+        finished_cycle = (
+            in_progress
+            & (TaskEvent.to_status == TaskStatus.COMPLETED.value)
+            & TaskEvent.from_status_at.is_not(None)
+        )
+        query = (
+            select(
+                week,
+                func.count().filter(TaskEvent.to_status == TaskStatus.COMPLETED.value).label("completed"),
+                func.count().filter(TaskEvent.from_status == TaskStatus.COMPLETED.value).label("reopened"),
+                func.percentile_cont(0.5).within_group(cycle).filter(finished_cycle).label("median"),
+                func.percentile_cont(0.85).within_group(cycle).filter(finished_cycle).label("p85"),
+                func.coalesce(func.sum(cycle).filter(in_progress), 0.0).label("in_progress_hours"),
+            )
+            .where(
+                TaskEvent.occurred_at >= _as_timestamp(first_week),
+                TaskEvent.occurred_at < _as_timestamp(last_week + timedelta(days=7)),
+            )
+            .group_by(week)
+        )
+        if roadmap_id is not None:
+            roadmap = await self.db.scalar(
+                select(Roadmap.id).where(Roadmap.id == roadmap_id, Roadmap.deleted_at.is_(None))
+            )
+            if roadmap is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Roadmap not found")
+            query = query.where(
+                TaskEvent.topic_id.in_(select(Topic.id).where(Topic.roadmap_id == roadmap_id))
+            )
+
+        rows = {row.week: row for row in await self.db.execute(query)}
+        stats = []
+        for offset in range(weeks):
+            current = first_week + timedelta(weeks=offset)
+            row = rows.get(current)
+            stats.append(
+                WeeklyTaskStats(
+                    week=current,
+                    completed=row.completed if row else 0,
+                    reopened=row.reopened if row else 0,
+                    cycle_time_median_hours=row.median if row else None,
+                    cycle_time_p85_hours=row.p85 if row else None,
+                    in_progress_hours=row.in_progress_hours if row else 0.0,
+                )
+            )
+        return stats
@@ -0,0 +1,156 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import date
+from typing import Protocol
+from uuid import UUID
+
+from app.config import get_settings
+from app.schemas.roadmap import RoadmapDetailView, detail_views
+from app.services.rollups import ProgressDelta
+from app.services.single_flight import SingleFlight
+
+ROADMAP_LIST_KEY = "roadmaps"
+DETAIL_VIEWS = detail_views()
+
+
+def make_etag(*parts: object) -> str:
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def roadmap_key(roadmap_id: UUID, view: RoadmapDetailView | None = None) -> str:
+    tag = None if view is None else view.tag
+    return f"roadmap:{roadmap_id}" if tag is None else f"roadmap:{roadmap_id}:{tag}"
+
+
+def roadmap_keys(roadmap_id: UUID) -> list[str]:
+    """Keys of every cached view of a roadmap's detail."""
+    return [roadmap_key(roadmap_id, view) for view in DETAIL_VIEWS]
+
+
+def dashboard_key(today: date | None = None) -> str:
+    # The chart window and streak move at midnight, so each day gets its own entry.
+    return f"dashboard:{today or date.today()}"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    # Fills dropped because a write invalidated the cache while the value was being built.
+    rejected_fills: int = 0
+
+
+class CacheBackend(Protocol):
+    """Storage for rendered read responses.
+
+    ``lookup`` returns a token alongside the entry; ``store`` must drop the value if any
+    invalidation happened since that token was issued, so a response computed from rows
+    read before a write commits can never outlive the write's invalidation. A shared
+    backend (e.g. Redis) can implement the token as a global counter bumped by
+    ``invalidate``.
+    """
+
+    async def lookup(self, key: str) -> tuple[CachedResponse | None, int]: ...
+
+    async def store(self, key: str, value: CachedResponse, token: int) -> None: ...
+
+    async def invalidate(self, keys: Iterable[str]) -> None: ...
+
+    def stats(self) -> CacheStats: ...
+
+
+class MemoryCacheBackend:
+    """Per-process LRU cache with a TTL. ``max_entries <= 0`` disables storing."""
+
+    def __init__(
+        self, max_entries: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, CachedResponse]] = OrderedDict()
+        self._epoch = 0
+        self._stats = CacheStats()
+
+    async def lookup(self, key: str) -> tuple[CachedResponse | None, int]:
+        item = self._entries.get(key)
+        if item is not None:
+            expires_at, value = item
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return value, self._epoch
+            del self._entries[key]
+            self._stats.expirations += 1
+        self._stats.misses += 1
+        return None, self._epoch
+
+    async def store(self, key: str, value: CachedResponse, token: int) -> None:
+        if self.max_entries <= 0:
+            return
+        if token != self._epoch:
+            self._stats.rejected_fills += 1
+            return
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    async def invalidate(self, keys: Iterable[str]) -> None:
+        self._epoch += 1
+        for key in keys:
+            if self._entries.pop(key, None) is not None:
+                self._stats.invalidations += 1
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            evictions=self._stats.evictions,
+            expirations=self._stats.expirations,
+            invalidations=self._stats.invalidations,
+            rejected_fills=self._stats.rejected_fills,
+        )
+
+
+def stale_keys(
+    roadmap_deltas: Mapping[UUID, ProgressDelta],
+    *,
+    roadmap_list: bool = False,
+    dashboard: bool = False,
+) -> set[str]:
+    """Cache keys made stale by a write to the documents of the given roadmaps.
+
+    ``roadmap_deltas`` holds the net counter change per touched roadmap, as returned by
+    the rollup helpers: the list shows per-roadmap counters and the dashboard only the
+    overall totals. Pass ``roadmap_list``/``dashboard`` for changes the counters don't
+    capture (roadmap fields, topic counts, completion dates).
+    """
+    keys = {key for roadmap_id in roadmap_deltas for key in roadmap_keys(roadmap_id)}
+    net = sum(roadmap_deltas.values(), ProgressDelta())
+    if roadmap_list or any(roadmap_deltas.values()):
+        keys.add(ROADMAP_LIST_KEY)
+    if dashboard or net.total or net.completed:
+        keys.add(dashboard_key())
+    return keys
+
+
+settings = get_settings()
+response_cache: CacheBackend = MemoryCacheBackend(
+    max_entries=settings.response_cache_max_entries,
+    ttl_seconds=settings.response_cache_ttl_seconds,
+)
+# Concurrent misses for the same key and invalidation token share one render.
+read_flights: SingleFlight[CachedResponse] = SingleFlight()
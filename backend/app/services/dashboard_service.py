@@ -1,79 +1,112 @@
 from datetime import date, timedelta
+from typing import Any
 
-from sqlalchemy import cast, func, select
+from sqlalchemy import Select, and_, exists, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.types import Date
 
-from app.models import Roadmap, Task, Topic
+from app.models import DailyCompletion, Roadmap, Topic
 from app.schemas.dashboard import DashboardStatsResponse, TasksCompletedPerDay
+from app.services.cache import make_etag
+
+CHART_DAYS = 30
 
 
 class DashboardService:
     def __init__(self, db: AsyncSession) -> None:
         self.db = db
 
-    async def get_stats(self) -> DashboardStatsResponse:
-        total_roadmaps = int((await self.db.scalar(select(func.count(Roadmap.id)))) or 0)
-        total_topics = int((await self.db.scalar(select(func.count(Topic.id)))) or 0)
-        total_tasks = int((await self.db.scalar(select(func.count(Task.id)))) or 0)
-        completed_tasks = int(
-            (await self.db.scalar(select(func.count(Task.id)).where(Task.status == "completed"))) or 0
-        )
-        completion_percent = (completed_tasks * 100.0 / total_tasks) if total_tasks else 0.0
+    async def etag(self) -> str:
+        """ETag of the stats without computing them.
 
-        today = date.today()
-        start_date = today - timedelta(days=29)
-        completed_date_expr = cast(Task.completed_at, Date)
-        completed_rows = (
+        Everything the dashboard shows is derived from roadmap counters, topic counts or
+        completions, and every write to those bumps a roadmap version; the date covers
+        the chart window and streak moving on at midnight.
+        """
+        count, version_sum = (
             await self.db.execute(
-                select(
-                    completed_date_expr.label("completed_date"),
-                    func.count(Task.id).label("count"),
+                select(func.count(), func.coalesce(func.sum(Roadmap.version), 0)).where(
+                    Roadmap.deleted_at.is_(None)
                 )
-                .where(
-                    Task.completed_at.is_not(None),
-                    completed_date_expr >= start_date,
-                )
-                .group_by(completed_date_expr)
-                .order_by(completed_date_expr.asc())
             )
-        ).all()
+        ).one()
+        return make_etag("dashboard", date.today(), count, version_sum)
 
-        count_by_date = {row.completed_date: int(row.count) for row in completed_rows}
+    async def get_stats(self) -> tuple[DashboardStatsResponse, str]:
+        """Return the stats and their ETag."""
+        today = date.today()
+        start_date = today - timedelta(days=CHART_DAYS - 1)
+        row = (await self.db.execute(self._stats_query(start_date, today))).one()
+
+        completion_percent = (
+            (row.completed_tasks * 100.0 / row.total_tasks) if row.total_tasks else 0.0
+        )
+        count_by_date = dict(zip(row.chart_dates or [], row.chart_counts or []))
         tasks_completed_per_day = [
             TasksCompletedPerDay(date=current, count=count_by_date.get(current, 0))
-            for current in (start_date + timedelta(days=offset) for offset in range(30))
+            for current in (start_date + timedelta(days=offset) for offset in range(CHART_DAYS))
         ]
 
-        completion_dates = set(
-            (
-                await self.db.scalars(
-                    select(completed_date_expr.label("completed_date"))
-                    .where(Task.completed_at.is_not(None))
-                    .group_by(completed_date_expr)
-                )
-            ).all()
-        )
-
-        current_streak = self._calculate_streak(completion_dates, today)
-        return DashboardStatsResponse(
-            total_roadmaps=total_roadmaps,
-            total_topics=total_topics,
-            total_tasks=total_tasks,
-            completed_tasks=completed_tasks,
+        stats = DashboardStatsResponse(
+            total_roadmaps=row.total_roadmaps,
+            total_topics=row.total_topics,
+            total_tasks=row.total_tasks,
+            completed_tasks=row.completed_tasks,
             completion_percent=completion_percent,
-            current_streak=current_streak,
+            current_streak=row.current_streak,
             tasks_completed_per_day=tasks_completed_per_day,
         )
+        return stats, make_etag("dashboard", today, row.total_roadmaps, row.version_sum)
 
     @staticmethod
-    def _calculate_streak(completion_dates: set[date], today: date) -> int:
-        if today not in completion_dates:
-            return 0
+    def _stats_query(start_date: date, today: date) -> Select[Any]:
+        """Build the single statement behind get_stats.
+
+        Task totals come from the roadmap counters, the chart from the daily_completions
+        rollup, and the streak from a recursive CTE that steps back one day at a time via
+        primary-key probes, so the whole dashboard costs one round trip.
+        """
+        roadmap_totals = select(
+            func.count().label("total_roadmaps"),
+            func.coalesce(func.sum(Roadmap.total_tasks), 0).label("total_tasks"),
+            func.coalesce(func.sum(Roadmap.completed_tasks), 0).label("completed_tasks"),
+            func.coalesce(func.sum(Roadmap.version), 0).label("version_sum"),
+        ).where(Roadmap.deleted_at.is_(None)).cte("roadmap_totals")
+
+        recent = (
+            select(DailyCompletion.date, DailyCompletion.count)
+            .where(DailyCompletion.date >= start_date, DailyCompletion.count > 0)
+            .subquery("recent")
+        )
+
+        streak = (
+            select(literal(today, Date).label("day"))
+            .where(exists().where(DailyCompletion.date == today, DailyCompletion.count > 0))
+            .cte("streak", recursive=True)
+        )
+        previous_day = streak.c.day - 1
+        streak = streak.union_all(
+            select(previous_day).join(
+                DailyCompletion,
+                and_(DailyCompletion.date == previous_day, DailyCompletion.count > 0),
+            )
+        )
 
-        streak = 0
-        current = today
-        while current in completion_dates:
-            streak += 1
-            current -= timedelta(days=1)
-        return streak
+        return select(
+            roadmap_totals.c.total_roadmaps,
+            select(func.count(Topic.id))
+            .where(Topic.deleted_at.is_(None))
+            .scalar_subquery()
+            .label("total_topics"),
+            roadmap_totals.c.total_tasks,
+            roadmap_totals.c.completed_tasks,
+            select(func.array_agg(aggregate_order_by(recent.c.date, recent.c.date)))
+            .scalar_subquery()
+            .label("chart_dates"),
+            select(func.array_agg(aggregate_order_by(recent.c.count, recent.c.date)))
+            .scalar_subquery()
+            .label("chart_counts"),
+            select(func.count()).select_from(streak).scalar_subquery().label("current_streak"),
+            roadmap_totals.c.version_sum,
+        ).select_from(roadmap_totals)
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from itertools import batched
+from typing import Any, Literal
+from uuid import UUID
+
+import asyncpg
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import direct_connect_args
+from app.schemas.sync import SyncKind
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "tracker_events"
+ChangeAction = Literal["created", "updated", "deleted"]
+# NOTIFY payloads must be shorter than 8000 bytes. This many ids stay well below that,
+# leaving room for the roadmap ids of all but the widest writes.
+IDS_PER_EVENT = 100
+MAX_PAYLOAD_BYTES = 7999
+# How often an idle stream gets a comment line, and the listener connection a ping.
+HEARTBEAT_SECONDS = 15.0
+MAX_RECONNECT_DELAY_SECONDS = 30.0
+# How long a new subscriber waits for the listener connection before giving up.
+CONNECT_TIMEOUT_SECONDS = 10.0
+
+# Sent once the stream is live, after the listener reconnects and when a subscriber falls
+# too far behind: events may have been missed, so the client should refetch (or sync).
+READY_FRAME = b"event: ready\ndata: {}\n\n"
+RESYNC_FRAME = b"event: resync\ndata: {}\n\n"
+HEARTBEAT_FRAME = b": ping\n\n"
+
+
+async def publish_change(
+    db: AsyncSession,
+    kind: SyncKind,
+    action: ChangeAction,
+    ids: Iterable[UUID],
+    roadmap_ids: Iterable[UUID] = (),
+) -> None:
+    """Queue a change event in the writing transaction.
+
+    Postgres delivers it to the listeners when the transaction commits, and drops it if
+    the transaction rolls back. Each event carries up to IDS_PER_EVENT of ``ids`` and all
+    of ``roadmap_ids``; a change touching too many roadmaps for that to fit is published
+    as a single ``resync`` event instead.
+    """
+    roadmaps = [str(roadmap_id) for roadmap_id in roadmap_ids]
+    payloads = [
+        orjson.dumps({"type": f"{kind}.{action}", "ids": chunk, "roadmap_ids": roadmaps})
+        for chunk in batched((str(entity_id) for entity_id in ids), IDS_PER_EVENT)
+    ]
+    if any(len(payload) > MAX_PAYLOAD_BYTES for payload in payloads):
+        payloads = [orjson.dumps({"type": "resync"})]
+    for payload in payloads:
+        await db.execute(select(func.pg_notify(EVENTS_CHANNEL, payload.decode())))
+
+
+@dataclass(slots=True)
+class EventStats:
+    subscribers: int = 0
+    notifications: int = 0
+    delivered: int = 0
+    # Subscribers whose queue was full: their backlog was replaced by a resync frame.
+    overflows: int = 0
+    reconnects: int = 0
+
+
+class Subscription:
+    def __init__(self, max_queued: int) -> None:
+        self._queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=max(max_queued, 1))
+
+    def offer(self, frame: bytes) -> bool:
+        """Queue ``frame`` without waiting; on overflow, swap the backlog for a resync."""
+        try:
+            self._queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(RESYNC_FRAME)
+            return False
+
+    async def next_frame(self, timeout: float) -> bytes | None:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+
+class EventBroker:
+    """Fans NOTIFY events out to this process's subscribers from one listener connection.
+
+    The connection is opened outside the SQLAlchemy pool (on DIRECT_DATABASE_URL, if set)
+    when the first subscriber arrives and reopened with backoff if it drops. Subscribers
+    get pre-encoded SSE frames through bounded queues, so a slow consumer never holds up
+    the others or grows without limit.
+    """
+
+    def __init__(self, max_queued: int) -> None:
+        self.max_queued = max_queued
+        self._subscriptions: set[Subscription] = set()
+        self._listener: asyncio.Task[None] | None = None
+        self._ready = asyncio.Event()
+        self._stats = EventStats()
+
+    async def start(self) -> None:
+        """Start the listener if needed and wait until it is connected."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        try:
+            await asyncio.wait_for(self._ready.wait(), CONNECT_TIMEOUT_SECONDS)
+        except TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Event stream unavailable"
+            ) from None
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[Subscription]:
+        await self.start()
+        subscription = Subscription(self.max_queued)
+        self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+            self._ready = asyncio.Event()
+
+    def stats(self) -> EventStats:
+        return EventStats(
+            subscribers=len(self._subscriptions),
+            notifications=self._stats.notifications,
+            delivered=self._stats.delivered,
+            overflows=self._stats.overflows,
+            reconnects=self._stats.reconnects,
+        )
+
+    def _broadcast(self, frame: bytes) -> None:
+        for subscription in self._subscriptions:
+            if subscription.offer(frame):
+                self._stats.delivered += 1
+            else:
+                self._stats.overflows += 1
+
+    def _on_notify(self, _connection: Any, _pid: int, _channel: str, payload: str) -> None:
+        self._stats.notifications += 1
+        try:
+            event_type = orjson.loads(payload)["type"]
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            return
+        self._broadcast(f"event: {event_type}\ndata: {payload}\n\n".encode())
+
+    async def _listen(self) -> None:
+        connect_kwargs = direct_connect_args()
+        delay = 0.5
+        while True:
+            try:
+                connection = await asyncpg.connect(**connect_kwargs)
+                try:
+                    lost = asyncio.Event()
+                    connection.add_termination_listener(lambda _connection: lost.set())
+                    await connection.add_listener(EVENTS_CHANNEL, self._on_notify)
+                    if self._ready.is_set():
+                        self._stats.reconnects += 1
+                        self._broadcast(RESYNC_FRAME)
+                    self._ready.set()
+                    delay = 0.5
+                    while True:
+                        try:
+                            await asyncio.wait_for(lost.wait(), HEARTBEAT_SECONDS)
+                        except TimeoutError:
+                            await connection.fetchval("SELECT 1", timeout=HEARTBEAT_SECONDS)
+                        else:
+                            raise ConnectionResetError("listener connection closed")
+                finally:
+                    connection.terminate()
+            except (OSError, TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as exc:
+                logger.warning("Event listener connection lost (%s); retrying in %.1fs", exc, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+
+
+event_broker = EventBroker(max_queued=get_settings().event_queue_size)
@@ -0,0 +1,222 @@
+from collections.abc import Iterable
+
+from app.database import pool_stats, read_engine, replica_stats
+from app.middleware.admission import Priority, admission
+from app.middleware.metrics import STATUS_CLASSES, Histogram, RequestMetrics
+from app.middleware.query_count import query_totals
+from app.services.cache import read_flights, response_cache
+from app.services.events import event_broker
+from app.services.purge_service import purger
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = tuple[tuple[str, str], ...]
+Sample = tuple[Labels, float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Exposition:
+    """Prometheus text format, one metric family at a time."""
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def family(self, name: str, kind: str, help_text: str, samples: Iterable[Sample]) -> None:
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            self.lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def histogram(self, name: str, help_text: str, series: Iterable[tuple[Labels, Histogram]]) -> None:
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} histogram")
+        for labels, histogram in series:
+            bounds = [*(_number(bound) for bound in histogram.bounds), "+Inf"]
+            cumulative = histogram.cumulative()
+            for bound, count in zip(bounds, cumulative, strict=True):
+                self.lines.append(f"{name}_bucket{_labels((*labels, ('le', bound)))} {count}")
+            self.lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+            self.lines.append(f"{name}_count{_labels(labels)} {cumulative[-1]}")
+
+    def one(self, name: str, kind: str, help_text: str, value: float) -> None:
+        self.family(name, kind, help_text, [((), value)])
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _request_metrics(out: _Exposition, requests: RequestMetrics) -> None:
+    routes = requests.routes()
+    out.one(
+        "http_requests_in_flight", "gauge", "Requests being handled, streams included.", requests.in_flight
+    )
+
+    out.histogram(
+        "http_request_duration_seconds",
+        "Time to handle a request, until its response is sent.",
+        (((("method", route.method), ("route", route.route)), route.latency) for route in routes),
+    )
+    out.family(
+        "http_responses_total",
+        "counter",
+        "Responses sent, by status class.",
+        (
+            ((("method", route.method), ("route", route.route), ("status", status)), count)
+            for route in routes
+            for status, count in zip(STATUS_CLASSES, route.responses, strict=True)
+        ),
+    )
+    out.family(
+        "http_request_db_queries_total",
+        "counter",
+        "SQL statements run by requests (divide by the request count for a per-request mean).",
+        (((("method", route.method), ("route", route.route)), route.db_queries) for route in routes),
+    )
+    out.family(
+        "http_request_db_seconds_total",
+        "counter",
+        "Time requests spent executing SQL statements.",
+        (((("method", route.method), ("route", route.route)), route.db_seconds) for route in routes),
+    )
+
+
+def _db_metrics(out: _Exposition) -> None:
+    out.one("db_queries_total", "counter", "SQL statements run, in requests or not.", query_totals.count)
+    out.one("db_query_seconds_total", "counter", "Time spent executing SQL statements.", query_totals.seconds)
+
+    pools = [("primary", pool_stats())]
+    if read_engine is not None:
+        pools.append(("replica", pool_stats(read_engine)))
+    gauges = (
+        ("db_pool_connections", "Connections open in the pool.", "connections"),
+        ("db_pool_checked_out", "Connections checked out of the pool.", "checked_out"),
+        ("db_pool_overflow", "Connections open beyond the pool size.", "overflow"),
+        ("db_pool_checkout_wait_seconds_max", "Longest checkout wait so far.", "max_wait_seconds"),
+    )
+    counters = (
+        ("db_pool_checkouts_total", "Connections checked out.", "checkouts"),
+        (
+            "db_pool_checkout_wait_seconds_total",
+            "Time spent waiting for (or opening) connections.",
+            "wait_seconds",
+        ),
+        ("db_pool_timeouts_total", "Checkouts that gave up waiting for a connection.", "timeouts"),
+        ("db_pool_pings_total", "Idle connections pinged before reuse.", "pings"),
+        ("db_pool_stale_total", "Pinged connections found dead and replaced.", "stale"),
+    )
+    for kind, families in (("gauge", gauges), ("counter", counters)):
+        for name, help_text, field in families:
+            samples = [((("pool", pool),), getattr(stats, field)) for pool, stats in pools]
+            out.family(name, kind, help_text, samples)
+
+    if read_engine is not None:
+        replica = replica_stats()
+        out.one("db_replica_healthy", "gauge", "Whether reads may go to the replica.", int(replica.healthy))
+        if replica.lag_seconds is not None:
+            out.one(
+                "db_replica_lag_seconds", "gauge", "Replication lag at the last check.", replica.lag_seconds
+            )
+        out.one("db_replica_failures_total", "counter", "Failed replica checks and reads.", replica.failures)
+        out.family(
+            "db_read_routes_total",
+            "counter",
+            "Reads that may use the replica, by where they went.",
+            [
+                ((("target", "replica"),), replica.replica_reads),
+                ((("target", "primary_after_write"),), replica.sticky_reads),
+                ((("target", "primary_fallback"),), replica.fallback_reads),
+            ],
+        )
+
+
+def _admission_metrics(out: _Exposition) -> None:
+    stats = admission.stats()
+    out.one("admission_active", "gauge", "Requests holding an admission slot.", stats.active)
+    out.one("admission_slots", "gauge", "Requests admitted at once (0: unlimited).", admission.max_active)
+    out.family(
+        "admission_queue_depth",
+        "gauge",
+        "Requests waiting for a slot, by priority.",
+        (((("priority", priority.name.lower()),), stats.queued[priority]) for priority in Priority),
+    )
+    out.one("admission_admitted_total", "counter", "Requests admitted.", stats.admitted)
+    out.one("admission_waited_total", "counter", "Requests that had to wait for a slot.", stats.waited)
+    out.one("admission_wait_seconds_total", "counter", "Time spent waiting for slots.", stats.wait_seconds)
+    out.family(
+        "admission_rejected_total",
+        "counter",
+        "Requests turned away with a 503, by reason.",
+        [
+            ((("reason", "queue_full"),), stats.rejected_full),
+            ((("reason", "displaced"),), stats.rejected_displaced),
+            ((("reason", "timeout"),), stats.rejected_timeout),
+        ],
+    )
+
+
+def _service_metrics(out: _Exposition) -> None:
+    cache = response_cache.stats()
+    lookups = cache.hits + cache.misses
+    out.one("response_cache_hits_total", "counter", "Response cache lookups that hit.", cache.hits)
+    out.one("response_cache_misses_total", "counter", "Response cache lookups that missed.", cache.misses)
+    hit_ratio = cache.hits / lookups if lookups else 0.0
+    out.one("response_cache_hit_ratio", "gauge", "Hits per lookup since start.", hit_ratio)
+    out.one("response_cache_evictions_total", "counter", "Entries evicted to make room.", cache.evictions)
+    out.one("response_cache_expirations_total", "counter", "Entries found past their TTL.", cache.expirations)
+    out.one(
+        "response_cache_invalidations_total", "counter", "Entries dropped by writes.", cache.invalidations
+    )
+    out.one(
+        "response_cache_rejected_fills_total",
+        "counter",
+        "Renders not stored because a write happened meanwhile.",
+        cache.rejected_fills,
+    )
+
+    flights = read_flights.stats()
+    out.one("read_flights_total", "counter", "Cache-miss renders run.", flights.flights)
+    out.one(
+        "read_flights_coalesced_total",
+        "counter",
+        "Requests that waited on another's render.",
+        flights.coalesced,
+    )
+
+    events = event_broker.stats()
+    out.one("events_subscribers", "gauge", "Open /api/events streams.", events.subscribers)
+    out.one("events_notifications_total", "counter", "Change notifications received.", events.notifications)
+    out.one("events_delivered_total", "counter", "Events queued to subscribers.", events.delivered)
+    out.one(
+        "events_overflows_total", "counter", "Subscriber backlogs replaced by a resync.", events.overflows
+    )
+    out.one("events_reconnects_total", "counter", "LISTEN connections reopened.", events.reconnects)
+
+    purge = purger.stats()
+    out.one("purger_running", "gauge", "Whether this process runs the purger.", int(purge.running))
+    out.one("purger_batches_total", "counter", "Purge transactions committed.", purge.batches)
+    out.one("purger_tasks_total", "counter", "Tasks purged.", purge.tasks)
+    out.one("purger_tombstones_total", "counter", "Expired sync tombstones deleted.", purge.tombstones)
+    out.one("purger_errors_total", "counter", "Purge batches that failed.", purge.errors)
+
+
+def render_metrics(requests: RequestMetrics) -> str:
+    """This process's metrics in the Prometheus text format."""
+    out = _Exposition()
+    _request_metrics(out, requests)
+    _db_metrics(out)
+    _admission_metrics(out)
+    _service_metrics(out)
+    return out.text()
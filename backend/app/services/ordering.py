@@ -0,0 +1,115 @@
+from collections.abc import Sequence
+from uuid import UUID
+
+from sqlalchemy import Column, Table, exists, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Siblings are spaced SORT_GAP apart so that a move only rewrites the moved rows;
+# a parent is renumbered only once the gap at the insertion point is used up.
+SORT_GAP = 1024
+
+
+class SiblingNotFound(Exception):
+    pass
+
+
+def spread_keys(lower: int | None, upper: int | None, count: int) -> list[int] | None:
+    """Return ``count`` increasing keys strictly between ``lower`` and ``upper``.
+
+    ``None`` bounds are open ends. Returns None when the gap between the bounds is too
+    small to hold ``count`` distinct keys.
+    """
+    if upper is None:
+        base = 0 if lower is None else lower
+        return [base + SORT_GAP * offset for offset in range(1, count + 1)]
+    if lower is None:
+        return [upper - SORT_GAP * offset for offset in range(count, 0, -1)]
+
+    step = (upper - lower) // (count + 1)
+    if step < 1:
+        return None
+    return [lower + step * offset for offset in range(1, count + 1)]
+
+
+async def allocate_sort_keys(
+    db: AsyncSession,
+    *,
+    parent: Table,
+    parent_column: Column[UUID],
+    parent_id: UUID,
+    moved_ids: Sequence[UUID],
+    after_id: UUID | None,
+) -> list[int] | None:
+    """Lock ``parent`` and return sort keys placing ``moved_ids`` right after ``after_id``.
+
+    ``after_id=None`` places them first. Returns None when the parent row does not exist
+    or is deleted; raises SiblingNotFound when ``after_id`` is not one of the parent's
+    other children (deleted children, which keep their keys until purged, do not count).
+    Renumbers the parent's children (once) when the gap is exhausted or ``after_id``
+    shares its key with another sibling.
+    """
+    children = parent_column.table
+    siblings = (parent_column == parent_id) & children.c.id.not_in(moved_ids)
+    if "deleted_at" in children.c:
+        siblings &= children.c.deleted_at.is_(None)
+
+    lower = None
+    if after_id is not None:
+        lower = (
+            select(children.c.sort_order)
+            .where(children.c.id == after_id, siblings)
+            .correlate(None)
+            .scalar_subquery()
+        )
+    upper_criteria = [siblings] if lower is None else [siblings, children.c.sort_order > lower]
+    upper = select(func.min(children.c.sort_order)).where(*upper_criteria).scalar_subquery()
+    shared_key = (
+        exists().where(siblings, children.c.sort_order == lower, children.c.id != after_id)
+        if lower is not None
+        else None
+    )
+
+    for _ in range(2):
+        columns = [parent.c.id, upper.label("upper")]
+        if lower is not None:
+            columns += [lower.label("lower"), shared_key.label("shared_key")]
+        row = (
+            await db.execute(
+                select(*columns)
+                .where(parent.c.id == parent_id, parent.c.deleted_at.is_(None))
+                .with_for_update(of=parent)
+            )
+        ).one_or_none()
+        if row is None:
+            return None
+        if lower is not None and row.lower is None:
+            raise SiblingNotFound
+
+        keys = None
+        if lower is None or not row.shared_key:
+            keys = spread_keys(None if lower is None else row.lower, row.upper, len(moved_ids))
+        if keys is not None:
+            return keys
+        await rebalance(db, parent_column, parent_id)
+
+    raise RuntimeError("sort keys still exhausted after rebalancing")
+
+
+async def rebalance(db: AsyncSession, parent_column: Column[UUID], parent_id: UUID) -> None:
+    """Renumber a parent's children SORT_GAP apart, keeping their current order."""
+    children = parent_column.table
+    ranked = (
+        select(
+            children.c.id,
+            func.row_number()
+            .over(order_by=(children.c.sort_order, children.c.id))
+            .label("position"),
+        )
+        .where(parent_column == parent_id)
+        .subquery("ranked")
+    )
+    await db.execute(
+        update(children)
+        .where(children.c.id == ranked.c.id)
+        .values(sort_order=ranked.c.position * SORT_GAP)
+    )
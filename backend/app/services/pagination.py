@@ -0,0 +1,55 @@
+import base64
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.sql import ColumnElement
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque cursor holding the sort key of the last row of a page."""
+    return base64.urlsafe_b64encode(orjson.dumps(values, default=str)).decode().rstrip("=")
+
+
+def _bounded_int(bits: int) -> Callable[[Any], int]:
+    low, high = -(2 ** (bits - 1)), 2 ** (bits - 1) - 1
+
+    def parse(value: Any) -> int:
+        number = int(value)
+        if not low <= number <= high:
+            raise ValueError(value)
+        return number
+
+    return parse
+
+
+# Parsers for cursor values compared with integer and bigint columns: a value out of the
+# column's range would otherwise only fail in the database.
+int32 = _bounded_int(32)
+int64 = _bounded_int(64)
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[Any], Any]) -> tuple[Any, ...]:
+    """The values of ``cursor``, each passed through its parser; any malformed cursor is a 400."""
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError(cursor)
+        return tuple(parse(value) for parse, value in zip(parsers, values, strict=True))
+    except (ValueError, TypeError, AttributeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def after_key(columns: Sequence[ColumnElement[Any]], values: Sequence[Any]) -> ColumnElement[bool]:
+    """Rows strictly after ``values`` in ascending ``columns`` order.
+
+    A row-value comparison, so Postgres can start an index scan on the same columns right
+    at the cursor instead of counting past the earlier pages.
+    """
+    return tuple_(*columns) > tuple_(*values)
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import Tombstone
+from app.services.rollups import roadmaps_table, task_in_deleted_topic, tasks_table, topics_table
+from app.services.sync_service import TOMBSTONE_RETENTION
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY_SECONDS = 30.0
+
+tombstones_table = Tombstone.__table__
+
+
+@dataclass(slots=True)
+class PurgeBatch:
+    """Rows removed by one purge transaction."""
+
+    tasks: int = 0
+    topics: int = 0
+    roadmaps: int = 0
+    tombstones: int = 0
+
+
+@dataclass(slots=True)
+class PurgeBacklog:
+    """Soft-deleted rows still waiting to be purged."""
+
+    roadmaps: int
+    topics: int
+    tasks: int
+    tombstones: int
+
+
+@dataclass(slots=True)
+class PurgeStats:
+    running: bool = False
+    batches: int = 0
+    tasks: int = 0
+    topics: int = 0
+    roadmaps: int = 0
+    tombstones: int = 0
+    errors: int = 0
+
+
+class PurgeService:
+    """Removes the rows of soft-deleted roadmaps and topics, one bounded transaction at a time.
+
+    All the purge state lives in the deleted_at markers, so a purge that stops midway
+    (crash, deploy, another worker taking over) resumes from the rows that are left.
+    Deleted topics are claimed with SKIP LOCKED, letting several purgers run side by side.
+    Tombstones past the sync retention go too, once the soft-deleted rows are done.
+    """
+
+    def __init__(self, db: AsyncSession, batch_size: int) -> None:
+        self.db = db
+        self.batch_size = batch_size
+
+    async def purge_batch(self) -> PurgeBatch | None:
+        """Delete up to ``batch_size`` tasks of the oldest deleted topic, or an emptied roadmap.
+
+        A topic row goes once its last tasks are deleted, and a roadmap once its last
+        topic is gone; with neither left, up to ``batch_size`` expired tombstones go.
+        Commits, and returns None when nothing is left to purge.
+        """
+        purged = PurgeBatch()
+        topic_id = await self.db.scalar(
+            select(topics_table.c.id)
+            .where(topics_table.c.deleted_at.is_not(None))
+            .order_by(topics_table.c.deleted_at, topics_table.c.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if topic_id is not None:
+            doomed = select(tasks_table.c.id).where(tasks_table.c.topic_id == topic_id).limit(self.batch_size)
+            result = await self.db.execute(delete(tasks_table).where(tasks_table.c.id.in_(doomed)))
+            purged.tasks = result.rowcount
+            if purged.tasks < self.batch_size:
+                await self.db.execute(delete(topics_table).where(topics_table.c.id == topic_id))
+                purged.topics = 1
+        else:
+            roadmap_id = await self.db.scalar(
+                select(roadmaps_table.c.id)
+                .where(
+                    roadmaps_table.c.deleted_at.is_not(None),
+                    ~exists().where(topics_table.c.roadmap_id == roadmaps_table.c.id),
+                )
+                .order_by(roadmaps_table.c.deleted_at, roadmaps_table.c.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            if roadmap_id is not None:
+                await self.db.execute(delete(roadmaps_table).where(roadmaps_table.c.id == roadmap_id))
+                purged.roadmaps = 1
+            else:
+                purged.tombstones = await self._expire_tombstones()
+                if not purged.tombstones:
+                    await self.db.rollback()
+                    return None
+        await self.db.commit()
+        return purged
+
+    async def _expire_tombstones(self) -> int:
+        """Delete up to ``batch_size`` tombstones older than any sync cursor still reaches."""
+        doomed = (
+            select(tombstones_table.c.id)
+            .where(tombstones_table.c.deleted_at < func.now() - TOMBSTONE_RETENTION)
+            .order_by(tombstones_table.c.deleted_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(delete(tombstones_table).where(tombstones_table.c.id.in_(doomed)))
+        return result.rowcount
+
+    async def backlog(self) -> PurgeBacklog:
+        row = (
+            await self.db.execute(
+                select(
+                    select(func.count())
+                    .where(roadmaps_table.c.deleted_at.is_not(None))
+                    .scalar_subquery()
+                    .label("roadmaps"),
+                    select(func.count())
+                    .where(topics_table.c.deleted_at.is_not(None))
+                    .scalar_subquery()
+                    .label("topics"),
+                    select(func.count()).where(task_in_deleted_topic).scalar_subquery().label("tasks"),
+                    select(func.count())
+                    .where(tombstones_table.c.deleted_at < func.now() - TOMBSTONE_RETENTION)
+                    .scalar_subquery()
+                    .label("tombstones"),
+                )
+            )
+        ).one()
+        return PurgeBacklog(
+            roadmaps=row.roadmaps, topics=row.topics, tasks=row.tasks, tombstones=row.tombstones
+        )
+
+
+class Purger:
+    """Runs PurgeService batches in the background of this process until nothing is left.
+
+    Deletes made here wake it straight away; those made by other processes are picked
+    up within ``idle_seconds``.
+    """
+
+    def __init__(self, batch_size: int, idle_seconds: float) -> None:
+        self.batch_size = batch_size
+        self.idle_seconds = idle_seconds
+        self._task: asyncio.Task[None] | None = None
+        self._wake = asyncio.Event()
+        self._stats = PurgeStats()
+
+    def start(self) -> None:
+        if self.batch_size > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> PurgeStats:
+        return PurgeStats(
+            running=self._task is not None and not self._task.done(),
+            batches=self._stats.batches,
+            tasks=self._stats.tasks,
+            topics=self._stats.topics,
+            roadmaps=self._stats.roadmaps,
+            tombstones=self._stats.tombstones,
+            errors=self._stats.errors,
+        )
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            self._wake.clear()
+            try:
+                async with SessionLocal() as db:
+                    purged = await PurgeService(db, self.batch_size).purge_batch()
+            except (OSError, SQLAlchemyError) as exc:
+                self._stats.errors += 1
+                logger.warning("Purge batch failed (%s); retrying in %.1fs", exc, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY_SECONDS)
+                continue
+            delay = 1.0
+            if purged is None:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.idle_seconds)
+                except TimeoutError:
+                    pass
+                continue
+            self._stats.batches += 1
+            self._stats.tasks += purged.tasks
+            self._stats.topics += purged.topics
+            self._stats.roadmaps += purged.roadmaps
+            self._stats.tombstones += purged.tombstones
+            if purged.topics or purged.roadmaps:
+                logger.info(
+                    "Purged %d topic(s) and %d roadmap(s); %d tasks in %d batches so far",
+                    purged.topics,
+                    purged.roadmaps,
+                    self._stats.tasks,
+                    self._stats.batches,
+                )
+            # Let request handlers in between batches.
+            await asyncio.sleep(0)
+
+
+settings = get_settings()
+purger = Purger(batch_size=settings.purge_batch_size, idle_seconds=settings.purge_idle_seconds)
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import get_settings
+from app.database import read_engine, replica
+
+logger = logging.getLogger(__name__)
+
+CHECK_INTERVAL_SECONDS = 2.0
+
+# Seconds since the last transaction the replica replayed, or 0 if it has replayed all the
+# WAL it received (an idle primary sends none, which is no lag) or is not a standby at all.
+# Right after a standby starts, the received position is the start of the segment it
+# streams from, behind what it already replayed.
+LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery()"
+    " OR pg_last_wal_replay_lsn() >= pg_last_wal_receive_lsn() THEN 0.0"
+    " ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())::float8 END"
+)
+
+
+class ReplicaMonitor:
+    """Checks the read replica every CHECK_INTERVAL_SECONDS: get_read_db only uses it while it is healthy."""
+
+    def __init__(self, max_lag_seconds: float) -> None:
+        self.max_lag_seconds = max_lag_seconds
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if read_engine is not None and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run(read_engine))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def check(self, target: AsyncEngine) -> None:
+        was_healthy = replica.healthy
+        try:
+            async with asyncio.timeout(CHECK_INTERVAL_SECONDS):
+                async with target.connect() as conn:
+                    lag = await conn.scalar(LAG_QUERY)
+        except (OSError, TimeoutError, SQLAlchemyError) as exc:
+            replica.healthy = False
+            replica.lag_seconds = None
+            replica.failures += 1
+            if was_healthy:
+                logger.warning("Read replica unreachable (%s); reading from the primary", exc)
+            return
+        replica.lag_seconds = lag
+        replica.healthy = lag is not None and lag <= self.max_lag_seconds
+        if replica.healthy and not was_healthy:
+            logger.info("Read replica available (%.1fs behind)", lag)
+        elif was_healthy and not replica.healthy:
+            logger.warning("Read replica behind by %ss; reading from the primary", lag)
+
+    async def _run(self, target: AsyncEngine) -> None:
+        while True:
+            await self.check(target)
+            await asyncio.sleep(CHECK_INTERVAL_SECONDS)
+
+
+replica_monitor = ReplicaMonitor(max_lag_seconds=get_settings().replica_max_lag_seconds)
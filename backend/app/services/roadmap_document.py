@@ -0,0 +1,142 @@
+import json
+from functools import reduce
+from operator import add
+from uuid import UUID
+
+from sqlalchemy import BigInteger, Float, Select, String, Text, case, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.sql import ColumnElement
+
+from app.models import Roadmap, Task, Topic
+from app.schemas.roadmap import RoadmapDetailView
+
+# The detail document is concatenated as text rather than built with json_build_object so
+# that its bytes match what pydantic emits for RoadmapDetail: no whitespace, fields in
+# schema order, "Z"-suffixed timestamps and the same float notation.
+
+
+def _text(value: str) -> ColumnElement[str]:
+    return literal(value, String)
+
+
+def _json_value(expr: ColumnElement) -> ColumnElement[str]:  # type: ignore[type-arg]
+    return func.coalesce(cast(func.to_json(expr), Text), _text("null"))
+
+
+def _json_number(expr: ColumnElement[int]) -> ColumnElement[str]:
+    return cast(expr, Text)
+
+
+def _json_bool(expr: ColumnElement[bool]) -> ColumnElement[str]:
+    return cast(expr, Text)
+
+
+def _json_timestamp(expr: ColumnElement) -> ColumnElement[str]:  # type: ignore[type-arg]
+    utc = func.timezone("UTC", expr)
+    microseconds = func.to_char(utc, "US")
+    rendered = (
+        _text('"')
+        + func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS')
+        + case((microseconds == "000000", _text("")), else_=_text(".") + microseconds)
+        + _text('Z"')
+    )
+    return func.coalesce(rendered, _text("null"))
+
+
+def _json_float(expr: ColumnElement[float]) -> ColumnElement[str]:
+    # Postgres prints integral floats without ".0" and switches to exponent notation one
+    # decade earlier than pydantic, with a zero-padded exponent.
+    as_text = cast(expr, Text)
+    return case(
+        (expr == func.trunc(expr), cast(cast(func.trunc(expr), BigInteger), Text) + _text(".0")),
+        (as_text.like("%e-05"), _text("0.0000") + func.replace(func.split_part(as_text, "e", 1), ".", "")),
+        else_=func.replace(as_text, "e-0", "e-"),
+    )
+
+
+def _progress(completed: ColumnElement[int], total: ColumnElement[int]) -> ColumnElement[str]:
+    percent = case(
+        (total == 0, literal(0.0, Float)),
+        else_=cast(completed, Float) * literal(100.0, Float) / cast(total, Float),
+    )
+    return _json_float(percent)
+
+
+def _json_object(*fields: tuple[str, ColumnElement[str] | None]) -> ColumnElement[str]:
+    """Concatenate ``fields`` into an object, skipping those whose value is None."""
+    parts: list[ColumnElement[str]] = []
+    for key, value in fields:
+        if value is None:
+            continue
+        parts.append(_text(("{" if not parts else ",") + json.dumps(key) + ":"))
+        parts.append(value)
+    parts.append(_text("}"))
+    return reduce(add, parts)
+
+
+def _json_array(
+    element: ColumnElement[str], *order_by: ColumnElement  # type: ignore[type-arg]
+) -> ColumnElement[str]:
+    joined = func.string_agg(element, aggregate_order_by(_text(","), *order_by))
+    return _text("[") + func.coalesce(joined, _text("")) + _text("]")
+
+
+def roadmap_detail_document(roadmap_id: UUID, view: RoadmapDetailView) -> Select[tuple[str, int]]:
+    """The detail document of ``view``, as one text column next to the roadmap version.
+
+    Keys the view leaves out are left out of the document, not just nulled, matching a
+    RoadmapDetail dump with ``view.exclude()``.
+    """
+    task_document = _json_object(
+        ("id", _json_value(Task.id)),
+        ("topic_id", _json_value(Task.topic_id)),
+        ("title", _json_value(Task.title)),
+        ("notes", _json_value(Task.notes) if view.includes("notes") else None),
+        ("status", _json_value(Task.status)),
+        ("sort_order", _json_number(Task.sort_order)),
+        ("completed_at", _json_timestamp(Task.completed_at)),
+        ("created_at", _json_timestamp(Task.created_at)),
+        ("updated_at", _json_timestamp(Task.updated_at)),
+    )
+    tasks = (
+        select(_json_array(task_document, Task.sort_order, Task.id))
+        .where(Task.topic_id == Topic.id)
+        .scalar_subquery()
+    )
+
+    topic_document = _json_object(
+        ("id", _json_value(Topic.id)),
+        ("roadmap_id", _json_value(Topic.roadmap_id)),
+        ("title", _json_value(Topic.title)),
+        ("description", _json_value(Topic.description) if view.includes("description") else None),
+        ("sort_order", _json_number(Topic.sort_order)),
+        ("tasks", tasks if view.includes_tasks else None),
+        ("total_tasks", _json_number(Topic.total_tasks)),
+        ("completed_tasks", _json_number(Topic.completed_tasks)),
+        ("progress_percent", _progress(Topic.completed_tasks, Topic.total_tasks)),
+        ("created_at", _json_timestamp(Topic.created_at)),
+        ("updated_at", _json_timestamp(Topic.updated_at)),
+    )
+    topics = (
+        select(_json_array(topic_document, Topic.sort_order, Topic.id))
+        .where(Topic.roadmap_id == Roadmap.id, Topic.deleted_at.is_(None))
+        .scalar_subquery()
+    )
+
+    roadmap_document = _json_object(
+        ("id", _json_value(Roadmap.id)),
+        ("title", _json_value(Roadmap.title)),
+        ("description", _json_value(Roadmap.description) if view.includes("description") else None),
+        ("color", _json_value(Roadmap.color)),
+        ("sort_order", _json_number(Roadmap.sort_order)),
+        ("is_archived", _json_bool(Roadmap.is_archived)),
+        ("topics", topics if view.tasks != "none" else None),
+        ("total_tasks", _json_number(Roadmap.total_tasks)),
+        ("completed_tasks", _json_number(Roadmap.completed_tasks)),
+        ("progress_percent", _progress(Roadmap.completed_tasks, Roadmap.total_tasks)),
+        ("created_at", _json_timestamp(Roadmap.created_at)),
+        ("updated_at", _json_timestamp(Roadmap.updated_at)),
+    )
+    return select(roadmap_document, Roadmap.version).where(
+        Roadmap.id == roadmap_id, Roadmap.deleted_at.is_(None)
+    )
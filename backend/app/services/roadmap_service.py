@@ -1,114 +1,176 @@
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import case, func, select
+from sqlalchemy import (
+    ARRAY,
+    RowMapping,
+    Select,
+    Uuid,
+    column,
+    func,
+    insert,
+    literal,
+    null,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy.sql.selectable import TableValuedAlias
+from uuid_utils.compat import uuid7
 
-from app.models import Roadmap, Task, Topic
-from app.schemas.roadmap import RoadmapCreate, RoadmapDetail, RoadmapListItem, RoadmapUpdate
+from app.models import Roadmap, Task, TaskStatus, Topic
+from app.schemas.roadmap import (
+    RoadmapClone,
+    RoadmapCreate,
+    RoadmapDetail,
+    RoadmapDetailView,
+    RoadmapUpdate,
+)
 from app.schemas.topic import TopicResponse
+from app.services.cache import (
+    ROADMAP_LIST_KEY,
+    dashboard_key,
+    make_etag,
+    response_cache,
+    roadmap_keys,
+)
+from app.services.events import publish_change
+from app.services.pagination import after_key, decode_cursor, encode_cursor, int32
+from app.services.purge_service import purger
+from app.services.roadmap_document import roadmap_detail_document
+from app.services.rollups import progress_percent, record_completions, retract_completions, task_columns
+from app.services.sync_service import record_tombstones
+
+# Also the keyset of list pages, backed by the ix_roadmaps_list_order indexes.
+ROADMAP_LIST_ORDER = (Roadmap.sort_order, Roadmap.created_at, Roadmap.id)
+
+FULL_VIEW = RoadmapDetailView()
+
+
+def _detail_etag(version: int, view: RoadmapDetailView) -> str:
+    return make_etag("roadmap", version) if view.tag is None else make_etag("roadmap", version, view.tag)
+
+
+def _id_map(name: str, old_ids: list[UUID]) -> TableValuedAlias:
+    """(old_id, new_id) rows pairing ``old_ids`` with freshly generated uuid7s."""
+    new_ids = [uuid7() for _ in old_ids]
+    return (
+        func.unnest(literal(old_ids, ARRAY(Uuid)), literal(new_ids, ARRAY(Uuid)))
+        .table_valued(column("old_id", Uuid), column("new_id", Uuid))
+        .render_derived(name=name)
+    )
+
+
+def _text_column(column: ColumnElement[str | None], included: bool) -> ColumnElement[str | None]:
+    # Leave a null in place of a text column the view doesn't ask for, so it is never read.
+    return column if included else null().label(column.key)
 
 
 class RoadmapService:
     def __init__(self, db: AsyncSession) -> None:
         self.db = db
 
-    async def list_roadmaps(self) -> list[RoadmapListItem]:
-        total_tasks = func.count(Task.id).label("total_tasks")
-        completed_tasks = func.sum(case((Task.status == "completed", 1), else_=0)).label(
-            "completed_tasks"
-        )
-        in_progress_tasks = func.sum(case((Task.status == "in_progress", 1), else_=0)).label(
-            "in_progress_tasks"
-        )
-        progress_percent = case(
-            (func.count(Task.id) == 0, 0.0),
-            else_=(func.sum(case((Task.status == "completed", 1), else_=0)) * 100.0)
-            / func.count(Task.id),
-        ).label("progress_percent")
+    async def list_etag(self) -> str:
+        """ETag of the roadmap list without building it.
 
-        query = (
-            select(
-                Roadmap.id,
-                Roadmap.title,
-                Roadmap.description,
-                Roadmap.color,
-                Roadmap.sort_order,
-                Roadmap.is_archived,
-                Roadmap.created_at,
-                Roadmap.updated_at,
-                total_tasks,
-                completed_tasks,
-                in_progress_tasks,
-                progress_percent,
-            )
-            .outerjoin(Topic, Topic.roadmap_id == Roadmap.id)
-            .outerjoin(Task, Task.topic_id == Topic.id)
-            .group_by(Roadmap.id)
-            .order_by(Roadmap.sort_order.asc(), Roadmap.created_at.asc())
-        )
-        rows = (await self.db.execute(query)).all()
-
-        result: list[RoadmapListItem] = []
-        for row in rows:
-            result.append(
-                RoadmapListItem(
-                    id=row.id,
-                    title=row.title,
-                    description=row.description,
-                    color=row.color,
-                    sort_order=row.sort_order,
-                    is_archived=row.is_archived,
-                    total_tasks=int(row.total_tasks or 0),
-                    completed_tasks=int(row.completed_tasks or 0),
-                    in_progress_tasks=int(row.in_progress_tasks or 0),
-                    progress_percent=float(row.progress_percent or 0.0),
-                    created_at=row.created_at,
-                    updated_at=row.updated_at,
+        Every write draws a fresh version, so (count, sum of versions) changes with any
+        insert, update or delete of a roadmap row.
+        """
+        count, version_sum = (
+            await self.db.execute(
+                select(func.count(), func.coalesce(func.sum(Roadmap.version), 0)).where(
+                    Roadmap.deleted_at.is_(None)
                 )
             )
-        return result
+        ).one()
+        return make_etag("roadmaps", count, version_sum)
+
+    @staticmethod
+    def _list_query() -> Select[Any]:
+        return select(
+            Roadmap.id,
+            Roadmap.title,
+            Roadmap.description,
+            Roadmap.color,
+            Roadmap.sort_order,
+            Roadmap.is_archived,
+            Roadmap.created_at,
+            Roadmap.updated_at,
+            Roadmap.total_tasks,
+            Roadmap.completed_tasks,
+            Roadmap.in_progress_tasks,
+            Roadmap.version,
+        ).where(Roadmap.deleted_at.is_(None)).order_by(*ROADMAP_LIST_ORDER)
+
+    @staticmethod
+    def _list_item(row: RowMapping) -> dict[str, Any]:
+        return {**row, "progress_percent": progress_percent(row["completed_tasks"], row["total_tasks"])}
+
+    async def list_roadmaps(self) -> tuple[list[dict[str, Any]], str]:
+        """Return the list rows and their ETag."""
+        rows = (await self.db.execute(self._list_query())).mappings().all()
+        items = [self._list_item(row) for row in rows]
+        return items, make_etag("roadmaps", len(rows), sum(row["version"] for row in rows))
+
+    async def list_roadmap_page(
+        self, *, limit: int, cursor: str | None = None, is_archived: bool | None = None
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Return one keyset page of the list and the cursor of the next page, if any."""
+        query = self._list_query().limit(limit + 1)
+        if is_archived is not None:
+            query = query.where(Roadmap.is_archived == is_archived)
+        if cursor is not None:
+            query = query.where(
+                after_key(ROADMAP_LIST_ORDER, decode_cursor(cursor, int32, datetime.fromisoformat, UUID))
+            )
+        rows = (await self.db.execute(query)).mappings().all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last["sort_order"], last["created_at"], last["id"])
+        return [self._list_item(row) for row in rows], next_cursor
+
+    async def detail_etag(self, roadmap_id: UUID, view: RoadmapDetailView = FULL_VIEW) -> str | None:
+        version = await self.db.scalar(
+            select(Roadmap.version).where(Roadmap.id == roadmap_id, Roadmap.deleted_at.is_(None))
+        )
+        return None if version is None else _detail_etag(version, view)
 
-    async def get_roadmap_detail(self, roadmap_id: UUID) -> RoadmapDetail:
+    async def get_roadmap_detail(self, roadmap_id: UUID) -> tuple[RoadmapDetail, str]:
         query = (
             select(Roadmap)
-            .where(Roadmap.id == roadmap_id)
-            .options(selectinload(Roadmap.topics).selectinload(Topic.tasks))
+            .where(Roadmap.id == roadmap_id, Roadmap.deleted_at.is_(None))
+            .options(selectinload(Roadmap.topics.and_(Topic.deleted_at.is_(None))).selectinload(Topic.tasks))
         )
         roadmap = (await self.db.execute(query)).scalar_one_or_none()
         if roadmap is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Roadmap not found")
 
-        topics: list[TopicResponse] = []
-        total_tasks = 0
-        completed_tasks = 0
-
-        for topic in roadmap.topics:
-            topic_total = len(topic.tasks)
-            topic_completed = sum(1 for task in topic.tasks if task.status == "completed")
-            topic_progress = (topic_completed * 100.0 / topic_total) if topic_total else 0.0
-
-            topics.append(
-                TopicResponse(
-                    id=topic.id,
-                    roadmap_id=topic.roadmap_id,
-                    title=topic.title,
-                    description=topic.description,
-                    sort_order=topic.sort_order,
-                    tasks=topic.tasks,
-                    total_tasks=topic_total,
-                    completed_tasks=topic_completed,
-                    progress_percent=topic_progress,
-                    created_at=topic.created_at,
-                    updated_at=topic.updated_at,
-                )
+        topics = [
+            TopicResponse(
+                id=topic.id,
+                roadmap_id=topic.roadmap_id,
+                title=topic.title,
+                description=topic.description,
+                sort_order=topic.sort_order,
+                tasks=topic.tasks,
+                total_tasks=topic.total_tasks,
+                completed_tasks=topic.completed_tasks,
+                progress_percent=progress_percent(topic.completed_tasks, topic.total_tasks),
+                created_at=topic.created_at,
+                updated_at=topic.updated_at,
             )
-            total_tasks += topic_total
-            completed_tasks += topic_completed
+            for topic in roadmap.topics
+        ]
 
-        progress_percent = (completed_tasks * 100.0 / total_tasks) if total_tasks else 0.0
-        return RoadmapDetail(
+        detail = RoadmapDetail(
             id=roadmap.id,
             title=roadmap.title,
             description=roadmap.description,
@@ -116,35 +178,257 @@ class RoadmapService:
             sort_order=roadmap.sort_order,
             is_archived=roadmap.is_archived,
             topics=topics,
-            total_tasks=total_tasks,
-            completed_tasks=completed_tasks,
-            progress_percent=progress_percent,
+            total_tasks=roadmap.total_tasks,
+            completed_tasks=roadmap.completed_tasks,
+            progress_percent=progress_percent(roadmap.completed_tasks, roadmap.total_tasks),
             created_at=roadmap.created_at,
             updated_at=roadmap.updated_at,
         )
+        return detail, _detail_etag(roadmap.version, FULL_VIEW)
+
+    async def get_roadmap_detail_data(
+        self, roadmap_id: UUID, view: RoadmapDetailView = FULL_VIEW
+    ) -> tuple[dict[str, Any], str]:
+        """Same document as get_roadmap_detail, as plain dicts built from Core rows.
+
+        Columns and collections that ``view`` leaves out are not queried; they come back
+        as nulls and empty lists for ``view.exclude()`` to drop when dumping.
+        """
+        roadmap = (
+            await self.db.execute(
+                select(
+                    Roadmap.id,
+                    Roadmap.title,
+                    _text_column(Roadmap.description, view.includes("description")),
+                    Roadmap.color,
+                    Roadmap.sort_order,
+                    Roadmap.is_archived,
+                    Roadmap.total_tasks,
+                    Roadmap.completed_tasks,
+                    Roadmap.created_at,
+                    Roadmap.updated_at,
+                    Roadmap.version,
+                ).where(Roadmap.id == roadmap_id, Roadmap.deleted_at.is_(None))
+            )
+        ).mappings().one_or_none()
+        if roadmap is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Roadmap not found")
+
+        topic_rows: Sequence[RowMapping] = []
+        if view.tasks != "none":
+            topic_rows = (
+                await self.db.execute(
+                    select(
+                        Topic.id,
+                        Topic.roadmap_id,
+                        Topic.title,
+                        _text_column(Topic.description, view.includes("description")),
+                        Topic.sort_order,
+                        Topic.total_tasks,
+                        Topic.completed_tasks,
+                        Topic.created_at,
+                        Topic.updated_at,
+                    )
+                    .where(Topic.roadmap_id == roadmap_id, Topic.deleted_at.is_(None))
+                    .order_by(Topic.sort_order, Topic.id)
+                )
+            ).mappings().all()
+
+        tasks_by_topic: defaultdict[UUID, list[RowMapping]] = defaultdict(list)
+        if view.includes_tasks and topic_rows:
+            task_rows = (
+                await self.db.execute(
+                    select(
+                        *(
+                            _text_column(column, view.includes("notes")) if column.key == "notes" else column
+                            for column in task_columns
+                        )
+                    )
+                    .join(Topic, Topic.id == Task.topic_id)
+                    .where(Topic.roadmap_id == roadmap_id, Topic.deleted_at.is_(None))
+                    .order_by(Task.sort_order, Task.id)
+                )
+            ).mappings().all()
+            for task in task_rows:
+                tasks_by_topic[task["topic_id"]].append(task)
+
+        topics = [
+            {
+                **topic,
+                "tasks": tasks_by_topic[topic["id"]],
+                "progress_percent": progress_percent(topic["completed_tasks"], topic["total_tasks"]),
+            }
+            for topic in topic_rows
+        ]
+        data = {
+            **roadmap,
+            "topics": topics,
+            "progress_percent": progress_percent(roadmap["completed_tasks"], roadmap["total_tasks"]),
+        }
+        return data, _detail_etag(roadmap["version"], view)
+
+    async def get_roadmap_detail_json(
+        self, roadmap_id: UUID, view: RoadmapDetailView = FULL_VIEW
+    ) -> tuple[bytes, str]:
+        """Same document as get_roadmap_detail_data, serialized by Postgres in a single query."""
+        row = (await self.db.execute(roadmap_detail_document(roadmap_id, view))).one_or_none()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Roadmap not found")
+        document, version = row
+        return document.encode(), _detail_etag(version, view)
 
     async def create_roadmap(self, payload: RoadmapCreate) -> Roadmap:
-        roadmap = Roadmap(**payload.model_dump())
-        self.db.add(roadmap)
+        roadmap = await self.db.scalar(
+            insert(Roadmap).values(**payload.model_dump()).returning(Roadmap)
+        )
+        await publish_change(self.db, "roadmap", "created", [roadmap.id], [roadmap.id])
         await self.db.commit()
-        await self.db.refresh(roadmap)
+        await response_cache.invalidate([ROADMAP_LIST_KEY, dashboard_key()])
         return roadmap
 
-    async def update_roadmap(self, roadmap_id: UUID, payload: RoadmapUpdate) -> Roadmap:
-        roadmap = await self.db.get(Roadmap, roadmap_id)
-        if roadmap is None:
+    async def clone_roadmap(self, roadmap_id: UUID, payload: RoadmapClone) -> Roadmap:
+        """Copy a roadmap with its topics and tasks in one transaction.
+
+        The source is share-locked, which holds off every write to its tree (they all
+        update its row), so the copy and its counters are consistent. Ids for the copies
+        are generated up front; topics and tasks are then copied with one INSERT ... SELECT
+        each, joined to the old-to-new id arrays.
+        """
+        source = await self.db.scalar(
+            select(Roadmap)
+            .where(Roadmap.id == roadmap_id, Roadmap.deleted_at.is_(None))
+            .with_for_update(read=True)
+        )
+        if source is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Roadmap not found")
+        topic_ids = list(
+            await self.db.scalars(
+                select(Topic.id).where(Topic.roadmap_id == roadmap_id, Topic.deleted_at.is_(None))
+            )
+        )
+        task_ids = list(
+            await self.db.scalars(select(Task.id).where(Task.topic_id.in_(topic_ids)))
+            if topic_ids
+            else []
+        )
 
-        for field, value in payload.model_dump(exclude_unset=True).items():
-            setattr(roadmap, field, value)
+        reset = payload.reset_statuses
+        roadmap = await self.db.scalar(
+            insert(Roadmap)
+            .values(
+                id=uuid7(),
+                title=payload.title or source.title,
+                description=source.description,
+                color=source.color,
+                sort_order=source.sort_order,
+                is_archived=source.is_archived,
+                total_tasks=source.total_tasks,
+                completed_tasks=0 if reset else source.completed_tasks,
+                in_progress_tasks=0 if reset else source.in_progress_tasks,
+            )
+            .returning(Roadmap)
+        )
+        if topic_ids:
+            topic_map = _id_map("topic_map", topic_ids)
+            await self.db.execute(
+                insert(Topic).from_select(
+                    [
+                        "id",
+                        "roadmap_id",
+                        "title",
+                        "description",
+                        "sort_order",
+                        "total_tasks",
+                        "completed_tasks",
+                        "in_progress_tasks",
+                    ],
+                    select(
+                        topic_map.c.new_id,
+                        literal(roadmap.id, Uuid),
+                        Topic.title,
+                        Topic.description,
+                        Topic.sort_order,
+                        Topic.total_tasks,
+                        literal(0) if reset else Topic.completed_tasks,
+                        literal(0) if reset else Topic.in_progress_tasks,
+                    ).join(Topic, Topic.id == topic_map.c.old_id),
+                )
+            )
+        if task_ids:
+            task_map = _id_map("task_map", task_ids)
+            await self.db.execute(
+                insert(Task).from_select(
+                    ["id", "topic_id", "title", "notes", "status", "sort_order", "completed_at"],
+                    select(
+                        task_map.c.new_id,
+                        topic_map.c.new_id,
+                        Task.title,
+                        Task.notes,
+                        literal(TaskStatus.NOT_STARTED.value) if reset else Task.status,
+                        Task.sort_order,
+                        null() if reset else Task.completed_at,
+                    )
+                    .join(Task, Task.id == task_map.c.old_id)
+                    .join(topic_map, topic_map.c.old_id == Task.topic_id),
+                )
+            )
+            if not reset:
+                await record_completions(
+                    self.db, Task.topic_id.in_(select(Topic.id).where(Topic.roadmap_id == roadmap.id))
+                )
+        await publish_change(self.db, "roadmap", "created", [roadmap.id], [roadmap.id])
+        await self.db.commit()
+        await response_cache.invalidate([ROADMAP_LIST_KEY, dashboard_key()])
+        return roadmap
 
+    async def update_roadmap(self, roadmap_id: UUID, payload: RoadmapUpdate) -> Roadmap:
+        update_data = payload.model_dump(exclude_unset=True)
+        live = (Roadmap.id == roadmap_id, Roadmap.deleted_at.is_(None))
+        if not update_data:
+            roadmap = await self.db.scalar(select(Roadmap).where(*live))
+        else:
+            roadmap = await self.db.scalar(
+                update(Roadmap)
+                .where(*live)
+                .values(**update_data)
+                .returning(Roadmap)
+                .execution_options(populate_existing=True)
+            )
+        if roadmap is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Roadmap not found")
+        if update_data:
+            await publish_change(self.db, "roadmap", "updated", [roadmap_id], [roadmap_id])
         await self.db.commit()
-        await self.db.refresh(roadmap)
+        if update_data:
+            await response_cache.invalidate([ROADMAP_LIST_KEY, *roadmap_keys(roadmap_id)])
         return roadmap
 
     async def delete_roadmap(self, roadmap_id: UUID) -> None:
-        roadmap = await self.db.get(Roadmap, roadmap_id)
-        if roadmap is None:
+        """Soft-delete a roadmap and its topics; the purger removes their rows in batches.
+
+        The roadmap is marked first, locking it the way the cascade used to, so a topic
+        moved in or out concurrently is either marked here or stays live with its new roadmap.
+        """
+        deleted = await self.db.scalar(
+            update(Roadmap)
+            .where(Roadmap.id == roadmap_id, Roadmap.deleted_at.is_(None))
+            .values(deleted_at=func.now())
+            .returning(Roadmap.id)
+        )
+        if deleted is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Roadmap not found")
-        await self.db.delete(roadmap)
+        topic_ids = list(
+            await self.db.scalars(
+                update(Topic)
+                .where(Topic.roadmap_id == roadmap_id, Topic.deleted_at.is_(None))
+                .values(deleted_at=func.now())
+                .returning(Topic.id)
+            )
+        )
+        if topic_ids:
+            await retract_completions(self.db, Task.topic_id.in_(topic_ids))
+        await record_tombstones(self.db, "roadmap", [roadmap_id])
+        await publish_change(self.db, "roadmap", "deleted", [roadmap_id], [roadmap_id])
         await self.db.commit()
+        await response_cache.invalidate([ROADMAP_LIST_KEY, *roadmap_keys(roadmap_id), dashboard_key()])
+        purger.wake()
@@ -0,0 +1,426 @@
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, Integer, Uuid, cast, column, func, select, text, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, FromClause, Select, Subquery
+from sqlalchemy.types import Date
+
+from app.models import DailyCompletion, Roadmap, Task, TaskStatus, Topic
+
+roadmaps_table = Roadmap.__table__
+topics_table = Topic.__table__
+tasks_table = Task.__table__
+# Every task column but the search vector and the status bookkeeping, for Core reads of
+# whole task rows.
+task_columns = tuple(
+    column for column in tasks_table.c if column.key not in ("search_vector", "status_changed_at")
+)
+# Tasks stay in place until their soft-deleted topic is purged; reads hide them with
+# ``~task_in_deleted_topic``, a hashed NOT IN over the (small) ix_topics_deleted index.
+task_in_deleted_topic = tasks_table.c.topic_id.in_(
+    select(topics_table.c.id).where(topics_table.c.deleted_at.is_not(None))
+)
+daily_completions_table = DailyCompletion.__table__
+
+
+@dataclass(frozen=True, slots=True)
+class ProgressDelta:
+    total: int = 0
+    completed: int = 0
+    in_progress: int = 0
+
+    @classmethod
+    def for_status(cls, task_status: str, sign: int = 1) -> "ProgressDelta":
+        return cls(
+            total=sign,
+            completed=sign if task_status == TaskStatus.COMPLETED else 0,
+            in_progress=sign if task_status == TaskStatus.IN_PROGRESS else 0,
+        )
+
+    @classmethod
+    def for_transition(cls, old_status: str, new_status: str) -> "ProgressDelta":
+        return cls.for_status(new_status) + cls.for_status(old_status, sign=-1)
+
+    def __add__(self, other: "ProgressDelta") -> "ProgressDelta":
+        return ProgressDelta(
+            total=self.total + other.total,
+            completed=self.completed + other.completed,
+            in_progress=self.in_progress + other.in_progress,
+        )
+
+    def __neg__(self) -> "ProgressDelta":
+        return ProgressDelta(
+            total=-self.total, completed=-self.completed, in_progress=-self.in_progress
+        )
+
+    def __sub__(self, other: "ProgressDelta") -> "ProgressDelta":
+        return self + -other
+
+    def __bool__(self) -> bool:
+        return bool(self.total or self.completed or self.in_progress)
+
+
+def progress_percent(completed: int, total: int) -> float:
+    return (completed * 100.0 / total) if total else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class RollupDrift:
+    table: str
+    key: UUID | date
+    stored: tuple[int, ...]
+    actual: tuple[int, ...]
+
+
+async def apply_progress_deltas(
+    db: AsyncSession, deltas: Mapping[UUID, ProgressDelta]
+) -> dict[UUID, ProgressDelta]:
+    """Add per-topic deltas to the topic counters and their roadmaps' counters in one statement.
+
+    Every listed topic's roadmap is updated, which bumps its version, so callers pass a
+    zero delta for topics whose tasks changed without affecting the counters. Returns
+    the net delta applied to each roadmap.
+
+    Raises 404 when a listed topic has been deleted. Every task write goes through here
+    after writing its tasks, and the topic row lock taken here orders it against a
+    concurrent topic or roadmap delete: a write that waited on the delete rolls back.
+    """
+    rows = [
+        (topic_id, delta.total, delta.completed, delta.in_progress)
+        for topic_id, delta in deltas.items()
+    ]
+    if not rows:
+        return {}
+
+    delta_values = values(
+        column("topic_id", Uuid),
+        column("total", Integer),
+        column("completed", Integer),
+        column("in_progress", Integer),
+        name="deltas",
+    ).data(rows)
+
+    # Counter maintenance is not a user edit, so updated_at is left untouched.
+    topic_update = (
+        update(topics_table)
+        .where(topics_table.c.id == delta_values.c.topic_id, topics_table.c.deleted_at.is_(None))
+        .values(
+            total_tasks=topics_table.c.total_tasks + delta_values.c.total,
+            completed_tasks=topics_table.c.completed_tasks + delta_values.c.completed,
+            in_progress_tasks=topics_table.c.in_progress_tasks + delta_values.c.in_progress,
+            updated_at=topics_table.c.updated_at,
+        )
+        .returning(
+            topics_table.c.roadmap_id,
+            delta_values.c.total,
+            delta_values.c.completed,
+            delta_values.c.in_progress,
+        )
+        .cte("topic_update")
+    )
+    per_roadmap = (
+        select(
+            topic_update.c.roadmap_id,
+            func.sum(topic_update.c.total).label("total"),
+            func.sum(topic_update.c.completed).label("completed"),
+            func.sum(topic_update.c.in_progress).label("in_progress"),
+        )
+        .group_by(topic_update.c.roadmap_id)
+        .subquery("per_roadmap")
+    )
+    applied = (
+        await db.execute(
+            update(roadmaps_table)
+            .where(roadmaps_table.c.id == per_roadmap.c.roadmap_id)
+            .values(
+                total_tasks=roadmaps_table.c.total_tasks + per_roadmap.c.total,
+                completed_tasks=roadmaps_table.c.completed_tasks + per_roadmap.c.completed,
+                in_progress_tasks=roadmaps_table.c.in_progress_tasks + per_roadmap.c.in_progress,
+                updated_at=roadmaps_table.c.updated_at,
+            )
+            .returning(
+                roadmaps_table.c.id,
+                per_roadmap.c.total,
+                per_roadmap.c.completed,
+                per_roadmap.c.in_progress,
+                select(func.count()).select_from(topic_update).scalar_subquery().label("topics"),
+            )
+        )
+    ).all()
+    if not applied or applied[0].topics != len(rows):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
+    return {
+        roadmap_id: ProgressDelta(total=total, completed=completed, in_progress=in_progress)
+        for roadmap_id, total, completed, in_progress, _ in applied
+    }
+
+
+async def apply_roadmap_deltas(
+    db: AsyncSession, deltas: Mapping[UUID, ProgressDelta]
+) -> dict[UUID, ProgressDelta]:
+    """Add deltas straight to roadmap counters, e.g. when a topic moves between roadmaps.
+
+    As with apply_progress_deltas, a zero delta still bumps the roadmap's version.
+    Returns the deltas of the roadmaps that exist and are not deleted.
+    """
+    rows = [
+        (roadmap_id, delta.total, delta.completed, delta.in_progress)
+        for roadmap_id, delta in deltas.items()
+    ]
+    if not rows:
+        return {}
+
+    delta_values = values(
+        column("roadmap_id", Uuid),
+        column("total", Integer),
+        column("completed", Integer),
+        column("in_progress", Integer),
+        name="deltas",
+    ).data(rows)
+    applied = await db.scalars(
+        update(roadmaps_table)
+        .where(roadmaps_table.c.id == delta_values.c.roadmap_id, roadmaps_table.c.deleted_at.is_(None))
+        .values(
+            total_tasks=roadmaps_table.c.total_tasks + delta_values.c.total,
+            completed_tasks=roadmaps_table.c.completed_tasks + delta_values.c.completed,
+            in_progress_tasks=roadmaps_table.c.in_progress_tasks + delta_values.c.in_progress,
+            updated_at=roadmaps_table.c.updated_at,
+        )
+        .returning(roadmaps_table.c.id)
+    )
+    return {roadmap_id: deltas[roadmap_id] for roadmap_id in applied}
+
+
+async def detach_topic_progress(db: AsyncSession, topic_id: UUID) -> dict[UUID, ProgressDelta]:
+    """Subtract a topic's counters from its roadmap when the topic is deleted.
+
+    Returns the delta applied to the roadmap (empty when the topic does not exist).
+    """
+    applied = await db.execute(
+        update(roadmaps_table)
+        .where(
+            roadmaps_table.c.id == topics_table.c.roadmap_id,
+            topics_table.c.id == topic_id,
+        )
+        .values(
+            total_tasks=roadmaps_table.c.total_tasks - topics_table.c.total_tasks,
+            completed_tasks=roadmaps_table.c.completed_tasks - topics_table.c.completed_tasks,
+            in_progress_tasks=roadmaps_table.c.in_progress_tasks - topics_table.c.in_progress_tasks,
+            updated_at=roadmaps_table.c.updated_at,
+        )
+        .returning(
+            roadmaps_table.c.id,
+            topics_table.c.total_tasks,
+            topics_table.c.completed_tasks,
+            topics_table.c.in_progress_tasks,
+        )
+    )
+    return {
+        roadmap_id: -ProgressDelta(total=total, completed=completed, in_progress=in_progress)
+        for roadmap_id, total, completed, in_progress in applied
+    }
+
+
+async def apply_completion_deltas(
+    db: AsyncSession, deltas: Iterable[tuple[datetime | None, int]]
+) -> bool:
+    """Add ``(completed_at, delta)`` pairs to the daily_completions rollup in one upsert.
+
+    Dates are derived with the same database-side ``CAST(completed_at AS DATE)`` the
+    dashboard has always used, so the rollup buckets match a direct GROUP BY on tasks.
+    Pairs without a ``completed_at`` are ignored, so callers can pass a task's before
+    and after timestamps unconditionally. Returns whether any completion was recorded.
+    """
+    rows = [
+        (completed_at, delta)
+        for completed_at, delta in deltas
+        if completed_at is not None and delta
+    ]
+    if not rows:
+        return False
+
+    delta_values = values(
+        column("completed_at", DateTime(timezone=True)),
+        column("delta", Integer),
+        name="deltas",
+    ).data(rows)
+    completed_date = cast(delta_values.c.completed_at, Date)
+    await _upsert_daily_completions(
+        db,
+        select(completed_date, func.sum(delta_values.c.delta)).group_by(completed_date),
+    )
+    return True
+
+
+async def retract_completions(db: AsyncSession, *criteria: ColumnElement[bool]) -> bool:
+    """Remove the completions of every task matching ``criteria`` (used when deleting their parents).
+
+    Returns whether any completion was removed.
+    """
+    return await _upsert_daily_completions(db, _completions_per_day(-func.count(), criteria))
+
+
+async def record_completions(db: AsyncSession, *criteria: ColumnElement[bool]) -> bool:
+    """Add the completions of every task matching ``criteria`` (used after copying tasks in bulk).
+
+    Returns whether any completion was added.
+    """
+    return await _upsert_daily_completions(db, _completions_per_day(func.count(), criteria))
+
+
+def _completions_per_day(
+    count: ColumnElement[int], criteria: Iterable[ColumnElement[bool]]
+) -> Select[tuple[date, int]]:
+    completed_date = cast(tasks_table.c.completed_at, Date)
+    return (
+        select(completed_date, count)
+        .where(tasks_table.c.completed_at.is_not(None), *criteria)
+        .group_by(completed_date)
+    )
+
+
+async def _upsert_daily_completions(db: AsyncSession, per_day: Select[tuple[date, int]]) -> bool:
+    stmt = insert(daily_completions_table).from_select(["date", "count"], per_day)
+    upserted = await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[daily_completions_table.c.date],
+            set_={"count": daily_completions_table.c.count + stmt.excluded.count},
+        ).returning(daily_completions_table.c.date)
+    )
+    return upserted.first() is not None
+
+
+def _recount(group_column: ColumnElement[UUID], from_clause: FromClause) -> Subquery:
+    return (
+        select(
+            group_column.label("id"),
+            func.count(tasks_table.c.id).label("total"),
+            func.count(tasks_table.c.id)
+            .filter(tasks_table.c.status == TaskStatus.COMPLETED.value)
+            .label("completed"),
+            func.count(tasks_table.c.id)
+            .filter(tasks_table.c.status == TaskStatus.IN_PROGRESS.value)
+            .label("in_progress"),
+        )
+        .select_from(from_clause)
+        .group_by(group_column)
+        .subquery("actual")
+    )
+
+
+async def reconcile_rollups(db: AsyncSession, *, fix: bool) -> list[RollupDrift]:
+    """Recompute every rollup from the tasks table and report (and optionally repair) drift.
+
+    Deleted roadmaps and topics, and the tasks they still hold until purged, are left out.
+
+    With ``fix`` the tasks table is locked against writes for the duration of the
+    transaction so that concurrent task writes cannot race the recount.
+    """
+    if fix:
+        await db.execute(text("LOCK TABLE tasks IN SHARE MODE"))
+
+    drift = await _reconcile_progress_counters(db, fix=fix)
+    drift.extend(await _reconcile_daily_completions(db, fix=fix))
+
+    if fix:
+        if drift:
+            # Repairs change what the roadmap and dashboard endpoints return, so every
+            # roadmap gets a new version (and with it a new ETag).
+            await db.execute(
+                update(roadmaps_table).values(updated_at=roadmaps_table.c.updated_at)
+            )
+        await db.commit()
+    return drift
+
+
+async def _reconcile_progress_counters(db: AsyncSession, *, fix: bool) -> list[RollupDrift]:
+    drift: list[RollupDrift] = []
+    topic_tasks = topics_table.outerjoin(tasks_table, tasks_table.c.topic_id == topics_table.c.id)
+    roadmap_tasks = roadmaps_table.outerjoin(
+        topics_table,
+        (topics_table.c.roadmap_id == roadmaps_table.c.id) & topics_table.c.deleted_at.is_(None),
+    ).outerjoin(tasks_table, tasks_table.c.topic_id == topics_table.c.id)
+
+    for table, actual in (
+        (topics_table, _recount(topics_table.c.id, topic_tasks)),
+        (roadmaps_table, _recount(roadmaps_table.c.id, roadmap_tasks)),
+    ):
+        stored = (table.c.total_tasks, table.c.completed_tasks, table.c.in_progress_tasks)
+        recounted = (actual.c.total, actual.c.completed, actual.c.in_progress)
+        mismatch = (
+            (stored[0] != recounted[0])
+            | (stored[1] != recounted[1])
+            | (stored[2] != recounted[2])
+        )
+        rows = (
+            await db.execute(
+                select(table.c.id, *stored, *recounted)
+                .where(table.c.id == actual.c.id, table.c.deleted_at.is_(None), mismatch)
+                .order_by(table.c.id)
+            )
+        ).all()
+        drift.extend(
+            RollupDrift(table=table.name, key=row[0], stored=tuple(row[1:4]), actual=tuple(row[4:7]))
+            for row in rows
+        )
+
+        if fix and rows:
+            await db.execute(
+                update(table)
+                .where(table.c.id == actual.c.id, table.c.deleted_at.is_(None), mismatch)
+                .values(
+                    total_tasks=actual.c.total,
+                    completed_tasks=actual.c.completed,
+                    in_progress_tasks=actual.c.in_progress,
+                    updated_at=table.c.updated_at,
+                )
+            )
+    return drift
+
+
+async def _reconcile_daily_completions(db: AsyncSession, *, fix: bool) -> list[RollupDrift]:
+    completed_date = cast(tasks_table.c.completed_at, Date)
+    actual = (
+        select(completed_date.label("date"), func.count().label("count"))
+        .where(tasks_table.c.completed_at.is_not(None), ~task_in_deleted_topic)
+        .group_by(completed_date)
+        .subquery("actual")
+    )
+    stored_count = func.coalesce(daily_completions_table.c.count, 0)
+    actual_count = func.coalesce(actual.c.count, 0)
+    rows = (
+        await db.execute(
+            select(
+                func.coalesce(daily_completions_table.c.date, actual.c.date).label("date"),
+                stored_count,
+                actual_count,
+            )
+            .select_from(
+                daily_completions_table.join(
+                    actual, daily_completions_table.c.date == actual.c.date, full=True
+                )
+            )
+            .where(stored_count != actual_count)
+            .order_by("date")
+        )
+    ).all()
+
+    if fix and rows:
+        stmt = insert(daily_completions_table).values(
+            [{"date": row[0], "count": row[2]} for row in rows]
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[daily_completions_table.c.date],
+                set_={"count": stmt.excluded.count},
+            )
+        )
+    return [
+        RollupDrift(table=daily_completions_table.name, key=row[0], stored=(row[1],), actual=(row[2],))
+        for row in rows
+    ]
@@ -0,0 +1,154 @@
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    Row,
+    Select,
+    String,
+    Uuid,
+    and_,
+    bindparam,
+    func,
+    literal,
+    literal_column,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models import Roadmap, Task, Topic
+from app.models.base import SEARCH_CONFIG
+from app.schemas.sync import SyncKind
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.rollups import task_in_deleted_topic
+
+SEARCHED_MODELS: tuple[tuple[SyncKind, type[Roadmap] | type[Topic] | type[Task]], ...] = (
+    ("roadmap", Roadmap),
+    ("topic", Topic),
+    ("task", Task),
+)
+# Soft-deleted rows, and tasks left in deleted topics until purged, are never matched.
+LIVE_CRITERIA: dict[SyncKind, ColumnElement[bool]] = {
+    "roadmap": Roadmap.deleted_at.is_(None),
+    "topic": Topic.deleted_at.is_(None),
+    "task": ~task_in_deleted_topic,
+}
+# Matches ranked per table. Ranking reads every candidate's vector, so a term found in a
+# large share of the rows would cost time in proportion; past this many matches the best
+# ones are picked from whichever rows the scan returns first, in no defined order. The
+# ranking is then approximate, and a later page may rank a different set of candidates,
+# skipping matches the earlier pages did not reach.
+RANKED_MATCHES_PER_TABLE = 1000
+TITLE_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, HighlightAll=true"
+SNIPPET_HEADLINE_OPTIONS = (
+    'StartSel=<mark>, StopSel=</mark>, MaxWords=24, MinWords=8, MaxFragments=2, FragmentDelimiter=" … "'
+)
+
+
+@lru_cache(maxsize=None)
+def _search_statement(kinds: tuple[SyncKind, ...], paged: bool) -> Select[Any]:
+    """The search query for a set of kinds, built once and run with bound parameters.
+
+    Each table's matches come from its GIN index, capped at RANKED_MATCHES_PER_TABLE, and
+    are ranked and cut to the page size before the union; headlines are only built for
+    the rows of the page.
+    """
+    config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+    query = func.websearch_to_tsquery(config, bindparam("text", type_=String))
+    page_size = bindparam("page_size")
+    after = tuple_(
+        bindparam("after_rank", type_=Float),
+        bindparam("after_kind", type_=String),
+        bindparam("after_id", type_=Uuid),
+    )
+
+    candidates = []
+    for kind, model in SEARCHED_MODELS:
+        if kind not in kinds:
+            continue
+        found = (
+            select(model.id, model.search_vector)
+            .where(model.search_vector.op("@@")(query), LIVE_CRITERIA[kind])
+            .limit(RANKED_MATCHES_PER_TABLE)
+            .subquery(f"{kind}_matches")
+        )
+        rank = func.ts_rank(found.c.search_vector, query)
+        candidate = (
+            select(literal(kind).label("kind"), found.c.id, rank.label("rank"))
+            .order_by(rank.desc(), found.c.id.desc())
+            .limit(page_size)
+        )
+        if paged:
+            candidate = candidate.where(tuple_(rank, literal(kind), found.c.id) < after)
+        candidates.append(candidate)
+
+    matches = union_all(*candidates).subquery("matches")
+    page = (
+        select(matches)
+        .order_by(matches.c.rank.desc(), matches.c.kind.desc(), matches.c.id.desc())
+        .limit(page_size)
+        .subquery("page")
+    )
+    task_topic = aliased(Topic, name="task_topic")
+
+    def _is(kind: SyncKind, id_column: ColumnElement[UUID]) -> ColumnElement[bool]:
+        return and_(page.c.kind == kind, id_column == page.c.id)
+
+    title = func.coalesce(Roadmap.title, Topic.title, Task.title)
+    body = func.coalesce(Roadmap.description, Topic.description, Task.notes)
+    return (
+        select(
+            page.c.kind,
+            page.c.id,
+            func.coalesce(Roadmap.id, Topic.roadmap_id, task_topic.roadmap_id).label("roadmap_id"),
+            func.coalesce(Topic.id, Task.topic_id).label("topic_id"),
+            func.ts_headline(config, title, query, TITLE_HEADLINE_OPTIONS).label("title"),
+            func.ts_headline(config, body, query, SNIPPET_HEADLINE_OPTIONS).label("snippet"),
+            page.c.rank,
+        )
+        .select_from(page)
+        .outerjoin(Roadmap, _is("roadmap", Roadmap.id))
+        .outerjoin(Topic, _is("topic", Topic.id))
+        .outerjoin(Task, _is("task", Task.id))
+        .outerjoin(task_topic, task_topic.id == Task.topic_id)
+        .order_by(page.c.rank.desc(), page.c.kind.desc(), page.c.id.desc())
+    )
+
+
+class SearchService:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def search(
+        self,
+        text: str,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        kinds: Sequence[SyncKind] | None = None,
+    ) -> tuple[list[Row[Any]], str | None]:
+        """Return one page of roadmaps, topics and tasks matching ``text``, best first.
+
+        ``text`` uses web search syntax ("quoted phrases", ``or``, ``-excluded``). Pages
+        are keyed on (rank, kind, id), so the cursor resumes after the last match; past
+        RANKED_MATCHES_PER_TABLE matches in a table, ranking and paging are approximate.
+        """
+        searched = tuple(kind for kind, _ in SEARCHED_MODELS if not kinds or kind in kinds)
+        params: dict[str, Any] = {"text": text, "page_size": limit + 1}
+        if cursor is not None:
+            params["after_rank"], params["after_kind"], params["after_id"] = decode_cursor(
+                cursor, float, str, UUID
+            )
+        rows = list((await self.db.execute(_search_statement(searched, cursor is not None), params)).all())
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].rank, rows[-1].kind, rows[-1].id)
+        return rows, next_cursor
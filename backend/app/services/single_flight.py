@@ -0,0 +1,67 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class FlightStats:
+    # Computations actually run, and requests that waited on one of them instead.
+    flights: int = 0
+    coalesced: int = 0
+
+
+class _LeaderCancelled(Exception):
+    pass
+
+
+class SingleFlight(Generic[T]):
+    """Share one in-flight computation between concurrent callers with the same key.
+
+    The first caller runs ``compute``; callers arriving while it runs wait for its result
+    (or exception) instead of running their own. Nothing is kept once the call finishes.
+    If the first caller is cancelled (e.g. its client disconnected), the waiters start
+    over and one of them takes the computation on.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future[T]] = {}
+        self._stats = FlightStats()
+
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            call = self._calls.get(key)
+            if call is None:
+                return await self._lead(key, compute)
+            self._stats.coalesced += 1
+            try:
+                # Shielded so that a waiter's own cancellation leaves the call intact.
+                return await asyncio.shield(call)
+            except _LeaderCancelled:
+                self._stats.coalesced -= 1
+
+    async def _lead(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        call: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        self._stats.flights += 1
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            call.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as exc:
+            call.set_exception(exc)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+            # Waiters re-raise any exception themselves; retrieving it here keeps asyncio
+            # from logging it as never retrieved when nobody was waiting.
+            call.exception()
+
+    def stats(self) -> FlightStats:
+        return FlightStats(flights=self._stats.flights, coalesced=self._stats.coalesced)
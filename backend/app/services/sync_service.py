@@ -0,0 +1,207 @@
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, replace
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import ColumnElement, Row, Select, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models import Roadmap, Task, Tombstone, Topic
+from app.schemas.sync import SyncKind
+from app.services.pagination import after_key, decode_cursor, encode_cursor, int64
+from app.services.rollups import progress_percent, task_columns, task_in_deleted_topic
+
+DEFAULT_SYNC_PAGE_SIZE = 1000
+MAX_SYNC_PAGE_SIZE = 5000
+
+settings = get_settings()
+# A cursor whose range started longer ago than this gets a full sync: the tombstones of
+# its deletions may be gone.
+CURSOR_RETENTION = timedelta(days=settings.sync_tombstone_retention_days)
+# A tombstone is stamped with the start of its transaction, which can precede the sync
+# whose range it falls in; keeping it a day past the cursors covers such transactions.
+TOMBSTONE_RETENTION = CURSOR_RETENTION + timedelta(days=1)
+
+
+async def record_tombstones(db: AsyncSession, kind: SyncKind, ids: Sequence[UUID]) -> None:
+    """Record deleted rows for delta sync, in the deleting transaction."""
+    if ids:
+        await db.execute(insert(Tombstone), [{"kind": kind, "entity_id": entity_id} for entity_id in ids])
+
+
+# A sync returns roadmaps, then topics, then tasks, then deletions, each in (version, id)
+# order: (query, version column, key column) of each part.
+_PARTS: tuple[tuple[Select[Any], ColumnElement[int], ColumnElement[Any]], ...] = (
+    (
+        select(
+            Roadmap.id,
+            Roadmap.title,
+            Roadmap.description,
+            Roadmap.color,
+            Roadmap.sort_order,
+            Roadmap.is_archived,
+            Roadmap.total_tasks,
+            Roadmap.completed_tasks,
+            Roadmap.in_progress_tasks,
+            Roadmap.created_at,
+            Roadmap.updated_at,
+        ).where(Roadmap.deleted_at.is_(None)),
+        Roadmap.version,
+        Roadmap.id,
+    ),
+    (
+        select(
+            Topic.id,
+            Topic.roadmap_id,
+            Topic.title,
+            Topic.description,
+            Topic.sort_order,
+            Topic.total_tasks,
+            Topic.completed_tasks,
+            Topic.created_at,
+            Topic.updated_at,
+        ).where(Topic.deleted_at.is_(None)),
+        Topic.version,
+        Topic.id,
+    ),
+    (select(*task_columns).where(~task_in_deleted_topic), Task.version, Task.id),
+    (select(Tombstone.kind, Tombstone.entity_id.label("id")), Tombstone.version, Tombstone.id),
+)
+DELETIONS = len(_PARTS) - 1
+
+
+def _optional(parse: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    return lambda value: None if value is None else parse(value)
+
+
+@dataclass(frozen=True, slots=True)
+class SyncPosition:
+    """Where a sync stands: the version range it covers and the last row it returned.
+
+    ``since`` is where the range starts (0 for a full sync) and ``since_read_at`` when that
+    bound was read, in epoch seconds of the database clock. ``horizon`` ends the range
+    and stays fixed over the pages of one sync; it is None once a sync is done, so that
+    the next request starts a range at ``since`` ending at its own snapshot.
+    """
+
+    since: int
+    since_read_at: int
+    horizon: int | None = None
+    horizon_read_at: int | None = None
+    part: int = 0
+    last_version: int | None = None
+    last_key: Any = None
+
+    def encode(self) -> str:
+        return encode_cursor(
+            self.since,
+            self.since_read_at,
+            self.horizon,
+            self.horizon_read_at,
+            self.part,
+            self.last_version,
+            self.last_key,
+        )
+
+    @classmethod
+    def decode(cls, cursor: str) -> "SyncPosition":
+        optional_int = _optional(int64)
+        position = cls(
+            *decode_cursor(cursor, int64, int64, optional_int, optional_int, int64, optional_int, str)
+        )
+        unpaired = (position.horizon is None) != (position.horizon_read_at is None)
+        if unpaired or not 0 <= position.part <= DELETIONS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        if position.last_version is None:
+            return replace(position, last_key=None)
+        try:
+            last_key = int64(position.last_key) if position.part == DELETIONS else UUID(position.last_key)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+        return replace(position, last_key=last_key)
+
+
+class SyncService:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def changes(self, cursor: str | None, limit: int = DEFAULT_SYNC_PAGE_SIZE) -> dict[str, Any]:
+        """Rows created, updated or deleted after ``cursor``; every row without one.
+
+        At most ``limit`` rows a page: while ``more`` is set, the returned cursor continues
+        the same sync, and once it is not, the cursor starts the next one.
+        """
+        # Versions are transaction ids. Every transaction below this snapshot's xmin has
+        # ended, so its rows are all visible from here on; rows of transactions at or above
+        # it are left for the next sync, whose range starts at this horizon.
+        xmin, now = (
+            await self.db.execute(
+                text(
+                    "SELECT (pg_snapshot_xmin(pg_current_snapshot())::text)::bigint,"
+                    " extract(epoch FROM now())::bigint"
+                )
+            )
+        ).one()
+        position = SyncPosition(since=0, since_read_at=now) if cursor is None else SyncPosition.decode(cursor)
+        if position.since and position.since_read_at < now - CURSOR_RETENTION.total_seconds():
+            position = SyncPosition(since=0, since_read_at=now)
+        if position.horizon is None:
+            # Rows written while the pages are fetched get versions at or above the horizon:
+            # they leave this sync's range, if they were in it, for the next one.
+            position = replace(position, horizon=xmin, horizon_read_at=now)
+
+        parts: list[list[Row[Any]]] = [[] for _ in _PARTS]
+        remaining = limit
+        more = False
+        # Deletions only matter to a client that has rows from before.
+        last_part = DELETIONS if position.since else DELETIONS - 1
+        for part in range(position.part, last_part + 1):
+            query, version, key = _PARTS[part]
+            query = query.add_columns(version.label("sync_version"), key.label("sync_key")).where(
+                version >= position.since, version < position.horizon
+            )
+            if part == position.part and position.last_version is not None:
+                # The plain bound lets the (version, id) index start right at the cursor.
+                query = query.where(
+                    version >= position.last_version,
+                    after_key((version, key), (position.last_version, position.last_key)),
+                )
+            rows = (await self.db.execute(query.order_by(version, key).limit(remaining + 1))).all()
+            if len(rows) > remaining:
+                rows = rows[:remaining]
+                more = True
+                if rows:
+                    last = rows[-1]
+                    position = replace(
+                        position, part=part, last_version=last.sync_version, last_key=last.sync_key
+                    )
+                else:
+                    position = replace(position, part=part, last_version=None, last_key=None)
+            parts[part] = rows
+            remaining -= len(rows)
+            if more:
+                break
+
+        roadmap_rows, topic_rows, task_rows, deleted = parts
+        return {
+            "cursor": (
+                position.encode()
+                if more
+                else SyncPosition(since=position.horizon, since_read_at=position.horizon_read_at).encode()
+            ),
+            "full": position.since == 0,
+            "more": more,
+            "roadmaps": [
+                {**row._mapping, "progress_percent": progress_percent(row.completed_tasks, row.total_tasks)}
+                for row in roadmap_rows
+            ],
+            "topics": [
+                {**row._mapping, "progress_percent": progress_percent(row.completed_tasks, row.total_tasks)}
+                for row in topic_rows
+            ],
+            "tasks": task_rows,
+            "deleted": [row._mapping for row in deleted],
+        }
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from uuid import UUID
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import TaskEvent
+from app.models.task_event import DEFAULT_PARTITION, partition_month, partition_name
+
+logger = logging.getLogger(__name__)
+
+task_events_table = TaskEvent.__table__
+
+# Arbitrary key of the advisory lock that serializes partition maintenance across processes.
+PARTITION_LOCK_KEY = 0x7461736B
+MAINTENANCE_INTERVAL_SECONDS = 6 * 60 * 60
+MAX_RETRY_DELAY_SECONDS = 300.0
+
+
+@dataclass(frozen=True, slots=True)
+class StatusChange:
+    task_id: UUID
+    topic_id: UUID
+    from_status: str
+    to_status: str
+    # The task's status_changed_at before the change.
+    from_status_at: datetime | None
+
+
+async def record_status_changes(db: AsyncSession, changes: Iterable[StatusChange]) -> None:
+    """Append a task event per change that really moves a task to another status.
+
+    Events are stamped with the transaction time, as are the tasks' status_changed_at.
+    """
+    rows = [
+        {
+            "task_id": change.task_id,
+            "topic_id": change.topic_id,
+            "from_status": change.from_status,
+            "to_status": change.to_status,
+            "from_status_at": change.from_status_at,
+        }
+        for change in changes
+        if change.from_status != change.to_status
+    ]
+    if rows:
+        await db.execute(insert(task_events_table), rows)
+
+
+def _month(day: date, offset: int = 0) -> date:
+    index = day.year * 12 + day.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _month_start(month: date) -> datetime:
+    return datetime(month.year, month.month, 1, tzinfo=UTC)
+
+
+@dataclass(slots=True)
+class PartitionChanges:
+    created: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+
+
+async def list_partitions(db: AsyncSession) -> list[str]:
+    return list(
+        await db.scalars(
+            text(
+                "SELECT child.relname FROM pg_inherits"
+                " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+                " WHERE pg_inherits.inhparent = 'task_events'::regclass"
+                " ORDER BY child.relname"
+            )
+        )
+    )
+
+
+async def maintain_partitions(
+    db: AsyncSession, *, today: date, months_ahead: int, retention_months: int
+) -> PartitionChanges:
+    """Create the monthly partitions up to ``months_ahead`` months after this one and drop expired ones.
+
+    A partition expires once its whole month is more than ``retention_months`` months
+    back (0 keeps every partition); expired months go with a DROP TABLE, never a DELETE.
+    Runs under an advisory lock, so concurrent maintainers take turns, and commits.
+    """
+    changes = PartitionChanges()
+    await db.execute(select(func.pg_advisory_xact_lock(PARTITION_LOCK_KEY)))
+    # DDL on task_events waits for in-flight writers; give up rather than queue every
+    # later writer behind it, and try again next time.
+    await db.execute(text("SET LOCAL lock_timeout = '5s'"))
+    existing = set(await list_partitions(db))
+
+    if DEFAULT_PARTITION not in existing:
+        await db.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF task_events DEFAULT"))
+        changes.created.append(DEFAULT_PARTITION)
+    for offset in range(months_ahead + 1):
+        month = _month(today, offset)
+        name = partition_name(month)
+        if name not in existing:
+            await _create_partition(db, name, _month_start(month), _month_start(_month(month, 1)))
+            changes.created.append(name)
+
+    if retention_months > 0:
+        oldest_kept = _month(today, -retention_months)
+        for name in sorted(existing):
+            month = partition_month(name)
+            if month is not None and month < oldest_kept:
+                await db.execute(text(f"DROP TABLE {name}"))
+                changes.dropped.append(name)
+    await db.commit()
+    return changes
+
+
+async def _create_partition(db: AsyncSession, name: str, start: datetime, end: datetime) -> None:
+    in_range = "occurred_at >= :start AND occurred_at < :end"
+    bounds = {"start": start, "end": end}
+    stranded = await db.scalar(
+        text(f"SELECT EXISTS (SELECT FROM {DEFAULT_PARTITION} WHERE {in_range})"), bounds
+    )
+    if stranded:
+        # Rows the default partition caught while the month had no partition of its own
+        # would block creating it: park them, create the partition, and route them back.
+        await db.execute(text("CREATE TEMPORARY TABLE stranded_task_events (LIKE task_events)"))
+        await db.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_range} RETURNING *)"
+                " INSERT INTO stranded_task_events SELECT * FROM moved"
+            ),
+            bounds,
+        )
+    await db.execute(
+        text(
+            f"CREATE TABLE {name} PARTITION OF task_events"
+            f" FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    )
+    if stranded:
+        await db.execute(text("INSERT INTO task_events SELECT * FROM stranded_task_events"))
+        await db.execute(text("DROP TABLE stranded_task_events"))
+
+
+class PartitionMaintainer:
+    """Keeps the task_events partitions current from this process: at startup, then periodically."""
+
+    def __init__(self, months_ahead: int, retention_months: int) -> None:
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                async with SessionLocal() as db:
+                    changes = await maintain_partitions(
+                        db,
+                        today=datetime.now(UTC).date(),
+                        months_ahead=self.months_ahead,
+                        retention_months=self.retention_months,
+                    )
+            except (OSError, SQLAlchemyError) as exc:
+                logger.warning("Task event partition maintenance failed (%s); retrying in %.0fs", exc, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY_SECONDS)
+                continue
+            delay = 1.0
+            if changes.created or changes.dropped:
+                logger.info(
+                    "Task event partitions created: %s; dropped: %s",
+                    ", ".join(changes.created) or "none",
+                    ", ".join(changes.dropped) or "none",
+                )
+            await asyncio.sleep(MAINTENANCE_INTERVAL_SECONDS)
+
+
+settings = get_settings()
+partition_maintainer = PartitionMaintainer(
+    months_ahead=settings.task_event_months_ahead, retention_months=settings.task_event_retention_months
+)
@@ -1,55 +1,432 @@
+from collections import defaultdict
+from collections.abc import Sequence
 from datetime import UTC, datetime
+from typing import Any
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    Row,
+    String,
+    Text,
+    Uuid,
+    case,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+    values,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
+from uuid_utils.compat import uuid7
 
 from app.models import Task, Topic
-from app.schemas.task import TaskCreate, TaskStatus, TaskUpdate
+from app.schemas.task import (
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchOperation,
+    TaskBatchUpdate,
+    TaskCreate,
+    TaskReorder,
+    TaskStatus,
+    TaskUpdate,
+)
+from app.services.cache import response_cache, stale_keys
+from app.services.events import publish_change
+from app.services.ordering import SORT_GAP, SiblingNotFound, allocate_sort_keys
+from app.services.pagination import after_key, decode_cursor, encode_cursor, int32
+from app.services.rollups import (
+    ProgressDelta,
+    apply_completion_deltas,
+    apply_progress_deltas,
+    task_columns,
+    task_in_deleted_topic,
+    tasks_table,
+    topics_table,
+)
+from app.services.sync_service import record_tombstones
+from app.services.task_events import StatusChange, record_status_changes
+
+# Same order as the tasks in the roadmap detail; backed by the ix_tasks_topic_* indexes.
+TASK_PAGE_ORDER = (tasks_table.c.sort_order, tasks_table.c.id)
+
+
+def _status_changed_at(old_status: ColumnElement[str], new_status: Any) -> ColumnElement[datetime | None]:
+    # Restarts at the transaction time (that of the task event) only when the status moves.
+    return case((old_status == new_status, Task.status_changed_at), else_=func.now())
 
 
 class TaskService:
     def __init__(self, db: AsyncSession) -> None:
         self.db = db
 
-    async def create_task(self, topic_id: UUID, payload: TaskCreate) -> Task:
-        topic_exists = await self.db.scalar(select(Topic.id).where(Topic.id == topic_id))
-        if topic_exists is None:
+    async def list_tasks(
+        self,
+        topic_id: UUID,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        statuses: Sequence[TaskStatus] | None = None,
+        completed_from: datetime | None = None,
+        completed_to: datetime | None = None,
+    ) -> tuple[list[Row[Any]], str | None]:
+        """Return one keyset page of a topic's tasks and the cursor of the next page, if any.
+
+        Pages follow the roadmap detail order. Both completion bounds are inclusive.
+        """
+        query = (
+            select(*task_columns)
+            .where(tasks_table.c.topic_id == topic_id, ~task_in_deleted_topic)
+            .order_by(*TASK_PAGE_ORDER)
+            .limit(limit + 1)
+        )
+        if statuses:
+            query = query.where(tasks_table.c.status.in_(statuses))
+        if completed_from is not None:
+            query = query.where(tasks_table.c.completed_at >= completed_from)
+        if completed_to is not None:
+            query = query.where(tasks_table.c.completed_at <= completed_to)
+        if cursor is not None:
+            query = query.where(after_key(TASK_PAGE_ORDER, decode_cursor(cursor, int32, UUID)))
+
+        rows = list((await self.db.execute(query)).all())
+        if not rows and await self.db.scalar(
+            select(Topic.id).where(Topic.id == topic_id, Topic.deleted_at.is_(None))
+        ) is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].sort_order, rows[-1].id)
+        return rows, next_cursor
 
+    async def create_task(self, topic_id: UUID, payload: TaskCreate) -> Task:
         next_sort = (
-            await self.db.scalar(select(func.max(Task.sort_order)).where(Task.topic_id == topic_id))
-        ) or -1
-        task = Task(topic_id=topic_id, sort_order=next_sort + 1, **payload.model_dump())
-        self.db.add(task)
+            select(func.coalesce(func.max(Task.sort_order), 0) + SORT_GAP)
+            .where(Task.topic_id == topic_id)
+            .scalar_subquery()
+        )
+        fields = payload.model_dump()
+        task = await self.db.scalar(
+            insert(Task)
+            .from_select(
+                ["topic_id", "sort_order", *fields],
+                select(Topic.id, next_sort, *(literal(value) for value in fields.values())).where(
+                    Topic.id == topic_id, Topic.deleted_at.is_(None)
+                ),
+            )
+            .returning(Task)
+        )
+        if task is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
+
+        touched = await apply_progress_deltas(
+            self.db, {topic_id: ProgressDelta.for_status(TaskStatus.NOT_STARTED)}
+        )
+        await publish_change(self.db, "task", "created", [task.id], touched)
         await self.db.commit()
-        await self.db.refresh(task)
+        await response_cache.invalidate(stale_keys(touched))
         return task
 
     async def update_task(self, task_id: UUID, payload: TaskUpdate) -> Task:
-        task = await self.db.get(Task, task_id)
-        if task is None:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-
         update_data = payload.model_dump(exclude_unset=True)
-        if "status" in update_data:
-            new_status = update_data["status"]
-            if new_status == TaskStatus.COMPLETED:
-                update_data["completed_at"] = datetime.now(UTC)
+        if "status" not in update_data:
+            if not update_data:
+                task = await self.db.scalar(select(Task).where(Task.id == task_id, ~task_in_deleted_topic))
             else:
-                update_data["completed_at"] = None
+                task = await self.db.scalar(
+                    update(Task)
+                    .where(Task.id == task_id)
+                    .values(**update_data)
+                    .returning(Task)
+                    .execution_options(populate_existing=True)
+                )
+            if task is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+            touched: dict[UUID, ProgressDelta] = {}
+            if update_data:
+                touched = await apply_progress_deltas(self.db, {task.topic_id: ProgressDelta()})
+                await publish_change(self.db, "task", "updated", [task_id], touched)
+            await self.db.commit()
+            await response_cache.invalidate(stale_keys(touched))
+            return task
 
-        for field, value in update_data.items():
-            setattr(task, field, value)
+        new_status = update_data["status"]
+        if new_status == TaskStatus.COMPLETED:
+            update_data["completed_at"] = datetime.now(UTC)
+        else:
+            update_data["completed_at"] = None
+
+        # The locked subquery hands back the pre-update status for the rollups.
+        previous = (
+            select(Task.id, Task.status, Task.completed_at, Task.status_changed_at)
+            .where(Task.id == task_id)
+            .with_for_update()
+            .subquery("previous")
+        )
+        row = (
+            await self.db.execute(
+                update(Task)
+                .where(Task.id == previous.c.id)
+                .values(
+                    **update_data,
+                    status_changed_at=_status_changed_at(previous.c.status, new_status),
+                )
+                .returning(Task, previous.c.status, previous.c.completed_at, previous.c.status_changed_at)
+                .execution_options(populate_existing=True)
+            )
+        ).one_or_none()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
 
+        task, old_status, old_completed_at, old_status_changed_at = row
+        touched = await apply_progress_deltas(
+            self.db, {task.topic_id: ProgressDelta.for_transition(old_status, new_status)}
+        )
+        completions_changed = await apply_completion_deltas(
+            self.db, [(old_completed_at, -1), (task.completed_at, 1)]
+        )
+        await record_status_changes(
+            self.db, [StatusChange(task_id, task.topic_id, old_status, new_status, old_status_changed_at)]
+        )
+        await publish_change(self.db, "task", "updated", [task_id], touched)
         await self.db.commit()
-        await self.db.refresh(task)
+        await response_cache.invalidate(stale_keys(touched, dashboard=completions_changed))
         return task
 
     async def delete_task(self, task_id: UUID) -> None:
-        task = await self.db.get(Task, task_id)
-        if task is None:
+        row = (
+            await self.db.execute(
+                delete(Task)
+                .where(Task.id == task_id)
+                .returning(Task.topic_id, Task.status, Task.completed_at)
+            )
+        ).one_or_none()
+        if row is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-        await self.db.delete(task)
+
+        touched = await apply_progress_deltas(
+            self.db, {row.topic_id: ProgressDelta.for_status(row.status, sign=-1)}
+        )
+        completions_changed = await apply_completion_deltas(self.db, [(row.completed_at, -1)])
+        await record_tombstones(self.db, "task", [task_id])
+        await publish_change(self.db, "task", "deleted", [task_id], touched)
         await self.db.commit()
+        await response_cache.invalidate(stale_keys(touched, dashboard=completions_changed))
+
+    async def reorder_tasks(self, topic_id: UUID, payload: TaskReorder) -> list[Task]:
+        """Move tasks, possibly from other topics, to sit right after ``after_id`` in a topic."""
+        task_ids = payload.task_ids
+        if len(set(task_ids)) != len(task_ids) or payload.after_id in task_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="task_ids must be distinct and must not contain after_id",
+            )
+
+        try:
+            keys = await allocate_sort_keys(
+                self.db,
+                parent=topics_table,
+                parent_column=tasks_table.c.topic_id,
+                parent_id=topic_id,
+                moved_ids=task_ids,
+                after_id=payload.after_id,
+            )
+        except SiblingNotFound:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="after_id is not a task in this topic"
+            ) from None
+        if keys is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
+
+        placement = values(
+            column("id", Uuid), column("sort_order", Integer), name="placement"
+        ).data(list(zip(task_ids, keys)))
+        previous = (
+            select(Task.id, Task.topic_id, Task.status)
+            .where(Task.id.in_(task_ids))
+            .with_for_update()
+            .subquery("previous")
+        )
+        rows = (
+            await self.db.execute(
+                update(Task)
+                .where(Task.id == placement.c.id, Task.id == previous.c.id)
+                .values(topic_id=topic_id, sort_order=placement.c.sort_order)
+                .returning(Task, previous.c.topic_id, previous.c.status)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+        ).all()
+        if len(rows) != len(task_ids):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+        progress: defaultdict[UUID, ProgressDelta] = defaultdict(ProgressDelta, {topic_id: ProgressDelta()})
+        for _, old_topic_id, task_status in rows:
+            if old_topic_id != topic_id:
+                progress[old_topic_id] += ProgressDelta.for_status(task_status, sign=-1)
+                progress[topic_id] += ProgressDelta.for_status(task_status)
+        touched = await apply_progress_deltas(self.db, progress)
+        await publish_change(self.db, "task", "updated", task_ids, touched)
+        await self.db.commit()
+        await response_cache.invalidate(stale_keys(touched))
+
+        tasks = {task.id: task for task, _, _ in rows}
+        return [tasks[task_id] for task_id in task_ids]
+
+    async def apply_batch(self, operations: Sequence[TaskBatchOperation]) -> list[Task]:
+        """Apply creates, updates and deletes in one transaction with set-based statements.
+
+        Returns the created and updated tasks in operation order.
+        """
+        creates = [op for op in operations if isinstance(op, TaskBatchCreate)]
+        updates = [op for op in operations if isinstance(op, TaskBatchUpdate)]
+        deletes = [op for op in operations if isinstance(op, TaskBatchDelete)]
+
+        target_ids = [op.id for op in updates] + [op.id for op in deletes]
+        if len(set(target_ids)) != len(target_ids):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Each task may appear in at most one update or delete operation",
+            )
+
+        progress: defaultdict[UUID, ProgressDelta] = defaultdict(ProgressDelta)
+        completions: list[tuple[datetime | None, int]] = []
+        status_changes: list[StatusChange] = []
+        created_ids: list[UUID] = []
+
+        existing: dict[UUID, Task] = {}
+        if target_ids:
+            existing = {
+                task.id: task
+                for task in await self.db.scalars(
+                    select(Task).where(Task.id.in_(target_ids)).with_for_update()
+                )
+            }
+            if len(existing) != len(target_ids):
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+        if creates:
+            topic_ids = {op.topic_id for op in creates}
+            max_sort_by_topic = dict(
+                (
+                    await self.db.execute(
+                        select(Topic.id, func.max(Task.sort_order))
+                        .outerjoin(Task, Task.topic_id == Topic.id)
+                        .where(Topic.id.in_(topic_ids), Topic.deleted_at.is_(None))
+                        .group_by(Topic.id)
+                    )
+                ).all()
+            )
+            if len(max_sort_by_topic) != len(topic_ids):
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
+
+            rows = []
+            for op in creates:
+                sort_order = (max_sort_by_topic[op.topic_id] or 0) + SORT_GAP
+                max_sort_by_topic[op.topic_id] = sort_order
+                created_ids.append(uuid7())
+                rows.append(
+                    {
+                        "id": created_ids[-1],
+                        "topic_id": op.topic_id,
+                        "title": op.title,
+                        "notes": op.notes,
+                        "sort_order": sort_order,
+                    }
+                )
+                progress[op.topic_id] += ProgressDelta.for_status(TaskStatus.NOT_STARTED)
+            await self.db.execute(insert(Task), rows)
+
+        change_rows = []
+        for op in updates:
+            task = existing[op.id]
+            update_data = op.model_dump(exclude_unset=True, exclude={"op", "id"})
+            if not update_data:
+                continue
+            new_status = update_data.get("status", task.status)
+            completed_at = task.completed_at
+            progress[task.topic_id] += ProgressDelta.for_transition(task.status, new_status)
+            if "status" in update_data:
+                completed_at = datetime.now(UTC) if new_status == TaskStatus.COMPLETED else None
+                completions += [(task.completed_at, -1), (completed_at, 1)]
+                status_changes.append(
+                    StatusChange(task.id, task.topic_id, task.status, new_status, task.status_changed_at)
+                )
+            change_rows.append(
+                (
+                    op.id,
+                    update_data.get("title", task.title),
+                    update_data.get("notes", task.notes),
+                    new_status,
+                    update_data.get("sort_order", task.sort_order),
+                    completed_at,
+                )
+            )
+        if change_rows:
+            changes = values(
+                column("id", Uuid),
+                column("title", String),
+                column("notes", Text),
+                column("status", String),
+                column("sort_order", Integer),
+                column("completed_at", DateTime(timezone=True)),
+                name="changes",
+            ).data(change_rows)
+            await self.db.execute(
+                update(Task)
+                .where(Task.id == changes.c.id)
+                .values(
+                    title=changes.c.title,
+                    notes=changes.c.notes,
+                    status=changes.c.status,
+                    sort_order=changes.c.sort_order,
+                    completed_at=changes.c.completed_at,
+                    status_changed_at=_status_changed_at(Task.status, changes.c.status),
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        if deletes:
+            for op in deletes:
+                task = existing[op.id]
+                progress[task.topic_id] += ProgressDelta.for_status(task.status, sign=-1)
+                completions.append((task.completed_at, -1))
+            deleted_ids = [op.id for op in deletes]
+            await self.db.execute(
+                delete(Task).where(Task.id.in_(deleted_ids)).execution_options(synchronize_session=False)
+            )
+            await record_tombstones(self.db, "task", deleted_ids)
+
+        touched = await apply_progress_deltas(self.db, progress)
+        completions_changed = await apply_completion_deltas(self.db, completions)
+        await record_status_changes(self.db, status_changes)
+        await publish_change(self.db, "task", "created", created_ids, touched)
+        await publish_change(self.db, "task", "updated", [row[0] for row in change_rows], touched)
+        if deletes:
+            await publish_change(self.db, "task", "deleted", deleted_ids, touched)
+        await self.db.commit()
+        await response_cache.invalidate(stale_keys(touched, dashboard=completions_changed))
+
+        created = iter(created_ids)
+        result_ids = [
+            next(created) if isinstance(op, TaskBatchCreate) else op.id
+            for op in operations
+            if not isinstance(op, TaskBatchDelete)
+        ]
+        if not result_ids:
+            return []
+        tasks = {
+            task.id: task
+            for task in await self.db.scalars(
+                select(Task)
+                .where(Task.id.in_(result_ids))
+                .execution_options(populate_existing=True)
+            )
+        }
+        return [tasks[task_id] for task_id in result_ids]
@@ -1,11 +1,25 @@
+from collections import defaultdict
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import Integer, Uuid, column, func, insert, literal, select, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Roadmap, Topic
-from app.schemas.topic import TopicCreate, TopicUpdate
+from app.models import Roadmap, Task, Topic
+from app.schemas.topic import TopicCreate, TopicReorder, TopicUpdate
+from app.services.cache import response_cache, stale_keys
+from app.services.events import publish_change
+from app.services.ordering import SORT_GAP, SiblingNotFound, allocate_sort_keys
+from app.services.purge_service import purger
+from app.services.rollups import (
+    ProgressDelta,
+    apply_roadmap_deltas,
+    detach_topic_progress,
+    retract_completions,
+    roadmaps_table,
+    topics_table,
+)
+from app.services.sync_service import record_tombstones
 
 
 class TopicService:
@@ -13,33 +27,138 @@ class TopicService:
         self.db = db
 
     async def create_topic(self, roadmap_id: UUID, payload: TopicCreate) -> Topic:
-        roadmap_exists = await self.db.scalar(select(Roadmap.id).where(Roadmap.id == roadmap_id))
-        if roadmap_exists is None:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Roadmap not found")
-
         next_sort = (
-            await self.db.scalar(select(func.max(Topic.sort_order)).where(Topic.roadmap_id == roadmap_id))
-        ) or -1
-        topic = Topic(roadmap_id=roadmap_id, sort_order=next_sort + 1, **payload.model_dump())
-        self.db.add(topic)
+            select(func.coalesce(func.max(Topic.sort_order), 0) + SORT_GAP)
+            .where(Topic.roadmap_id == roadmap_id)
+            .scalar_subquery()
+        )
+        fields = payload.model_dump()
+        topic = await self.db.scalar(
+            insert(Topic)
+            .from_select(
+                ["roadmap_id", "sort_order", *fields],
+                select(Roadmap.id, next_sort, *(literal(value) for value in fields.values())).where(
+                    Roadmap.id == roadmap_id, Roadmap.deleted_at.is_(None)
+                ),
+            )
+            .returning(Topic)
+        )
+        touched = {} if topic is None else await apply_roadmap_deltas(self.db, {roadmap_id: ProgressDelta()})
+        if not touched:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Roadmap not found")
+        await publish_change(self.db, "topic", "created", [topic.id], touched)
         await self.db.commit()
-        await self.db.refresh(topic)
+        await response_cache.invalidate(stale_keys(touched, dashboard=True))
         return topic
 
     async def update_topic(self, topic_id: UUID, payload: TopicUpdate) -> Topic:
-        topic = await self.db.get(Topic, topic_id)
+        update_data = payload.model_dump(exclude_unset=True)
+        live = (Topic.id == topic_id, Topic.deleted_at.is_(None))
+        if not update_data:
+            topic = await self.db.scalar(select(Topic).where(*live))
+        else:
+            topic = await self.db.scalar(
+                update(Topic)
+                .where(*live)
+                .values(**update_data)
+                .returning(Topic)
+                .execution_options(populate_existing=True)
+            )
         if topic is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
-
-        for field, value in payload.model_dump(exclude_unset=True).items():
-            setattr(topic, field, value)
+        touched: dict[UUID, ProgressDelta] = {}
+        if update_data:
+            touched = await apply_roadmap_deltas(self.db, {topic.roadmap_id: ProgressDelta()})
+            if not touched:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
+            await publish_change(self.db, "topic", "updated", [topic_id], touched)
         await self.db.commit()
-        await self.db.refresh(topic)
+        await response_cache.invalidate(stale_keys(touched))
         return topic
 
+    async def reorder_topics(self, roadmap_id: UUID, payload: TopicReorder) -> list[Topic]:
+        """Move topics, possibly from other roadmaps, to sit right after ``after_id`` in a roadmap."""
+        topic_ids = payload.topic_ids
+        if len(set(topic_ids)) != len(topic_ids) or payload.after_id in topic_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="topic_ids must be distinct and must not contain after_id",
+            )
+
+        try:
+            keys = await allocate_sort_keys(
+                self.db,
+                parent=roadmaps_table,
+                parent_column=topics_table.c.roadmap_id,
+                parent_id=roadmap_id,
+                moved_ids=topic_ids,
+                after_id=payload.after_id,
+            )
+        except SiblingNotFound:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="after_id is not a topic in this roadmap",
+            ) from None
+        if keys is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Roadmap not found")
+
+        placement = values(
+            column("id", Uuid), column("sort_order", Integer), name="placement"
+        ).data(list(zip(topic_ids, keys)))
+        previous = (
+            select(Topic.id, Topic.roadmap_id)
+            .where(Topic.id.in_(topic_ids), Topic.deleted_at.is_(None))
+            .with_for_update()
+            .subquery("previous")
+        )
+        rows = (
+            await self.db.execute(
+                update(Topic)
+                .where(Topic.id == placement.c.id, Topic.id == previous.c.id)
+                .values(roadmap_id=roadmap_id, sort_order=placement.c.sort_order)
+                .returning(Topic, previous.c.roadmap_id)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+        ).all()
+        if len(rows) != len(topic_ids):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
+
+        progress: defaultdict[UUID, ProgressDelta] = defaultdict(ProgressDelta, {roadmap_id: ProgressDelta()})
+        for topic, old_roadmap_id in rows:
+            if old_roadmap_id != roadmap_id:
+                counters = ProgressDelta(
+                    total=topic.total_tasks,
+                    completed=topic.completed_tasks,
+                    in_progress=topic.in_progress_tasks,
+                )
+                progress[old_roadmap_id] -= counters
+                progress[roadmap_id] += counters
+        touched = await apply_roadmap_deltas(self.db, progress)
+        await publish_change(self.db, "topic", "updated", topic_ids, touched)
+        await self.db.commit()
+        await response_cache.invalidate(stale_keys(touched))
+
+        topics = {topic.id: topic for topic, _ in rows}
+        return [topics[topic_id] for topic_id in topic_ids]
+
     async def delete_topic(self, topic_id: UUID) -> None:
-        topic = await self.db.get(Topic, topic_id)
-        if topic is None:
+        """Soft-delete a topic; its tasks are removed later, in batches, by the purger.
+
+        Marking the topic first locks it, so task writes still in flight either finish
+        before the rollups below are taken or roll back (see apply_progress_deltas).
+        """
+        deleted = await self.db.scalar(
+            update(Topic)
+            .where(Topic.id == topic_id, Topic.deleted_at.is_(None))
+            .values(deleted_at=func.now())
+            .returning(Topic.id)
+        )
+        if deleted is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
-        await self.db.delete(topic)
+        touched = await detach_topic_progress(self.db, topic_id)
+        await retract_completions(self.db, Task.topic_id == topic_id)
+        await record_tombstones(self.db, "topic", [topic_id])
+        await publish_change(self.db, "topic", "deleted", [topic_id], touched)
         await self.db.commit()
+        await response_cache.invalidate(stale_keys(touched, dashboard=True))
+        purger.wake()
@@ -0,0 +1,355 @@
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+import asyncpg
+import orjson
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    RowMapping,
+    String,
+    Table,
+    Text,
+    Uuid,
+    func,
+    insert,
+    literal,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid_utils.compat import uuid7
+
+from app.models import Roadmap, Task, TaskStatus, Topic
+from app.schemas.transfer import ExportedRoadmap, ExportedTask, ExportedTopic, ExportLine
+from app.services.cache import ROADMAP_LIST_KEY, dashboard_key, response_cache
+from app.services.events import publish_change
+from app.services.rollups import record_completions
+
+# Rows per server-side cursor fetch on export (each fetch is one streamed chunk), and rows
+# per COPY into the staging tables on import: memory stays bounded by these, not by size.
+EXPORT_BATCH_ROWS = 1000
+IMPORT_BATCH_ROWS = 5000
+
+export_line_adapter: TypeAdapter[ExportedRoadmap | ExportedTopic | ExportedTask] = TypeAdapter(ExportLine)
+
+# Per-transaction staging tables the import COPYs into before merging. ``id`` is the id in
+# the file and ``new_id`` the id of the copy; the primary keys reject repeated ids.
+_staging = MetaData()
+import_topics = Table(
+    "import_topics",
+    _staging,
+    Column("id", Uuid, primary_key=True),
+    Column("new_id", Uuid, nullable=False),
+    Column("title", String(255), nullable=False),
+    Column("description", Text),
+    Column("sort_order", Integer, nullable=False),
+    Column("created_at", DateTime(timezone=True)),
+    Column("updated_at", DateTime(timezone=True)),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+import_tasks = Table(
+    "import_tasks",
+    _staging,
+    Column("id", Uuid, primary_key=True),
+    Column("new_id", Uuid, nullable=False),
+    Column("topic_id", Uuid, nullable=False),
+    Column("title", String(255), nullable=False),
+    Column("notes", Text),
+    Column("status", String(20), nullable=False),
+    Column("sort_order", Integer, nullable=False),
+    Column("completed_at", DateTime(timezone=True)),
+    Column("created_at", DateTime(timezone=True)),
+    Column("updated_at", DateTime(timezone=True)),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+# Staged records are tuples in the column order of their table.
+STAGING_TABLES = {"topic": import_topics, "task": import_tasks}
+
+
+def _line(kind: str, row: RowMapping) -> bytes:
+    # asyncpg's UUIDs are not uuid.UUID instances as far as orjson is concerned.
+    return orjson.dumps(
+        {"type": kind, **row}, default=str, option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE
+    )
+
+
+async def _numbered_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, bytes]]:
+    number, pending = 0, b""
+    async for chunk in chunks:
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            number += 1
+            if line.strip():
+                yield number, line
+    if pending.strip():
+        yield number + 1, pending
+
+
+def _invalid(number: int, message: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Line {number}: {message}")
+
+
+class TransferService:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def export_roadmap(self, roadmap_id: UUID) -> AsyncIterator[bytes]:
+        """Yield a roadmap as NDJSON: the roadmap, its topics, then their tasks.
+
+        Topics and tasks come off server-side cursors, EXPORT_BATCH_ROWS lines per chunk,
+        all read from one repeatable-read snapshot. Raises 404 from the first chunk.
+        """
+        await self.db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        roadmap = (
+            await self.db.execute(
+                select(
+                    Roadmap.id,
+                    Roadmap.title,
+                    Roadmap.description,
+                    Roadmap.color,
+                    Roadmap.sort_order,
+                    Roadmap.is_archived,
+                    Roadmap.created_at,
+                    Roadmap.updated_at,
+                ).where(Roadmap.id == roadmap_id, Roadmap.deleted_at.is_(None))
+            )
+        ).mappings().one_or_none()
+        if roadmap is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Roadmap not found")
+        yield _line("roadmap", roadmap)
+
+        live_topics = (Topic.roadmap_id == roadmap_id, Topic.deleted_at.is_(None))
+        for kind, query in (
+            (
+                "topic",
+                select(
+                    Topic.id,
+                    Topic.title,
+                    Topic.description,
+                    Topic.sort_order,
+                    Topic.created_at,
+                    Topic.updated_at,
+                )
+                .where(*live_topics)
+                .order_by(Topic.sort_order, Topic.id),
+            ),
+            (
+                "task",
+                select(
+                    Task.id,
+                    Task.topic_id,
+                    Task.title,
+                    Task.notes,
+                    Task.status,
+                    Task.sort_order,
+                    Task.completed_at,
+                    Task.created_at,
+                    Task.updated_at,
+                )
+                .join(Topic, Topic.id == Task.topic_id)
+                .where(*live_topics)
+                .order_by(Task.topic_id, Task.sort_order, Task.id),
+            ),
+        ):
+            result = await self.db.stream(query.execution_options(yield_per=EXPORT_BATCH_ROWS))
+            async for rows in result.mappings().partitions():
+                yield b"".join(_line(kind, row) for row in rows)
+
+    async def import_roadmap(self, chunks: AsyncIterable[bytes]) -> Roadmap:
+        """Create a roadmap from an NDJSON export, streamed in as ``chunks``.
+
+        Lines are validated as they arrive and COPYed into temporary staging tables in
+        batches; one INSERT ... SELECT per table then merges them under new uuid7 ids, in
+        the same transaction, so a bad line anywhere imports nothing. Completed tasks
+        without a completed_at get the import time, and other tasks lose theirs.
+        """
+        connection = await self.db.connection()
+        await connection.run_sync(_staging.create_all, checkfirst=False)
+        driver = (await connection.get_raw_connection()).driver_connection
+
+        roadmap: ExportedRoadmap | None = None
+        topics: list[tuple[Any, ...]] = []
+        tasks: list[tuple[Any, ...]] = []
+        total = completed = in_progress = 0
+        now = datetime.now(UTC)
+
+        async def flush(kind: str, records: list[tuple[Any, ...]]) -> None:
+            table = STAGING_TABLES[kind]
+            try:
+                await driver.copy_records_to_table(
+                    table.name, records=records, columns=[column.key for column in table.c]
+                )
+            except asyncpg.UniqueViolationError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail=f"The import repeats a {kind} id"
+                ) from None
+            records.clear()
+
+        async for number, line in _numbered_lines(chunks):
+            try:
+                item = export_line_adapter.validate_json(line)
+            except ValidationError as exc:
+                error = exc.errors()[0]
+                location = ".".join(str(part) for part in error["loc"])
+                message = f"{location}: {error['msg']}" if location else error["msg"]
+                raise _invalid(number, message) from None
+            if isinstance(item, ExportedTask):
+                is_completed = item.status == TaskStatus.COMPLETED
+                tasks.append(
+                    (
+                        item.id,
+                        uuid7(),
+                        item.topic_id,
+                        item.title,
+                        item.notes,
+                        item.status.value,
+                        item.sort_order,
+                        (item.completed_at or now) if is_completed else None,
+                        item.created_at,
+                        item.updated_at,
+                    )
+                )
+                total += 1
+                completed += is_completed
+                in_progress += item.status == TaskStatus.IN_PROGRESS
+                if len(tasks) >= IMPORT_BATCH_ROWS:
+                    await flush("task", tasks)
+            elif isinstance(item, ExportedTopic):
+                topics.append(
+                    (
+                        item.id,
+                        uuid7(),
+                        item.title,
+                        item.description,
+                        item.sort_order,
+                        item.created_at,
+                        item.updated_at,
+                    )
+                )
+                if len(topics) >= IMPORT_BATCH_ROWS:
+                    await flush("topic", topics)
+            elif roadmap is None:
+                roadmap = item
+            else:
+                raise _invalid(number, "only one roadmap can be imported at a time")
+        if roadmap is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="The import has no roadmap line"
+            )
+        for kind, records in (("topic", topics), ("task", tasks)):
+            if records:
+                await flush(kind, records)
+
+        return await self._merge(roadmap, total=total, completed=completed, in_progress=in_progress)
+
+    async def _merge(
+        self, roadmap: ExportedRoadmap, *, total: int, completed: int, in_progress: int
+    ) -> Roadmap:
+        timestamps = {
+            key: value
+            for key, value in (("created_at", roadmap.created_at), ("updated_at", roadmap.updated_at))
+            if value is not None
+        }
+        created = await self.db.scalar(
+            insert(Roadmap)
+            .values(
+                id=uuid7(),
+                title=roadmap.title,
+                description=roadmap.description,
+                color=roadmap.color,
+                sort_order=roadmap.sort_order,
+                is_archived=roadmap.is_archived,
+                total_tasks=total,
+                completed_tasks=completed,
+                in_progress_tasks=in_progress,
+                **timestamps,
+            )
+            .returning(Roadmap)
+        )
+
+        task_status = import_tasks.c.status
+        counts = (
+            select(
+                import_tasks.c.topic_id,
+                func.count().label("total"),
+                func.count().filter(task_status == TaskStatus.COMPLETED.value).label("completed"),
+                func.count().filter(task_status == TaskStatus.IN_PROGRESS.value).label("in_progress"),
+            )
+            .group_by(import_tasks.c.topic_id)
+            .subquery("counts")
+        )
+        await self.db.execute(
+            insert(Topic).from_select(
+                [
+                    "id",
+                    "roadmap_id",
+                    "title",
+                    "description",
+                    "sort_order",
+                    "total_tasks",
+                    "completed_tasks",
+                    "in_progress_tasks",
+                    "created_at",
+                    "updated_at",
+                ],
+                select(
+                    import_topics.c.new_id,
+                    literal(created.id, Uuid),
+                    import_topics.c.title,
+                    import_topics.c.description,
+                    import_topics.c.sort_order,
+                    func.coalesce(counts.c.total, 0),
+                    func.coalesce(counts.c.completed, 0),
+                    func.coalesce(counts.c.in_progress, 0),
+                    func.coalesce(import_topics.c.created_at, func.now()),
+                    func.coalesce(import_topics.c.updated_at, func.now()),
+                ).outerjoin(counts, counts.c.topic_id == import_topics.c.id),
+            )
+        )
+        merged = await self.db.execute(
+            insert(Task).from_select(
+                [
+                    "id",
+                    "topic_id",
+                    "title",
+                    "notes",
+                    "status",
+                    "sort_order",
+                    "completed_at",
+                    "created_at",
+                    "updated_at",
+                ],
+                select(
+                    import_tasks.c.new_id,
+                    import_topics.c.new_id,
+                    import_tasks.c.title,
+                    import_tasks.c.notes,
+                    import_tasks.c.status,
+                    import_tasks.c.sort_order,
+                    import_tasks.c.completed_at,
+                    func.coalesce(import_tasks.c.created_at, func.now()),
+                    func.coalesce(import_tasks.c.updated_at, func.now()),
+                ).join(import_topics, import_topics.c.id == import_tasks.c.topic_id),
+            )
+        )
+        if merged.rowcount != total:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{total - merged.rowcount} task(s) reference a topic that is not in the import",
+            )
+        if completed:
+            await record_completions(
+                self.db, Task.topic_id.in_(select(Topic.id).where(Topic.roadmap_id == created.id))
+            )
+        await publish_change(self.db, "roadmap", "created", [created.id], [created.id])
+        await self.db.commit()
+        await response_cache.invalidate([ROADMAP_LIST_KEY, dashboard_key()])
+        return created
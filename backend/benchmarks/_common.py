@@ -0,0 +1,107 @@
+"""Helpers shared by the benchmarks: throwaway roadmaps, a uvicorn server to drive, percentiles."""
+import asyncio
+import contextlib
+import socket
+import subprocess
+import sys
+from collections.abc import Mapping
+from uuid import UUID
+
+from sqlalchemy import delete, select, text
+
+from app.database import SessionLocal
+from app.models import Roadmap, Task, Topic
+from app.services.rollups import record_completions, retract_completions
+
+HOST = "127.0.0.1"
+
+
+async def seed_roadmap(title: str, tasks: int, topics: int = 1, *, statuses: bool = False) -> UUID:
+    """Insert a roadmap of ``topics`` topics holding ``tasks`` tasks between them, in one statement.
+
+    The tasks are not started, or with ``statuses`` a third each not started, in progress
+    and completed; the completed ones are counted in the daily rollup, as the services
+    would, and ``cleanup`` takes them out again.
+    """
+    async with SessionLocal() as db:
+        roadmap_id = await db.scalar(
+            text(
+                """
+                WITH roadmap AS (
+                    INSERT INTO roadmaps (id, title) VALUES (gen_random_uuid(), :title)
+                    RETURNING id
+                ), topic AS (
+                    INSERT INTO topics (id, roadmap_id, title, sort_order)
+                    SELECT gen_random_uuid(), roadmap.id, :title || ' topic ' || n, n
+                    FROM roadmap, generate_series(1, :topics) n
+                    RETURNING id, sort_order
+                ), task AS (
+                    INSERT INTO tasks (id, topic_id, title, notes, status, completed_at, sort_order)
+                    SELECT gen_random_uuid(), topic.id, 'lesson ' || n, 'notes for lesson ' || n,
+                           CASE WHEN :statuses
+                                THEN (ARRAY['not_started', 'in_progress', 'completed'])[n % 3 + 1]
+                                ELSE 'not_started' END,
+                           CASE WHEN :statuses AND n % 3 = 2 THEN now() END, n
+                    FROM generate_series(1, :tasks) n
+                    JOIN topic ON topic.sort_order = n % :topics + 1
+                )
+                SELECT id FROM roadmap
+                """
+            ),
+            {"title": title, "tasks": tasks, "topics": topics, "statuses": statuses},
+        )
+        if statuses:
+            await record_completions(
+                db, Task.topic_id.in_(select(Topic.id).where(Topic.roadmap_id == roadmap_id))
+            )
+        await db.commit()
+        return roadmap_id
+
+
+async def cleanup(title_prefix: str) -> None:
+    """Delete the roadmaps whose title starts with ``title_prefix``, and everything in them."""
+    live_topics = (
+        select(Topic.id)
+        .join(Roadmap, Topic.roadmap_id == Roadmap.id)
+        .where(Roadmap.title.startswith(title_prefix), Topic.deleted_at.is_(None))
+    )
+    async with SessionLocal() as db:
+        # The hard delete bypasses the services, so the completions of the live tasks come
+        # out of daily_completions here (deleted topics had theirs taken out already).
+        await retract_completions(db, Task.topic_id.in_(live_topics))
+        await db.execute(delete(Roadmap).where(Roadmap.title.startswith(title_prefix)))
+        await db.commit()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def start_server(
+    port: int, *, workers: int = 1, env: Mapping[str, str] | None = None
+) -> subprocess.Popen[bytes]:
+    """Start uvicorn serving the app on ``port``; ``env`` replaces the environment if given."""
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", HOST, "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+
+
+async def wait_for_server(host: str, port: int, process: subprocess.Popen[bytes]) -> None:
+    for _ in range(300):
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        with contextlib.suppress(OSError):
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        await asyncio.sleep(0.1)
+    raise RuntimeError("uvicorn did not start")
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
@@ -0,0 +1,146 @@
+"""A burst of cheap reads and bulk exports against a small pool, with and without admission control.
+
+Starts one uvicorn worker per run with a pool of --pool-size connections and the
+response cache off, then for --seconds keeps --exporters clients streaming the export
+of a large roadmap and --readers clients reading the detail of a small one. Without
+admission control every request queues inside the pool behind the exports; with it
+the reads are let in first and the surplus is turned away with a 503 at once. Reports,
+per kind of request, the responses by status and the latency of the successful ones
+and of the 503s.
+
+Seeds two throwaway roadmaps into DATABASE_URL and deletes them afterwards:
+
+    uv run python -m benchmarks.admission --pool-size 4 --readers 100 --exporters 20 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from collections import Counter
+from uuid import UUID
+
+from app.config import get_settings
+from app.database import engine
+from benchmarks._common import (
+    HOST,
+    cleanup,
+    free_port,
+    percentile,
+    seed_roadmap,
+    start_server,
+    wait_for_server,
+)
+
+TITLE_PREFIX = "benchmark:admission"
+
+
+class Results:
+    def __init__(self) -> None:
+        self.statuses: Counter[int] = Counter()
+        self.ok: list[float] = []
+        self.busy: list[float] = []
+
+
+async def _get(host: str, port: int, path: str, api_key: str) -> int:
+    """GET ``path`` and read the whole response; returns its status."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        # HTTP/1.0: the response ends when the server closes the connection.
+        writer.write(f"GET {path} HTTP/1.0\r\nHost: {host}\r\nX-API-Key: {api_key}\r\n\r\n".encode())
+        status_line = await reader.readline()
+        while await reader.read(65536):
+            pass
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def _client(host: str, port: int, path: str, api_key: str, until: float, results: Results) -> None:
+    while time.perf_counter() < until:
+        started = time.perf_counter()
+        try:
+            status = await _get(host, port, path, api_key)
+        except OSError:
+            status = 0
+        elapsed = time.perf_counter() - started
+        results.statuses[status] += 1
+        if status == 200:
+            results.ok.append(elapsed)
+        elif status == 503:
+            results.busy.append(elapsed)
+            # What a client honouring Retry-After would do, shortened to keep the load up.
+            await asyncio.sleep(0.1)
+
+
+def _report(name: str, results: Results, seconds: float) -> None:
+    statuses = "  ".join(f"{status or 'error'}={count}" for status, count in sorted(results.statuses.items()))
+    print(f"  {name:<8} {statuses}  ({results.statuses[200] / seconds:.0f} ok/s)")
+    for label, samples in (("ok", results.ok), ("503", results.busy)):
+        if samples:
+            print(
+                f"  {'':<8} {label:<4} p50={statistics.median(samples) * 1e3:.1f} ms"
+                f"  p99={percentile(samples, 0.99) * 1e3:.1f} ms  max={max(samples) * 1e3:.1f} ms"
+            )
+
+
+async def _run(args: argparse.Namespace, enabled: bool, small_id: UUID, large_id: UUID) -> None:
+    host, port = HOST, free_port()
+    env = {
+        **os.environ,
+        "DB_POOL_SIZE": str(args.pool_size),
+        "DB_MAX_OVERFLOW": "0",
+        "RESPONSE_CACHE_MAX_ENTRIES": "0",
+        # As many slots as connections, the default.
+        "ADMISSION_MAX_ACTIVE": str(args.pool_size if enabled else 0),
+        "ADMISSION_MAX_QUEUED": str(args.max_queued),
+        "ADMISSION_QUEUE_TIMEOUT_SECONDS": str(args.queue_timeout),
+    }
+    process = start_server(port, env=env)
+    try:
+        await wait_for_server(host, port, process)
+        api_key = get_settings().api_key
+        reads, exports = Results(), Results()
+        until = time.perf_counter() + args.seconds
+        await asyncio.gather(
+            *(
+                _client(host, port, f"/api/roadmaps/{small_id}", api_key, until, reads)
+                for _ in range(args.readers)
+            ),
+            *(
+                _client(host, port, f"/api/roadmaps/{large_id}/export", api_key, until, exports)
+                for _ in range(args.exporters)
+            ),
+        )
+        print(f"admission {'on' if enabled else 'off'}, pool of {args.pool_size}:")
+        _report("reads", reads, args.seconds)
+        _report("exports", exports, args.seconds)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=100, help="clients reading a small roadmap")
+    parser.add_argument("--exporters", type=int, default=20, help="clients exporting a large roadmap")
+    parser.add_argument("--tasks", type=int, default=20000, help="tasks in the exported roadmap")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--max-queued", type=int, default=50)
+    parser.add_argument("--queue-timeout", type=float, default=2.0)
+    args = parser.parse_args()
+
+    await cleanup(TITLE_PREFIX)
+    small_id = await seed_roadmap(f"{TITLE_PREFIX}:small", 10)
+    large_id = await seed_roadmap(f"{TITLE_PREFIX}:large", args.tasks)
+    try:
+        for enabled in (False, True):
+            await _run(args, enabled, small_id, large_id)
+    finally:
+        await cleanup(TITLE_PREFIX)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
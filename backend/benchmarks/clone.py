@@ -0,0 +1,53 @@
+"""Time of POST /api/roadmaps/{id}:clone's service call, by the size of the source roadmap.
+
+Each sample clones a seeded roadmap in a fresh session, as a request would, alternately
+keeping and resetting task statuses.
+
+Seeds throwaway roadmaps into DATABASE_URL and deletes them, and every copy, afterwards:
+
+    uv run python -m benchmarks.clone --tasks 1000 10000 50000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.database import SessionLocal, engine
+from app.schemas.roadmap import RoadmapClone
+from app.services.roadmap_service import RoadmapService
+from benchmarks._common import cleanup, seed_roadmap
+
+TITLE_PREFIX = "benchmark:clone"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    await cleanup(TITLE_PREFIX)
+    try:
+        for tasks in args.tasks:
+            roadmap_id = await seed_roadmap(TITLE_PREFIX, tasks, args.topics)
+            samples = []
+            for index in range(args.repeat + 1):
+                payload = RoadmapClone(title=f"{TITLE_PREFIX}:copy", reset_statuses=bool(index % 2))
+                async with SessionLocal() as db:
+                    started = time.perf_counter()
+                    await RoadmapService(db).clone_roadmap(roadmap_id, payload)
+                    if index:  # the first run warms the statement caches
+                        samples.append(time.perf_counter() - started)
+            print(
+                f"tasks={tasks:<7} topics={args.topics:<5}"
+                f"  best={min(samples) * 1e3:7.1f} ms  median={statistics.median(samples) * 1e3:7.1f} ms"
+            )
+            await cleanup(TITLE_PREFIX)
+    finally:
+        await cleanup(TITLE_PREFIX)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,174 @@
+"""Fan-out of /api/events to many simulated subscribers.
+
+Opens ``--subscribers`` SSE connections to a running server (or to one it starts with
+``--workers``), creates ``--writes`` tasks through the service layer, and reports how
+many task.created events reached every subscriber and how long after the start of each
+write they arrived.
+``--slow`` of the subscribers stop reading while the writes run, to show them being
+resynced instead of buffering without bound.
+
+Seeds a throwaway roadmap into DATABASE_URL and deletes it afterwards:
+
+    uv run python -m benchmarks.events --workers 4 --subscribers 1000 --writes 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import AsyncIterator
+from urllib.parse import urlsplit
+
+import orjson
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.database import SessionLocal, engine
+from app.models import Topic
+from app.schemas.task import TaskCreate
+from app.services.task_service import TaskService
+from benchmarks._common import (
+    HOST,
+    cleanup,
+    free_port,
+    percentile,
+    seed_roadmap,
+    start_server,
+    wait_for_server,
+)
+
+TITLE_PREFIX = "benchmark:events"
+
+
+class Subscriber:
+    def __init__(self, slow: bool) -> None:
+        self.slow = slow
+        self.ready = asyncio.Event()
+        self.paused = asyncio.Event()
+        self.received: dict[str, float] = {}
+        self.resyncs = 0
+
+    async def run(self, host: str, port: int, api_key: str) -> None:
+        reader, writer = await asyncio.open_connection(host, port)
+        # HTTP/1.0 keeps the body unchunked: frames arrive as plain lines until close.
+        writer.write(f"GET /api/events?api_key={api_key} HTTP/1.0\r\nHost: {host}\r\n\r\n".encode())
+        try:
+            status_line = await reader.readline()
+            if b" 200 " not in status_line:
+                raise RuntimeError(f"subscribe failed: {status_line.decode().strip()}")
+            while (await reader.readline()).strip():
+                pass
+            async for event, data in _frames(reader):
+                if event == "ready":
+                    self.ready.set()
+                    if self.slow:
+                        await self.paused.wait()
+                elif event == "resync":
+                    self.resyncs += 1
+                elif event == "task.created":
+                    received = time.perf_counter()
+                    for task_id in orjson.loads(data)["ids"]:
+                        self.received.setdefault(task_id, received)
+        finally:
+            writer.close()
+
+
+async def _frames(reader: asyncio.StreamReader) -> AsyncIterator[tuple[str, str]]:
+    event, data = "message", ""
+    while line := await reader.readline():
+        line = line.rstrip(b"\r\n")
+        if not line:
+            yield event, data
+            event, data = "message", ""
+        elif line.startswith(b"event: "):
+            event = line[7:].decode()
+        elif line.startswith(b"data: "):
+            data = line[6:].decode()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="running server, e.g. http://127.0.0.1:8000")
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn workers to start without --url")
+    parser.add_argument("--subscribers", type=int, default=500)
+    parser.add_argument("--slow", type=int, default=0, help="subscribers that stop reading during the writes")
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds to wait for delivery")
+    args = parser.parse_args()
+
+    process = None
+    if args.url is None:
+        host, port = HOST, free_port()
+        process = start_server(port, workers=args.workers)
+    else:
+        url = urlsplit(args.url)
+        host, port = url.hostname or HOST, url.port or 80
+
+    subscribers = [Subscriber(slow=index < args.slow) for index in range(args.subscribers)]
+    tasks: list[asyncio.Task[None]] = []
+    await cleanup(TITLE_PREFIX)
+    roadmap_id = await seed_roadmap(TITLE_PREFIX, tasks=0)
+    async with SessionLocal() as db:
+        topic_id = await db.scalar(select(Topic.id).where(Topic.roadmap_id == roadmap_id))
+    try:
+        if process is not None:
+            await wait_for_server(host, port, process)
+        api_key = get_settings().api_key
+        tasks = [asyncio.create_task(subscriber.run(host, port, api_key)) for subscriber in subscribers]
+        ready = asyncio.gather(*(subscriber.ready.wait() for subscriber in subscribers))
+        await asyncio.wait([ready, *tasks], return_when=asyncio.FIRST_COMPLETED)
+        for task in tasks:
+            if task.done():
+                task.result()
+        print(f"subscribers  {len(subscribers)} connected ({args.slow} slow)")
+
+        committed: dict[str, float] = {}
+        started = time.perf_counter()
+        for index in range(args.writes):
+            # Latency runs from the start of the write: the event can beat create_task's return.
+            write_started = time.perf_counter()
+            async with SessionLocal() as db:
+                payload = TaskCreate(title=f"{TITLE_PREFIX}:{index}")
+                created = await TaskService(db).create_task(topic_id, payload)
+            committed[str(created.id)] = write_started
+        write_seconds = time.perf_counter() - started
+
+        fast = [subscriber for subscriber in subscribers if not subscriber.slow]
+        deadline = time.perf_counter() + args.timeout
+        while time.perf_counter() < deadline and any(len(s.received) < len(committed) for s in fast):
+            await asyncio.sleep(0.05)
+        for subscriber in subscribers:
+            subscriber.paused.set()
+        await asyncio.sleep(0.5)
+
+        latencies = [
+            received - committed[task_id]
+            for subscriber in fast
+            for task_id, received in subscriber.received.items()
+            if task_id in committed
+        ]
+        delivered = len(latencies)
+        expected = len(fast) * len(committed)
+        print(f"writes       {len(committed)} in {write_seconds:.2f}s")
+        print(f"delivered    {delivered}/{expected} to fast subscribers")
+        if latencies:
+            print(
+                f"latency      p50={statistics.median(latencies) * 1e3:.1f} ms"
+                f"  p99={percentile(latencies, 0.99) * 1e3:.1f} ms  max={max(latencies) * 1e3:.1f} ms"
+            )
+        print(
+            f"resyncs      fast={sum(s.resyncs for s in fast)}"
+            f"  slow={sum(s.resyncs for s in subscribers if s.slow)}"
+        )
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await cleanup(TITLE_PREFIX)
+        await engine.dispose()
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
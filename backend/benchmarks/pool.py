@@ -0,0 +1,77 @@
+"""Throughput and checkout waits of one worker's connection pool, by pool profile, size and load.
+
+Each run builds a fresh engine from a profile in app.config.POOL_PROFILES, with its pool
+size (and no overflow) taken from --sizes, and starts --concurrency simulated requests
+at once. Each request opens a session, runs a small query and keeps the connection for
+--hold-ms more, standing in for the rest of a request's work. It reports requests/s and
+the mean and worst checkout wait, from the same counters as /health/pool. The worst wait
+includes opening the connection, so the first run of a pool pays for its connects.
+
+Only reads; touches no rows:
+
+    uv run python -m benchmarks.pool --profiles direct transaction_pooler --sizes 5 10 20 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+from dataclasses import replace
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import POOL_PROFILES, get_settings
+from app.database import build_engine, pool_stats
+
+
+async def _run(profile_name: str, size: int, concurrency: int, requests: int, hold: float) -> None:
+    profile = replace(POOL_PROFILES[profile_name], pool_size=size, max_overflow=0, pool_timeout=60.0)
+    engine = build_engine(get_settings().database_url, profile)
+    sessions = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def request() -> None:
+        async with sessions() as db:
+            await db.scalar(select(1))
+            await asyncio.sleep(hold)
+
+    async def client(count: int) -> None:
+        for _ in range(count):
+            await request()
+
+    try:
+        # Open every connection once, so the timed runs measure waiting, not connecting.
+        await asyncio.gather(*(request() for _ in range(size)))
+        before = pool_stats(engine)
+        started = time.perf_counter()
+        await asyncio.gather(*(client(requests) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        after = pool_stats(engine)
+    finally:
+        await engine.dispose()
+
+    checkouts = after.checkouts - before.checkouts
+    print(
+        f"{profile_name:<19} pool={size:<4} concurrency={concurrency:<5}"
+        f"  {checkouts / elapsed:8.0f} req/s"
+        f"  wait mean={(after.wait_seconds - before.wait_seconds) / checkouts * 1e3:7.2f} ms"
+        f"  max={after.max_wait_seconds * 1e3:7.1f} ms"
+        f"  pings={after.pings - before.pings}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", nargs="+", choices=sorted(POOL_PROFILES), default=["direct"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 20])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--requests", type=int, default=50, help="requests per simulated client")
+    parser.add_argument("--hold-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    for profile_name in args.profiles:
+        for size in args.sizes:
+            for concurrency in args.concurrency:
+                await _run(profile_name, size, concurrency, args.requests, args.hold_ms / 1e3)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
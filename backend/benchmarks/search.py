@@ -0,0 +1,99 @@
+"""Latency of GET /api/search's query at scale, by how many rows a term matches.
+
+Task titles are built from terms of known frequency: ``c<n>`` is in 10% of tasks,
+``m<n>`` in 0.1% and ``r<n>`` in ten of them, so each query shows how the cost grows
+with the number of rows the GIN index returns for ranking. Each sample uses a fresh
+session, as a request would.
+
+Seeds a throwaway roadmap into DATABASE_URL and deletes it afterwards:
+
+    uv run python -m benchmarks.search --tasks 1000000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.database import SessionLocal, engine
+from app.services.search_service import SearchService
+from benchmarks._common import cleanup
+
+TITLE_PREFIX = "benchmark:search"
+QUERIES = (
+    ("rare (10 rows)", "r4242"),
+    ("medium (0.1%)", "m42"),
+    ("phrase", '"m42 r4242"'),
+    ("two terms", "m42 m43"),
+    ("either term", "m42 or m43"),
+    ("common (10%)", "c3"),
+)
+
+
+async def _seed(tasks: int, topics: int) -> None:
+    async with SessionLocal() as db:
+        await db.execute(
+            text(
+                """
+                WITH roadmap AS (
+                    INSERT INTO roadmaps (id, title) VALUES (gen_random_uuid(), :title) RETURNING id
+                ), topic AS (
+                    INSERT INTO topics (id, roadmap_id, title, sort_order)
+                    SELECT gen_random_uuid(), roadmap.id, :title || ' topic ' || n, n FROM roadmap, generate_series(1, :topics) n
+                    RETURNING id, sort_order
+                )
+                INSERT INTO tasks (id, topic_id, title, notes, sort_order)
+                SELECT gen_random_uuid(),
+                       topic.id,
+                       format('lesson c%s m%s r%s', n % 10, n % 1000, n % (:tasks / 10)),
+                       CASE WHEN n % 4 = 0 THEN format('practice notes for m%s', (n + 1) % 1000) END,
+                       n
+                FROM generate_series(1, :tasks) n
+                JOIN topic ON topic.sort_order = n % :topics + 1
+                """
+            ),
+            {"title": TITLE_PREFIX, "tasks": tasks, "topics": topics},
+        )
+        await db.commit()
+    # Vacuum as autovacuum would after a bulk load: it also merges the GIN pending lists.
+    async with engine.connect() as connection:
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(text("VACUUM ANALYZE tasks"))
+        await connection.execute(text("VACUUM ANALYZE topics"))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--topics", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=20, help="page size")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    await cleanup(TITLE_PREFIX)
+    started = time.perf_counter()
+    await _seed(args.tasks, args.topics)
+    print(f"seeded {args.tasks} tasks in {time.perf_counter() - started:.1f}s")
+    try:
+        for label, query in QUERIES:
+            samples = []
+            for index in range(args.repeat + 1):
+                async with SessionLocal() as db:
+                    sample_started = time.perf_counter()
+                    results, next_cursor = await SearchService(db).search(query, limit=args.limit)
+                    if next_cursor is not None:
+                        await SearchService(db).search(query, limit=args.limit, cursor=next_cursor)
+                    if index:  # the first run warms the statement caches
+                        samples.append((time.perf_counter() - sample_started) / (2 if next_cursor else 1))
+            print(
+                f"{label:<16} {query!r:<16} results={len(results):<4}"
+                f"  best={min(samples) * 1e3:7.2f} ms  median={statistics.median(samples) * 1e3:7.2f} ms"
+            )
+    finally:
+        await cleanup(TITLE_PREFIX)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
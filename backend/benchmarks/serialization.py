@@ -0,0 +1,174 @@
+"""Per-row cost of the roadmap list and detail responses, before and after the lean path.
+
+"before" is the original path: ORM rows or hand-built pydantic models that FastAPI
+re-validates against response_model and renders with ORJSONResponse. "core" validates
+Core rows once through a precompiled TypeAdapter, and "json" lets Postgres render the
+detail document. Each sample uses a fresh session, as a request would.
+
+Seeds a throwaway roadmap set into DATABASE_URL and deletes it afterwards:
+
+    uv run python -m benchmarks.serialization --roadmaps 500 --topics 50 --tasks 100
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+from uuid import UUID
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy import insert, update
+
+from app.database import SessionLocal, engine
+from app.main import app
+from app.models import Roadmap, Task, TaskStatus, Topic
+from app.responses import json_response, roadmap_detail_adapter, roadmap_list_adapter
+from app.schemas.roadmap import RoadmapListItem
+from app.services.ordering import SORT_GAP
+from app.services.roadmap_service import RoadmapService
+from benchmarks._common import cleanup
+
+TITLE_PREFIX = "benchmark:serialization"
+
+
+def _response_field(path: str) -> Any:
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods:
+            return route.response_field
+    raise LookupError(path)
+
+
+async def _seed(roadmaps: int, topics: int, tasks: int) -> UUID:
+    async with SessionLocal() as db:
+        roadmap_ids = list(
+            await db.scalars(
+                insert(Roadmap).returning(Roadmap.id),
+                [
+                    {"title": f"{TITLE_PREFIX}:{index}", "sort_order": index}
+                    for index in range(max(roadmaps, 1))
+                ],
+            )
+        )
+        detail_id = roadmap_ids[0]
+        in_progress = tasks // 2
+        topic_ids = list(
+            await db.scalars(
+                insert(Topic).returning(Topic.id),
+                [
+                    {
+                        "roadmap_id": detail_id,
+                        "title": f"Topic {index}",
+                        "description": "Seeded by the serialization benchmark",
+                        "sort_order": (index + 1) * SORT_GAP,
+                        "total_tasks": tasks,
+                        "in_progress_tasks": in_progress,
+                    }
+                    for index in range(topics)
+                ],
+            )
+        )
+        if topic_ids and tasks:
+            await db.execute(
+                insert(Task),
+                [
+                    {
+                        "topic_id": topic_id,
+                        "title": f"Task {index}",
+                        "notes": "Some notes" if index % 2 else None,
+                        "status": (
+                            TaskStatus.IN_PROGRESS.value if index < in_progress else TaskStatus.NOT_STARTED.value
+                        ),
+                        "sort_order": (index + 1) * SORT_GAP,
+                    }
+                    for topic_id in topic_ids
+                    for index in range(tasks)
+                ],
+            )
+        await db.execute(
+            update(Roadmap)
+            .where(Roadmap.id == detail_id)
+            .values(total_tasks=topics * tasks, in_progress_tasks=topics * in_progress)
+        )
+        await db.commit()
+    return detail_id
+
+
+async def _measure(label: str, rows: int, repeat: int, run: Callable[[], Awaitable[bytes]]) -> bytes:
+    body = await run()  # warm-up: statement caches and adapter code paths
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await run()
+        samples.append(time.perf_counter() - started)
+    best, median = min(samples), statistics.median(samples)
+    print(
+        f"{label:<16} rows={rows:<7} best={best * 1e3:8.2f} ms  median={median * 1e3:8.2f} ms"
+        f"  per-row={median / max(rows, 1) * 1e6:7.2f} us"
+    )
+    return body
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--roadmaps", type=int, default=500, help="roadmaps in the list response")
+    parser.add_argument("--topics", type=int, default=50, help="topics in the detail roadmap")
+    parser.add_argument("--tasks", type=int, default=100, help="tasks per topic")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    list_field = _response_field("/api/roadmaps")
+    detail_field = _response_field("/api/roadmaps/{roadmap_id}")
+
+    async def list_before() -> bytes:
+        async with SessionLocal() as db:
+            rows, _ = await RoadmapService(db).list_roadmaps()
+            items = [RoadmapListItem(**row) for row in rows]
+        return ORJSONResponse(await serialize_response(field=list_field, response_content=items)).body
+
+    async def list_core() -> bytes:
+        async with SessionLocal() as db:
+            rows, _ = await RoadmapService(db).list_roadmaps()
+            return json_response(roadmap_list_adapter, rows).body
+
+    async def detail_before() -> bytes:
+        async with SessionLocal() as db:
+            detail, _ = await RoadmapService(db).get_roadmap_detail(detail_id)
+        return ORJSONResponse(await serialize_response(field=detail_field, response_content=detail)).body
+
+    async def detail_core() -> bytes:
+        async with SessionLocal() as db:
+            data, _ = await RoadmapService(db).get_roadmap_detail_data(detail_id)
+        return json_response(roadmap_detail_adapter, data).body
+
+    async def detail_json() -> bytes:
+        async with SessionLocal() as db:
+            document, _ = await RoadmapService(db).get_roadmap_detail_json(detail_id)
+            return Response(document).body
+
+    await cleanup(TITLE_PREFIX)
+    detail_id = await _seed(args.roadmaps, args.topics, args.tasks)
+    try:
+        async with SessionLocal() as db:
+            list_rows = len((await RoadmapService(db).list_roadmaps())[0])
+        detail_rows = args.topics * args.tasks
+
+        print("list_roadmaps")
+        before = await _measure("  before", list_rows, args.repeat, list_before)
+        after = await _measure("  core", list_rows, args.repeat, list_core)
+        assert before == after, "list_roadmaps bodies differ"
+
+        print("get_roadmap_detail (per task row)")
+        before = await _measure("  before (orm)", detail_rows, args.repeat, detail_before)
+        for label, run in (("  core", detail_core), ("  json", detail_json)):
+            after = await _measure(label, detail_rows, args.repeat, run)
+            assert before == after, f"{label.strip()} detail body differs"
+    finally:
+        await cleanup(TITLE_PREFIX)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""Throughput of GET /api/roadmaps/{id}/export and POST /api/roadmaps:import, by roadmap size.
+
+Each sample exports a seeded roadmap in a fresh session, as a request would, then imports
+the NDJSON back, fed in 64 KiB chunks like a streamed request body. Peak memory is the
+largest traced allocation during one more, untimed, export and import.
+
+Seeds throwaway roadmaps into DATABASE_URL and deletes them, and every import, afterwards:
+
+    uv run python -m benchmarks.transfer --tasks 10000 100000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from collections.abc import AsyncIterator
+from uuid import UUID
+
+from app.database import SessionLocal, engine
+from app.services.transfer_service import TransferService
+from benchmarks._common import cleanup, seed_roadmap
+
+TITLE_PREFIX = "benchmark:transfer"
+CHUNK_BYTES = 64 * 1024
+
+
+async def _export(roadmap_id: UUID) -> bytes:
+    async with SessionLocal() as db:
+        return b"".join([chunk async for chunk in TransferService(db).export_roadmap(roadmap_id)])
+
+
+async def _chunks(body: bytes) -> AsyncIterator[bytes]:
+    for start in range(0, len(body), CHUNK_BYTES):
+        yield body[start : start + CHUNK_BYTES]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    await cleanup(TITLE_PREFIX)
+    try:
+        for tasks in args.tasks:
+            roadmap_id = await seed_roadmap(TITLE_PREFIX, tasks, args.topics, statuses=True)
+            body = await _export(roadmap_id)  # warms the statement caches
+            exports, imports = [], []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                async with SessionLocal() as db:
+                    async for _chunk in TransferService(db).export_roadmap(roadmap_id):
+                        pass
+                exports.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                async with SessionLocal() as db:
+                    await TransferService(db).import_roadmap(_chunks(body))
+                imports.append(time.perf_counter() - started)
+
+            tracemalloc.start()
+            async with SessionLocal() as db:
+                async for _chunk in TransferService(db).export_roadmap(roadmap_id):
+                    pass
+            async with SessionLocal() as db:
+                await TransferService(db).import_roadmap(_chunks(body))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"tasks={tasks:<7} body={len(body) / 2**20:6.1f} MiB"
+                f"  export={tasks / statistics.median(exports):8.0f} tasks/s"
+                f"  import={tasks / statistics.median(imports):8.0f} tasks/s"
+                f"  peak={peak / 2**20:5.1f} MiB"
+            )
+            await cleanup(TITLE_PREFIX)
+    finally:
+        await cleanup(TITLE_PREFIX)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
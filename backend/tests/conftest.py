@@ -0,0 +1,26 @@
+"""Fixtures shared by the tests.
+
+Tests that touch the database run against DATABASE_URL, the same one the app uses, each
+inside a transaction that is rolled back when it ends: the services' commits only mark
+the session's work as done (SQLAlchemy's "conservative savepoint" joining), so a test
+sees its own rows and leaves nothing behind.
+"""
+from collections.abc import AsyncIterator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import engine
+
+
+@pytest.fixture
+async def db() -> AsyncIterator[AsyncSession]:
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection, expire_on_commit=False)
+        try:
+            yield session
+        finally:
+            await session.close()
+            if transaction.is_active:
+                await transaction.rollback()
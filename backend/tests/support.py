@@ -0,0 +1,23 @@
+"""Helpers for the tests."""
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from sqlalchemy import event
+
+from app.database import engine
+
+
+@contextmanager
+def recorded_statements() -> Iterator[list[str]]:
+    """Collect the SQL statements the app's engine sends while the block runs."""
+    statements: list[str] = []
+
+    def before_cursor_execute(_conn: Any, _cursor: Any, statement: str, *_args: object) -> None:
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from app.middleware.admission import AdmissionController, Overloaded, Priority
+
+
+async def _queued(admission: AdmissionController, priority: Priority) -> asyncio.Task[None]:
+    """Start a request that has to wait, and let it join the queue."""
+    task = asyncio.create_task(admission.acquire(priority))
+    await asyncio.sleep(0)
+    assert not task.done()
+    return task
+
+
+async def test_waiters_are_let_in_by_priority() -> None:
+    admission = AdmissionController(max_active=1, max_queued=10, queue_timeout=10)
+    await admission.acquire(Priority.READ)
+    waiting = {
+        await _queued(admission, priority): name
+        for name, priority in (
+            ("bulk", Priority.BULK),
+            ("write", Priority.WRITE),
+            ("first read", Priority.READ),
+            ("second read", Priority.READ),
+        )
+    }
+
+    order = []
+    while waiting:
+        admission.release()
+        done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+        order.extend(waiting.pop(task) for task in done)
+
+    assert order == ["first read", "second read", "write", "bulk"]
+    assert admission.stats().active == 1
+
+
+async def test_full_queue_displaces_a_lower_priority_waiter() -> None:
+    admission = AdmissionController(max_active=1, max_queued=1, queue_timeout=10)
+    await admission.acquire(Priority.WRITE)
+    bulk = await _queued(admission, Priority.BULK)
+
+    read = await _queued(admission, Priority.READ)
+    with pytest.raises(Overloaded):
+        await bulk
+    # Nothing of a lower priority is left to displace.
+    with pytest.raises(Overloaded):
+        await admission.acquire(Priority.READ)
+
+    admission.release()
+    await read
+    stats = admission.stats()
+    assert (stats.active, stats.queued) == (1, [0, 0, 0])
+    assert (stats.rejected_displaced, stats.rejected_full) == (1, 1)
+
+
+async def test_wait_times_out() -> None:
+    admission = AdmissionController(max_active=1, max_queued=10, queue_timeout=0.01)
+    await admission.acquire(Priority.READ)
+
+    with pytest.raises(Overloaded):
+        await admission.acquire(Priority.READ)
+
+    stats = admission.stats()
+    assert (stats.active, stats.queued, stats.rejected_timeout) == (1, [0, 0, 0], 1)
+
+
+async def test_slot_handed_over_as_the_wait_times_out_is_passed_on() -> None:
+    # A zero timeout expires on the loop turn after the waiter queues up ...
+    admission = AdmissionController(max_active=1, max_queued=10, queue_timeout=0)
+    await admission.acquire(Priority.READ)
+    waiting = await _queued(admission, Priority.READ)
+
+    # ... so the slot reaches the waiter in the same turn its wait ends.
+    admission.release()
+    with pytest.raises(Overloaded):
+        await waiting
+
+    stats = admission.stats()
+    assert (stats.active, stats.queued, stats.rejected_timeout) == (0, [0, 0, 0], 1)
+    await asyncio.wait_for(admission.acquire(Priority.READ), 1)
+
+
+async def test_cancelled_waiter_leaves_the_queue() -> None:
+    admission = AdmissionController(max_active=1, max_queued=10, queue_timeout=10)
+    await admission.acquire(Priority.READ)
+    waiting = await _queued(admission, Priority.WRITE)
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    assert admission.stats().queued == [0, 0, 0]
+    admission.release()
+    assert admission.stats().active == 0
+
+
+async def test_slot_handed_to_a_cancelled_waiter_goes_to_the_next() -> None:
+    admission = AdmissionController(max_active=1, max_queued=10, queue_timeout=10)
+    await admission.acquire(Priority.READ)
+    cancelled = await _queued(admission, Priority.READ)
+    next_in_line = await _queued(admission, Priority.READ)
+
+    # Handed the slot, then cancelled before it gets to run.
+    admission.release()
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    await asyncio.wait_for(next_in_line, 1)
+    assert admission.stats().active == 1
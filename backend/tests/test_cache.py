@@ -0,0 +1,105 @@
+from uuid import uuid4
+
+from app.services.cache import (
+    ROADMAP_LIST_KEY,
+    CachedResponse,
+    MemoryCacheBackend,
+    dashboard_key,
+    roadmap_keys,
+    stale_keys,
+)
+from app.services.rollups import ProgressDelta
+
+VALUE = CachedResponse(body=b"{}", etag='"1"')
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_stored_value_is_returned_until_invalidated() -> None:
+    cache = MemoryCacheBackend(max_entries=10, ttl_seconds=60)
+    _, token = await cache.lookup("a")
+    await cache.store("a", VALUE, token)
+
+    assert (await cache.lookup("a"))[0] == VALUE
+    await cache.invalidate(["a"])
+    assert (await cache.lookup("a"))[0] is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.invalidations) == (1, 2, 1)
+
+
+async def test_fill_started_before_an_invalidation_is_dropped() -> None:
+    cache = MemoryCacheBackend(max_entries=10, ttl_seconds=60)
+    _, token = await cache.lookup("a")
+
+    # A write commits and invalidates while the value is being rendered from older rows;
+    # the token carries no key, so a write to any key rejects the fill.
+    await cache.invalidate(["b"])
+    await cache.store("a", VALUE, token)
+
+    assert (await cache.lookup("a"))[0] is None
+    assert cache.stats().rejected_fills == 1
+
+    _, token = await cache.lookup("a")
+    await cache.store("a", VALUE, token)
+    assert (await cache.lookup("a"))[0] == VALUE
+
+
+async def test_entries_expire() -> None:
+    clock = FakeClock()
+    cache = MemoryCacheBackend(max_entries=10, ttl_seconds=5, clock=clock)
+    _, token = await cache.lookup("a")
+    await cache.store("a", VALUE, token)
+
+    clock.now = 4.9
+    assert (await cache.lookup("a"))[0] == VALUE
+    clock.now = 5.0
+    assert (await cache.lookup("a"))[0] is None
+    assert cache.stats().expirations == 1
+
+
+async def test_least_recently_used_entry_is_evicted() -> None:
+    cache = MemoryCacheBackend(max_entries=2, ttl_seconds=60)
+    for key in ("a", "b"):
+        _, token = await cache.lookup(key)
+        await cache.store(key, VALUE, token)
+    await cache.lookup("a")
+
+    _, token = await cache.lookup("c")
+    await cache.store("c", VALUE, token)
+
+    assert [(await cache.lookup(key))[0] is not None for key in ("a", "b", "c")] == [True, False, True]
+    assert cache.stats().evictions == 1
+
+
+async def test_zero_entries_stores_nothing() -> None:
+    cache = MemoryCacheBackend(max_entries=0, ttl_seconds=60)
+    _, token = await cache.lookup("a")
+    await cache.store("a", VALUE, token)
+
+    assert (await cache.lookup("a"))[0] is None
+    assert cache.stats().rejected_fills == 0
+
+
+def test_stale_keys_follow_the_counters() -> None:
+    roadmap_id = uuid4()
+
+    # A rename or reorder within a roadmap: only its own documents.
+    assert stale_keys({roadmap_id: ProgressDelta()}) == set(roadmap_keys(roadmap_id))
+    # A status change moves its counters: the list, and the dashboard once completions change.
+    assert stale_keys({roadmap_id: ProgressDelta(in_progress=1)}) == {
+        *roadmap_keys(roadmap_id),
+        ROADMAP_LIST_KEY,
+    }
+    assert stale_keys({roadmap_id: ProgressDelta(completed=1, in_progress=-1)}) == {
+        *roadmap_keys(roadmap_id),
+        ROADMAP_LIST_KEY,
+        dashboard_key(),
+    }
+    assert stale_keys({}, roadmap_list=True, dashboard=True) == {ROADMAP_LIST_KEY, dashboard_key()}
@@ -0,0 +1,132 @@
+from datetime import UTC, date, datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DailyCompletion, Roadmap, Task, TaskStatus, Topic
+from app.schemas.dashboard import DashboardStatsResponse, TasksCompletedPerDay
+from app.schemas.roadmap import RoadmapCreate
+from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.topic import TopicCreate
+from app.services.dashboard_service import CHART_DAYS, DashboardService
+from app.services.roadmap_service import RoadmapService
+from app.services.rollups import apply_completion_deltas
+from app.services.task_service import TaskService
+from app.services.topic_service import TopicService
+from tests.support import recorded_statements
+
+
+async def _seed(db: AsyncSession) -> None:
+    """Two live roadmaps, one deleted roadmap and one deleted topic, with completions today
+    and on the two days before (a three-day streak, as far as these rows go)."""
+    roadmaps, topics, tasks = RoadmapService(db), TopicService(db), TaskService(db)
+    for roadmap_index in range(3):
+        roadmap = await roadmaps.create_roadmap(RoadmapCreate(title=f"test:dashboard {roadmap_index}"))
+        for topic_index in range(3):
+            topic = await topics.create_topic(roadmap.id, TopicCreate(title=f"topic {topic_index}"))
+            for task_index in range(4):
+                task = await tasks.create_task(topic.id, TaskCreate(title=f"task {task_index}"))
+                if task_index < topic_index + 1:
+                    await tasks.update_task(task.id, TaskUpdate(status=TaskStatus.COMPLETED))
+                elif task_index == 3:
+                    await tasks.update_task(task.id, TaskUpdate(status=TaskStatus.IN_PROGRESS))
+            if roadmap_index == 1 and topic_index == 2:
+                await topics.delete_topic(topic.id)
+        if roadmap_index == 2:
+            await roadmaps.delete_roadmap(roadmap.id)
+
+    now = datetime.now(UTC)
+    await apply_completion_deltas(db, [(now - timedelta(days=1), 2), (now - timedelta(days=2), 1)])
+    await db.commit()
+
+
+async def _stats_by_separate_queries(db: AsyncSession) -> DashboardStatsResponse:
+    """The dashboard as get_stats computed it before it became one statement: one query per
+    figure, task totals counted from the tasks themselves, and the streak walked back a
+    day at a time."""
+    live_topic_ids = select(Topic.id).where(Topic.deleted_at.is_(None))
+    total_roadmaps = await db.scalar(select(func.count(Roadmap.id)).where(Roadmap.deleted_at.is_(None)))
+    total_topics = await db.scalar(select(func.count(Topic.id)).where(Topic.deleted_at.is_(None)))
+    total_tasks = await db.scalar(select(func.count(Task.id)).where(Task.topic_id.in_(live_topic_ids)))
+    completed_tasks = await db.scalar(
+        select(func.count(Task.id)).where(
+            Task.topic_id.in_(live_topic_ids), Task.status == TaskStatus.COMPLETED
+        )
+    )
+
+    today = date.today()
+    start_date = today - timedelta(days=CHART_DAYS - 1)
+    count_by_date = dict(
+        (
+            await db.execute(
+                select(DailyCompletion.date, DailyCompletion.count).where(
+                    DailyCompletion.date >= start_date, DailyCompletion.count > 0
+                )
+            )
+        ).all()
+    )
+
+    streak = 0
+    while (
+        await db.scalar(
+            select(DailyCompletion.count).where(
+                DailyCompletion.date == today - timedelta(days=streak), DailyCompletion.count > 0
+            )
+        )
+        is not None
+    ):
+        streak += 1
+
+    return DashboardStatsResponse(
+        total_roadmaps=total_roadmaps,
+        total_topics=total_topics,
+        total_tasks=total_tasks,
+        completed_tasks=completed_tasks,
+        completion_percent=completed_tasks * 100.0 / total_tasks if total_tasks else 0.0,
+        current_streak=streak,
+        tasks_completed_per_day=[
+            TasksCompletedPerDay(date=day, count=count_by_date.get(day, 0))
+            for day in (start_date + timedelta(days=offset) for offset in range(CHART_DAYS))
+        ],
+    )
+
+
+async def test_get_stats_is_one_statement(db: AsyncSession) -> None:
+    await _seed(db)
+
+    with recorded_statements() as statements:
+        await DashboardService(db).get_stats()
+
+    assert len(statements) == 1, statements
+
+
+async def test_get_stats_matches_separate_queries(db: AsyncSession) -> None:
+    before = await _stats_by_separate_queries(db)
+    await _seed(db)
+
+    expected = await _stats_by_separate_queries(db)
+    stats, _etag = await DashboardService(db).get_stats()
+
+    assert stats == expected
+    # Only the live roadmaps and topics count: 2 roadmaps, 5 topics, 20 tasks, 9 of them completed.
+    assert stats.total_roadmaps - before.total_roadmaps == 2
+    assert stats.total_topics - before.total_topics == 5
+    assert stats.total_tasks - before.total_tasks == 20
+    assert stats.completed_tasks - before.completed_tasks == 9
+    assert stats.current_streak >= 3
+
+
+async def test_every_completion_reaches_the_rollup(db: AsyncSession) -> None:
+    # The tasks stay in the session's identity map between the writes, as in a batch job.
+    roadmap = await RoadmapService(db).create_roadmap(RoadmapCreate(title="test:dashboard"))
+    topic = await TopicService(db).create_topic(roadmap.id, TopicCreate(title="topic"))
+    created = [
+        await TaskService(db).create_task(topic.id, TaskCreate(title=f"task {index}")) for index in range(3)
+    ]
+    today = select(DailyCompletion.count).where(DailyCompletion.date == func.current_date())
+    before = await db.scalar(today) or 0
+
+    for task in created:
+        await TaskService(db).update_task(task.id, TaskUpdate(status=TaskStatus.COMPLETED))
+
+    assert await db.scalar(today) == before + 3
@@ -0,0 +1,74 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import orjson
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import engine
+from app.models import Roadmap, Topic
+from app.schemas.task import TaskBatchCreate
+from app.services.events import IDS_PER_EVENT
+from app.services.task_service import TaskService
+
+
+@contextmanager
+def notifications() -> Iterator[list[dict[str, Any]]]:
+    """Collect the payloads the app's engine passes to pg_notify while the block runs."""
+    payloads: list[dict[str, Any]] = []
+
+    def before_cursor_execute(
+        _conn: Any, _cursor: Any, statement: str, parameters: Any, *_args: object
+    ) -> None:
+        if "pg_notify" in statement:
+            payloads.append(orjson.loads(parameters[-1]))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield payloads
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def _topics(db: AsyncSession, roadmaps: int) -> list[Any]:
+    """One topic in each of ``roadmaps`` new roadmaps."""
+    roadmap_ids = await db.scalars(
+        insert(Roadmap).returning(Roadmap.id),
+        [{"title": f"test:events {index}"} for index in range(roadmaps)],
+    )
+    return list(
+        await db.scalars(
+            insert(Topic).returning(Topic.id),
+            [{"roadmap_id": roadmap_id, "title": "topic"} for roadmap_id in roadmap_ids],
+        )
+    )
+
+
+async def test_batch_events_carry_their_roadmaps(db: AsyncSession) -> None:
+    topic_ids = await _topics(db, 3)
+    operations = [
+        TaskBatchCreate(op="create", topic_id=topic_ids[index % 3], title="task") for index in range(150)
+    ]
+
+    with notifications() as payloads:
+        created = await TaskService(db).apply_batch(operations)
+
+    assert [payload["type"] for payload in payloads] == ["task.created", "task.created"]
+    assert [len(payload["ids"]) for payload in payloads] == [IDS_PER_EVENT, 50]
+    assert {entity_id for payload in payloads for entity_id in payload["ids"]} == {
+        str(task.id) for task in created
+    }
+    assert all(len(payload["roadmap_ids"]) == 3 for payload in payloads)
+
+
+async def test_batch_across_too_many_roadmaps_for_one_payload_sends_a_resync(db: AsyncSession) -> None:
+    # 100 task ids and 150 roadmap ids come to about 10 kB, over the NOTIFY limit.
+    topic_ids = await _topics(db, 150)
+    operations = [TaskBatchCreate(op="create", topic_id=topic_id, title="task") for topic_id in topic_ids]
+
+    with notifications() as payloads:
+        created = await TaskService(db).apply_batch(operations)
+
+    assert len(created) == 150
+    assert payloads == [{"type": "resync"}]
@@ -0,0 +1,115 @@
+from uuid import UUID
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.roadmap import RoadmapCreate
+from app.schemas.task import TaskCreate
+from app.schemas.topic import TopicCreate
+from app.services.ordering import SORT_GAP, SiblingNotFound, allocate_sort_keys, spread_keys
+from app.services.roadmap_service import RoadmapService
+from app.services.rollups import tasks_table, topics_table
+from app.services.task_service import TaskService
+from app.services.topic_service import TopicService
+
+
+async def _topic_with_keys(db: AsyncSession, sort_orders: list[int]) -> tuple[UUID, list[UUID]]:
+    """A topic whose tasks have exactly ``sort_orders``, and the tasks' ids in creation order."""
+    roadmap = await RoadmapService(db).create_roadmap(RoadmapCreate(title="test:ordering"))
+    topic = await TopicService(db).create_topic(roadmap.id, TopicCreate(title="topic"))
+    task_ids = []
+    for index, sort_order in enumerate(sort_orders):
+        task = await TaskService(db).create_task(topic.id, TaskCreate(title=f"task {index}"))
+        await db.execute(update(tasks_table).where(tasks_table.c.id == task.id).values(sort_order=sort_order))
+        task_ids.append(task.id)
+    return topic.id, task_ids
+
+
+async def _allocate(
+    db: AsyncSession, topic_id: UUID, moved_ids: list[UUID], after_id: UUID | None
+) -> list[int] | None:
+    return await allocate_sort_keys(
+        db,
+        parent=topics_table,
+        parent_column=tasks_table.c.topic_id,
+        parent_id=topic_id,
+        moved_ids=moved_ids,
+        after_id=after_id,
+    )
+
+
+async def _keys(db: AsyncSession, task_ids: list[UUID]) -> list[int]:
+    rows = dict(
+        (
+            await db.execute(
+                select(tasks_table.c.id, tasks_table.c.sort_order).where(tasks_table.c.id.in_(task_ids))
+            )
+        ).all()
+    )
+    return [rows[task_id] for task_id in task_ids]
+
+
+def test_spread_keys() -> None:
+    assert spread_keys(None, None, 2) == [SORT_GAP, 2 * SORT_GAP]
+    assert spread_keys(5, None, 1) == [5 + SORT_GAP]
+    assert spread_keys(None, 5, 2) == [5 - 2 * SORT_GAP, 5 - SORT_GAP]
+    assert spread_keys(0, 9, 2) == [3, 6]
+    assert spread_keys(0, 2, 1) == [1]
+    assert spread_keys(0, 2, 2) is None
+
+
+async def test_keys_fit_in_the_gap_without_renumbering(db: AsyncSession) -> None:
+    topic_id, (first, second, moved) = await _topic_with_keys(db, [SORT_GAP, 2 * SORT_GAP, 3 * SORT_GAP])
+
+    keys = await _allocate(db, topic_id, [moved], after_id=first)
+
+    assert keys == [SORT_GAP + SORT_GAP // 2]
+    assert await _keys(db, [first, second]) == [SORT_GAP, 2 * SORT_GAP]
+
+
+async def test_exhausted_gap_renumbers_the_siblings_once(db: AsyncSession) -> None:
+    topic_id, (first, second, third, moved) = await _topic_with_keys(db, [10, 11, 12, 13])
+
+    keys = await _allocate(db, topic_id, [moved], after_id=first)
+
+    first_key, second_key, third_key = await _keys(db, [first, second, third])
+    assert (first_key, second_key, third_key) == (SORT_GAP, 2 * SORT_GAP, 3 * SORT_GAP)
+    assert keys is not None and len(keys) == 1 and first_key < keys[0] < second_key
+
+
+async def test_shared_key_renumbers_before_placing(db: AsyncSession) -> None:
+    # Two siblings on one key: no key lies between them until they are pulled apart.
+    topic_id, (first, second, moved) = await _topic_with_keys(db, [SORT_GAP, SORT_GAP, 2 * SORT_GAP])
+    after, before = sorted([first, second])
+
+    keys = await _allocate(db, topic_id, [moved], after_id=after)
+
+    after_key, before_key = await _keys(db, [after, before])
+    assert after_key < before_key
+    assert keys is not None and len(keys) == 1 and after_key < keys[0] < before_key
+
+
+async def test_several_moved_rows_share_the_gap(db: AsyncSession) -> None:
+    topic_id, (first, second, *moved) = await _topic_with_keys(db, [0, 4, 100, 200, 300])
+
+    keys = await _allocate(db, topic_id, moved, after_id=first)
+
+    first_key, second_key = await _keys(db, [first, second])
+    assert keys is not None and len(keys) == 3
+    assert first_key < keys[0] < keys[1] < keys[2] < second_key
+
+
+async def test_after_a_task_of_another_topic_is_refused(db: AsyncSession) -> None:
+    topic_id, (_, moved) = await _topic_with_keys(db, [SORT_GAP, 2 * SORT_GAP])
+    _, (stranger,) = await _topic_with_keys(db, [SORT_GAP])
+
+    with pytest.raises(SiblingNotFound):
+        await _allocate(db, topic_id, [moved], after_id=stranger)
+
+
+async def test_deleted_parent_gets_no_keys(db: AsyncSession) -> None:
+    topic_id, (_, moved) = await _topic_with_keys(db, [SORT_GAP, 2 * SORT_GAP])
+    await TopicService(db).delete_topic(topic_id)
+
+    assert await _allocate(db, topic_id, [moved], after_id=None) is None
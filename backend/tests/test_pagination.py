@@ -0,0 +1,61 @@
+from uuid import UUID
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.roadmap import RoadmapCreate
+from app.schemas.topic import TopicCreate
+from app.services.pagination import encode_cursor
+from app.services.roadmap_service import RoadmapService
+from app.services.search_service import SearchService
+from app.services.task_service import TaskService
+from app.services.topic_service import TopicService
+
+ID = str(UUID(int=1))
+CREATED_AT = "2026-01-01T00:00:00+00:00"
+MALFORMED = ["", "not a cursor", encode_cursor(1, 2, 3, 4), encode_cursor({"sort_order": 1})]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        *MALFORMED,
+        encode_cursor(1, CREATED_AT, 5),
+        encode_cursor(1, 5, ID),
+        encode_cursor(2**40, CREATED_AT, ID),
+    ],
+)
+async def test_malformed_roadmap_cursor_is_rejected(db: AsyncSession, cursor: str) -> None:
+    with pytest.raises(HTTPException) as raised:
+        await RoadmapService(db).list_roadmap_page(limit=10, cursor=cursor)
+    assert raised.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "cursor", [*MALFORMED, encode_cursor(1, 5), encode_cursor("first", ID), encode_cursor(2**31, ID)]
+)
+async def test_malformed_task_cursor_is_rejected(db: AsyncSession, cursor: str) -> None:
+    roadmap = await RoadmapService(db).create_roadmap(RoadmapCreate(title="test:pagination"))
+    topic = await TopicService(db).create_topic(roadmap.id, TopicCreate(title="topic"))
+
+    with pytest.raises(HTTPException) as raised:
+        await TaskService(db).list_tasks(topic.id, limit=10, cursor=cursor)
+    assert raised.value.status_code == 400
+
+
+@pytest.mark.parametrize("cursor", [*MALFORMED, encode_cursor(0, 0, 0), encode_cursor("best", "task", ID)])
+async def test_malformed_search_cursor_is_rejected(db: AsyncSession, cursor: str) -> None:
+    with pytest.raises(HTTPException) as raised:
+        await SearchService(db).search("x", limit=10, cursor=cursor)
+    assert raised.value.status_code == 400
+
+
+async def test_cursor_of_a_page_is_accepted(db: AsyncSession) -> None:
+    await RoadmapService(db).create_roadmap(RoadmapCreate(title="test:pagination"))
+    await RoadmapService(db).create_roadmap(RoadmapCreate(title="test:pagination"))
+
+    _, cursor = await RoadmapService(db).list_roadmap_page(limit=1)
+
+    assert cursor is not None
+    await RoadmapService(db).list_roadmap_page(limit=1, cursor=cursor)
@@ -0,0 +1,67 @@
+from datetime import UTC, datetime
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Roadmap, Task, Topic
+from app.schemas.roadmap import RoadmapCreate
+from app.schemas.task import TaskCreate
+from app.schemas.topic import TopicCreate
+from app.services.purge_service import PurgeBatch, PurgeService
+from app.services.roadmap_service import RoadmapService
+from app.services.task_service import TaskService
+from app.services.topic_service import TopicService
+
+# Older than anything deleted outside the test, so these rows are the next ones purged.
+LONG_AGO = datetime(2000, 1, 1, tzinfo=UTC)
+
+
+async def _deleted_topic(db: AsyncSession, tasks: int) -> tuple[UUID, UUID]:
+    """A deleted topic holding ``tasks`` tasks, at the front of the purge queue."""
+    roadmap = await RoadmapService(db).create_roadmap(RoadmapCreate(title="test:purge"))
+    topic = await TopicService(db).create_topic(roadmap.id, TopicCreate(title="topic"))
+    for index in range(tasks):
+        await TaskService(db).create_task(topic.id, TaskCreate(title=f"task {index}"))
+    await TopicService(db).delete_topic(topic.id)
+    await db.execute(update(Topic).where(Topic.id == topic.id).values(deleted_at=LONG_AGO))
+    return roadmap.id, topic.id
+
+
+async def _left(db: AsyncSession, topic_id: UUID) -> tuple[int, bool]:
+    tasks = await db.scalar(select(func.count()).where(Task.topic_id == topic_id))
+    topic = await db.scalar(select(Topic.id).where(Topic.id == topic_id))
+    return tasks or 0, topic is not None
+
+
+async def test_deleted_topic_is_purged_over_several_batches(db: AsyncSession) -> None:
+    roadmap_id, topic_id = await _deleted_topic(db, tasks=5)
+
+    # A fresh service per batch, as after a restart: the progress lives in the rows.
+    batches = [await PurgeService(db, batch_size=2).purge_batch() for _ in range(3)]
+
+    assert batches == [PurgeBatch(tasks=2), PurgeBatch(tasks=2), PurgeBatch(tasks=1, topics=1)]
+    assert await _left(db, topic_id) == (0, False)
+    assert await db.scalar(select(Roadmap.id).where(Roadmap.id == roadmap_id)) == roadmap_id
+
+
+async def test_purge_resumes_with_another_batch_size(db: AsyncSession) -> None:
+    _, topic_id = await _deleted_topic(db, tasks=5)
+
+    assert await PurgeService(db, batch_size=3).purge_batch() == PurgeBatch(tasks=3)
+    assert await _left(db, topic_id) == (2, True)
+
+    # A full batch cannot tell the topic is empty; the next one finds nothing and drops it.
+    assert await PurgeService(db, batch_size=2).purge_batch() == PurgeBatch(tasks=2)
+    assert await PurgeService(db, batch_size=2).purge_batch() == PurgeBatch(topics=1)
+    assert await _left(db, topic_id) == (0, False)
+
+
+async def test_deleted_roadmap_goes_after_its_topics(db: AsyncSession) -> None:
+    roadmap_id, topic_id = await _deleted_topic(db, tasks=1)
+    await RoadmapService(db).delete_roadmap(roadmap_id)
+    await db.execute(update(Roadmap).where(Roadmap.id == roadmap_id).values(deleted_at=LONG_AGO))
+
+    assert await PurgeService(db, batch_size=2).purge_batch() == PurgeBatch(tasks=1, topics=1)
+    assert await PurgeService(db, batch_size=2).purge_batch() == PurgeBatch(roadmaps=1)
+    assert await db.scalar(select(Roadmap.id).where(Roadmap.id == roadmap_id)) is None
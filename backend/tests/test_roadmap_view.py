@@ -0,0 +1,16 @@
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.roadmap import RoadmapDetailView
+
+
+def test_unknown_query_parameters_are_ignored() -> None:
+    view = RoadmapDetailView.model_validate({"_": "1", "tasks": "none", "fields": ["notes,description"]})
+
+    assert view == RoadmapDetailView(tasks="none")
+
+
+@pytest.mark.parametrize("query", [{"tasks": "all"}, {"fields": ["title"]}])
+def test_invalid_options_are_rejected(query: dict[str, object]) -> None:
+    with pytest.raises(ValidationError):
+        RoadmapDetailView.model_validate(query)
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+class Render:
+    """A computation that runs until released, counting how often it was started.
+
+    Returns the number of its own start, or raises ``error`` if given one.
+    """
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.calls = 0
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        call = self.calls
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return call
+
+
+async def _started(flights: SingleFlight[int], render: Render, key: str = "a") -> asyncio.Task[int]:
+    task = asyncio.create_task(flights.run(key, render))
+    await asyncio.sleep(0)
+    return task
+
+
+async def test_concurrent_callers_share_one_computation() -> None:
+    flights: SingleFlight[int] = SingleFlight()
+    render = Render()
+    callers = [await _started(flights, render) for _ in range(3)]
+    other = await _started(flights, render, key="b")
+
+    render.release.set()
+
+    assert await asyncio.gather(*callers) == [1, 1, 1]
+    assert await other == 2
+    stats = flights.stats()
+    assert (stats.flights, stats.coalesced) == (2, 2)
+
+
+async def test_exception_reaches_every_caller() -> None:
+    flights: SingleFlight[int] = SingleFlight()
+    render = Render(error=ValueError("render failed"))
+    callers = [await _started(flights, render) for _ in range(2)]
+
+    render.release.set()
+
+    for caller in callers:
+        with pytest.raises(ValueError):
+            await caller
+    assert render.calls == 1
+
+
+async def test_cancelled_leader_hands_the_computation_to_a_waiter() -> None:
+    flights: SingleFlight[int] = SingleFlight()
+    render = Render()
+    leader = await _started(flights, render)
+    waiters = [await _started(flights, render) for _ in range(2)]
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    # One waiter starts over as the new leader; the other waits on it.
+    await asyncio.sleep(0)
+    assert render.calls == 2
+    render.release.set()
+
+    assert await asyncio.gather(*waiters) == [2, 2]
+    stats = flights.stats()
+    assert (stats.flights, stats.coalesced) == (2, 1)
+
+
+async def test_cancelled_waiter_leaves_the_computation_running() -> None:
+    flights: SingleFlight[int] = SingleFlight()
+    render = Render()
+    leader = await _started(flights, render)
+    waiter = await _started(flights, render)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    render.release.set()
+
+    assert await leader == 1
+    assert render.calls == 1
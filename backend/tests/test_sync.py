@@ -0,0 +1,193 @@
+import time
+from dataclasses import replace
+from datetime import timedelta
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import UUID
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal, engine
+from app.models import Roadmap, Tombstone
+from app.schemas.roadmap import RoadmapCreate, RoadmapUpdate
+from app.schemas.task import TaskCreate
+from app.schemas.topic import TopicCreate
+from app.services.purge_service import PurgeService
+from app.services.roadmap_service import RoadmapService
+from app.services.sync_service import (
+    CURSOR_RETENTION,
+    MAX_SYNC_PAGE_SIZE,
+    TOMBSTONE_RETENTION,
+    SyncPosition,
+    SyncService,
+)
+from app.services.task_service import TaskService
+from app.services.topic_service import TopicService
+
+# Sync only returns the rows of committed transactions, so unlike the ``db`` tests these
+# commit, and remove what they wrote when they end.
+
+
+@pytest.fixture
+async def written() -> AsyncIterator[list[UUID]]:
+    """Ids of the roadmaps (with their rows) and deleted rows (with their tombstones) a test commits."""
+    ids: list[UUID] = []
+    yield ids
+    async with SessionLocal() as db:
+        await db.execute(delete(Tombstone).where(Tombstone.entity_id.in_(ids)))
+        await db.execute(delete(Roadmap).where(Roadmap.id.in_(ids)))
+        await db.commit()
+
+
+async def _page(cursor: str | None, limit: int) -> dict[str, Any]:
+    async with SessionLocal() as db:
+        return await SyncService(db).changes(cursor, limit)
+
+
+async def _sync(cursor: str | None, limit: int = MAX_SYNC_PAGE_SIZE) -> tuple[list[dict[str, Any]], str]:
+    """Every page of one sync, and the cursor for the next."""
+    pages = [await _page(cursor, limit)]
+    while pages[-1]["more"]:
+        pages.append(await _page(pages[-1]["cursor"], limit))
+    return pages, pages[-1]["cursor"]
+
+
+def _ids(pages: list[dict[str, Any]]) -> list[UUID]:
+    return [
+        row["id"] if isinstance(row, dict) else row.id
+        for page in pages
+        for part in ("roadmaps", "topics", "tasks")
+        for row in page[part]
+    ]
+
+
+async def _seed(ids: list[UUID]) -> tuple[set[UUID], UUID]:
+    """One roadmap, two topics of three tasks, one of them deleted: the live ids and the deleted one."""
+    async with SessionLocal() as db:
+        roadmap = await RoadmapService(db).create_roadmap(RoadmapCreate(title="test:sync"))
+        ids.append(roadmap.id)
+        live = {roadmap.id}
+        for topic_index in range(2):
+            topic = await TopicService(db).create_topic(roadmap.id, TopicCreate(title=f"topic {topic_index}"))
+            live.add(topic.id)
+            for task_index in range(3):
+                task = await TaskService(db).create_task(topic.id, TaskCreate(title=f"task {task_index}"))
+                live.add(task.id)
+        live.remove(task.id)
+        ids.append(task.id)
+        await TaskService(db).delete_task(task.id)
+    return live, task.id
+
+
+async def test_delta_sync_pages_hold_each_change_once(written: list[UUID]) -> None:
+    _, cursor = await _sync(None)
+    live, deleted_id = await _seed(written)
+
+    pages, cursor = await _sync(cursor, limit=2)
+
+    assert len(pages) > 1
+    assert all(len(_ids([page])) + len(page["deleted"]) <= 2 for page in pages)
+    assert [page["more"] for page in pages] == [True] * (len(pages) - 1) + [False]
+    assert not any(page["full"] for page in pages)
+    ids = _ids(pages)
+    assert len(ids) == len(set(ids))
+    assert set(ids) == live
+    assert [row["id"] for page in pages for row in page["deleted"]] == [deleted_id]
+
+    pages, _ = await _sync(cursor)
+    assert _ids(pages) == [] and pages[0]["deleted"] == []
+
+
+async def test_full_sync_pages_skip_nothing(written: list[UUID]) -> None:
+    live, deleted_id = await _seed(written)
+
+    pages, _ = await _sync(None, limit=7)
+
+    assert all(page["full"] for page in pages)
+    ids = _ids(pages)
+    assert len(ids) == len(set(ids))
+    assert live <= set(ids)
+    assert deleted_id not in ids
+    assert all(page["deleted"] == [] for page in pages)
+
+
+async def test_rows_committed_after_the_horizon_reach_the_next_sync(written: list[UUID]) -> None:
+    _, cursor = await _sync(None)
+    live, _ = await _seed(written)
+
+    # A transaction that is open while the sync runs, and one that commits between its
+    # pages: the sync's horizon is below both, so their rows wait for the next sync.
+    async with engine.connect() as connection:
+        await connection.begin()
+        open_id = await connection.scalar(
+            insert(Roadmap).values(title="test:sync open").returning(Roadmap.id)
+        )
+        written.append(open_id)
+        first = await _page(cursor, limit=1)
+        async with SessionLocal() as db:
+            late_id = (await TopicService(db).create_topic(written[0], TopicCreate(title="late"))).id
+        rest, cursor = await _sync(first["cursor"], limit=1)
+        await connection.commit()
+
+    ids = _ids([first, *rest])
+    assert set(ids) == live
+    pages, _ = await _sync(cursor)
+    assert {open_id, late_id} <= set(_ids(pages))
+
+
+async def test_cursor_past_retention_gets_a_full_sync(db: AsyncSession) -> None:
+    now = int(time.time())
+    expired = SyncPosition(since=1, since_read_at=now - int(CURSOR_RETENTION.total_seconds()) - 3600)
+    recent = SyncPosition(since=1, since_read_at=now - 3600)
+
+    assert (await SyncService(db).changes(expired.encode(), limit=1))["full"] is True
+    assert (await SyncService(db).changes(recent.encode(), limit=1))["full"] is False
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"part": 7},
+        {"horizon_read_at": None},
+        {"part": 1, "last_version": 1, "last_key": "x"},
+        {"part": 3, "last_version": 1, "last_key": "x"},
+    ],
+)
+async def test_malformed_cursor_is_rejected(db: AsyncSession, fields: dict[str, Any]) -> None:
+    position = SyncPosition(since=0, since_read_at=0, horizon=1, horizon_read_at=0)
+    with pytest.raises(HTTPException) as raised:
+        await SyncService(db).changes(replace(position, **fields).encode())
+    assert raised.value.status_code == 400
+
+
+async def test_purger_expires_tombstones_past_retention(db: AsyncSession) -> None:
+    ages = (TOMBSTONE_RETENTION + timedelta(days=1), timedelta(days=1))
+    rows = [{"kind": "task", "entity_id": UUID(int=1), "deleted_at": func.now() - age} for age in ages]
+    old_id, recent_id = (await db.scalars(insert(Tombstone).values(rows).returning(Tombstone.id))).all()
+
+    # Soft-deleted rows go first; tombstones once none are left.
+    purged = await PurgeService(db, batch_size=1000).purge_batch()
+    while purged is not None and not purged.tombstones:
+        purged = await PurgeService(db, batch_size=1000).purge_batch()
+
+    assert purged is not None and purged.tombstones >= 1
+    left = set(await db.scalars(select(Tombstone.id).where(Tombstone.id.in_([old_id, recent_id]))))
+    assert left == {recent_id}
+
+
+async def test_roadmap_renamed_mid_sync_moves_to_the_next_one(written: list[UUID]) -> None:
+    _, cursor = await _sync(None)
+    await _seed(written)
+    roadmap_id = written[0]
+
+    first = await _page(cursor, limit=1)
+    assert _ids([first]) == [roadmap_id]
+    async with SessionLocal() as db:
+        await RoadmapService(db).update_roadmap(roadmap_id, RoadmapUpdate(title="test:sync renamed"))
+    _, cursor = await _sync(first["cursor"], limit=1)
+
+    pages, _ = await _sync(cursor)
+    assert [row["title"] for page in pages for row in page["roadmaps"]] == ["test:sync renamed"]
@@ -0,0 +1,45 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.config import get_settings
+from app.middleware.tracing import PROFILE_HEADER, PROFILED_STATUS_HEADER, RequestTraceMiddleware
+
+
+async def _events(_request: Request) -> StreamingResponse:
+    async def forever() -> AsyncIterator[bytes]:
+        while True:
+            yield b": heartbeat\n\n"
+            await asyncio.sleep(0.01)
+
+    return StreamingResponse(forever(), media_type="text/event-stream")
+
+
+async def _hello(_request: Request) -> PlainTextResponse:
+    return PlainTextResponse("hello", status_code=201)
+
+
+def _client() -> httpx.AsyncClient:
+    app = Starlette(routes=[Route("/events", _events), Route("/hello", _hello)])
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=RequestTraceMiddleware(app)),
+        base_url="http://test",
+        headers={PROFILE_HEADER: "1", "X-API-Key": get_settings().api_key},
+    )
+
+
+async def test_streamed_response_is_not_profiled() -> None:
+    async with _client() as client:
+        streamed = await asyncio.wait_for(client.get("/events"), 5)
+        # The profiler is free again for the next request.
+        profiled = await client.get("/hello")
+
+    assert streamed.status_code == 400
+    assert profiled.status_code == 200
+    assert profiled.headers[PROFILED_STATUS_HEADER] == "201"
+    assert profiled.text.startswith("GET /hello -> 201")
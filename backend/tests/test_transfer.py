@@ -0,0 +1,65 @@
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import UUID
+
+import orjson
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Task, Topic
+from app.services.transfer_service import TransferService
+
+TOPIC_ID = UUID(int=1)
+
+
+async def _chunks(*lines: dict[str, Any]) -> AsyncIterator[bytes]:
+    for line in lines:
+        yield orjson.dumps(line) + b"\n"
+
+
+def _export(topic_sort_order: int = 0, task_sort_order: int = 0) -> list[dict[str, Any]]:
+    return [
+        {"type": "roadmap", "id": str(UUID(int=0)), "title": "test:transfer"},
+        {"type": "topic", "id": str(TOPIC_ID), "title": "topic", "sort_order": topic_sort_order},
+        {
+            "type": "task",
+            "id": str(UUID(int=2)),
+            "topic_id": str(TOPIC_ID),
+            "title": "task",
+            "sort_order": task_sort_order,
+        },
+    ]
+
+
+@pytest.mark.parametrize(
+    ("export", "location"),
+    [
+        (_export(topic_sort_order=2**40), "Line 2: topic"),
+        (_export(task_sort_order=-(2**31) - 1), "Line 3: task"),
+    ],
+)
+async def test_sort_order_out_of_range_is_reported_by_line(
+    db: AsyncSession, export: list[dict[str, Any]], location: str
+) -> None:
+    with pytest.raises(HTTPException) as raised:
+        await TransferService(db).import_roadmap(_chunks(*export))
+
+    assert raised.value.status_code == 400
+    assert raised.value.detail.startswith(f"{location}.sort_order: ")
+
+
+async def test_sort_order_at_the_bounds_is_imported(db: AsyncSession) -> None:
+    roadmap = await TransferService(db).import_roadmap(
+        _chunks(*_export(topic_sort_order=2**31 - 1, task_sort_order=-(2**31)))
+    )
+
+    topic_sort_order, task_sort_order = (
+        await db.execute(
+            select(Topic.sort_order, Task.sort_order)
+            .join(Task, Task.topic_id == Topic.id)
+            .where(Topic.roadmap_id == roadmap.id)
+        )
+    ).one()
+    assert (topic_sort_order, task_sort_order) == (2**31 - 1, -(2**31))
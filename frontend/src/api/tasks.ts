@@ -1,5 +1,5 @@
 import api from './client';
-import type { Task, TaskCreate, TaskUpdate } from '../types';
+import type { Task, TaskBatchOperation, TaskCreate, TaskUpdate } from '../types';
 
 export const createTask = async (topicId: string, payload: TaskCreate): Promise<Task> => {
   const { data } = await api.post(`/api/topics/${topicId}/tasks`, payload);
@@ -14,3 +14,8 @@ export const updateTask = async (id: string, payload: TaskUpdate): Promise<Task>
 export const deleteTask = async (id: string): Promise<void> => {
   await api.delete(`/api/tasks/${id}`);
 };
+
+export const batchTasks = async (operations: TaskBatchOperation[]): Promise<Task[]> => {
+  const { data } = await api.post('/api/tasks:batch', { operations });
+  return data;
+};
@@ -93,3 +93,8 @@ export interface TaskUpdate {
   notes?: string;
   status?: TaskStatus;
 }
+
+export type TaskBatchOperation =
+  | ({ op: 'create'; topic_id: string } & TaskCreate)
+  | ({ op: 'update'; id: string } & TaskUpdate)
+  | { op: 'delete'; id: string };